@@ -76,7 +76,14 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+    },
+    # Request logs can be kept apart from the main schema with
+    # DATABASE_ROUTERS = ["tracking.routers.TrackingRouter"] and
+    # DRF_TRACKING_DATABASE = "tracking".
+    "tracking": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "tracking.sqlite3",
+    },
 }
 
 # Password validation
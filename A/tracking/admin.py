@@ -1,9 +1,120 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
+from django.core.paginator import Paginator
+from django.db import connections, router
+from django.utils.functional import cached_property
+
+from .app_settings import app_settings
 from .models import ApiRequestLog
+from .partitions import check_unpartitioned
+from .search import search_logs
 
 
 # Register your models here.
 
+class EstimatedCountPaginator(Paginator):
+    """
+    Avoids an exact COUNT(*) over the log table. Unfiltered lists use the
+    database's row estimate where one exists; filtered lists are counted
+    up to ``count_limit`` rows, deeper pages are reached with keyset links.
+    """
+
+    count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = self._estimate(queryset)
+            if estimate is not None and estimate > self.count_limit:
+                return estimate
+        return queryset.values('pk')[: self.count_limit].count()
+
+    def _estimate(self, queryset):
+        connection = connections[queryset.db]
+        table = queryset.model._meta.db_table
+        if connection.vendor == 'postgresql':
+            sql = 'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass'
+        elif connection.vendor == 'mysql':
+            sql = (
+                'SELECT table_rows FROM information_schema.tables '
+                'WHERE table_schema = DATABASE() AND table_name = %s'
+            )
+        else:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+class KeysetChangeList(ChangeList):
+    deferred_fields = ('response', 'data', 'errors')
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        return queryset.defer(*self.deferred_fields)
+
+    def get_results(self, request):
+        super().get_results(request)
+        self.keyset_next_url = None
+        # Keyset links follow the default '-id' ordering only.
+        if self.multi_page and self.result_list and ORDER_VAR not in self.params:
+            last = list(self.result_list)[-1]
+            self.keyset_next_url = self.get_query_string(
+                {'id__lt': last.pk}, [PAGE_VAR]
+            )
+
+
+class StatusClassListFilter(admin.SimpleListFilter):
+    title = 'status'
+    parameter_name = 'status_class'
+
+    def lookups(self, request, model_admin):
+        return [(str(code), '{}xx'.format(code)) for code in range(1, 6)]
+
+    def queryset(self, request, queryset):
+        if self.value() in {'1', '2', '3', '4', '5'}:
+            low = int(self.value()) * 100
+            return queryset.filter(status_code__gte=low, status_code__lt=low + 100)
+        return queryset
+
+
+class MethodListFilter(admin.SimpleListFilter):
+    title = 'method'
+    parameter_name = 'method'
+    methods = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS')
+
+    def lookups(self, request, model_admin):
+        return [(method, method) for method in self.methods]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(method=self.value())
+        return queryset
+
+
+class ViewListFilter(admin.SimpleListFilter):
+    title = 'view'
+    parameter_name = 'view'
+    sample_size = 10000
+
+    def lookups(self, request, model_admin):
+        # SELECT DISTINCT over the whole table is too slow; offer the views
+        # seen in the most recent rows instead.
+        recent = (
+            model_admin.model.objects.order_by('-id')
+            .exclude(view=None)
+            .values_list('view', flat=True)[: self.sample_size]
+        )
+        return [(view, view) for view in sorted(set(recent))]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(view=self.value())
+        return queryset
+
+
 class ApiRequestLogAdmin(admin.ModelAdmin):
     list_display = (
         'id',
@@ -17,6 +128,40 @@ class ApiRequestLogAdmin(admin.ModelAdmin):
         'host',
         'query_params'
     )
+    list_select_related = ('user',)
+    list_filter = (
+        'requested_at',
+        StatusClassListFilter,
+        MethodListFilter,
+        ViewListFilter,
+    )
+    ordering = ('-id',)
+    sortable_by = ('id', 'requested_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    raw_id_fields = ('user',)
+    # A prefix match; substring search needs DRF_TRACKING_SEARCH_INDEX.
+    search_fields = ('^path',)
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_queryset(self, request):
+        check_unpartitioned('The ApiRequestLog admin')
+        return super().get_queryset(request)
+
+    def get_list_select_related(self, request):
+        # No join when the logs are routed away from the user table.
+        user_model = ApiRequestLog._meta.get_field('user').related_model
+        if router.db_for_read(ApiRequestLog) != router.db_for_read(user_model):
+            return ()
+        return super().get_list_select_related(request)
+
+    def get_search_results(self, request, queryset, search_term):
+        # With the full-text index, search covers the payloads too.
+        if app_settings.SEARCH_INDEX:
+            return search_logs(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
 
 
 admin.site.register(ApiRequestLog, ApiRequestLogAdmin)
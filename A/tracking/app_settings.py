@@ -15,5 +15,180 @@ class AppSetting:
     def DECODE_REQUEST_BODY(self):
         return self._setting("DECODE_REQUEST_BODY", True)
 
+    @property
+    def CAPTURE_MODE(self):
+        return self._setting("CAPTURE_MODE", "full")
+
+    @property
+    def MAX_BODY_BYTES(self):
+        return self._setting("MAX_BODY_BYTES", None)
+
+    @property
+    def FULL_CAPTURE_STATUS(self):
+        return self._setting("FULL_CAPTURE_STATUS", 400)
+
+    @property
+    def FULL_CAPTURE_MS(self):
+        return self._setting("FULL_CAPTURE_MS", None)
+
+    @property
+    def SAMPLE_RATE(self):
+        return self._setting("SAMPLE_RATE", 1.0)
+
+    @property
+    def SAMPLERS(self):
+        return self._setting("SAMPLERS", {})
+
+    @property
+    def ALWAYS_LOG_ERRORS(self):
+        return self._setting("ALWAYS_LOG_ERRORS", True)
+
+    @property
+    def ALWAYS_LOG_SLOW_MS(self):
+        return self._setting("ALWAYS_LOG_SLOW_MS", None)
+
+    @property
+    def SENSITIVE_PATTERNS(self):
+        return self._setting("SENSITIVE_PATTERNS", ())
+
+    @property
+    def STORAGE_BACKEND(self):
+        return self._setting("STORAGE_BACKEND", None)
+
+    @property
+    def STORAGE_OPTIONS(self):
+        return self._setting("STORAGE_OPTIONS", {})
+
+    @property
+    def JSONL_PATH(self):
+        return self._setting("JSONL_PATH", "tracking-requests.jsonl")
+
+    @property
+    def JSONL_MAX_BYTES(self):
+        return self._setting("JSONL_MAX_BYTES", 64 * 1024 * 1024)
+
+    @property
+    def BUFFERED_WRITER(self):
+        return self._setting("BUFFERED_WRITER", False)
+
+    @property
+    def BUFFER_MAX_SIZE(self):
+        return self._setting("BUFFER_MAX_SIZE", 10000)
+
+    @property
+    def BUFFER_BATCH_SIZE(self):
+        return self._setting("BUFFER_BATCH_SIZE", 500)
+
+    @property
+    def BUFFER_FLUSH_INTERVAL(self):
+        return self._setting("BUFFER_FLUSH_INTERVAL", 2.0)
+
+    @property
+    def BUFFER_FULL_POLICY(self):
+        return self._setting("BUFFER_FULL_POLICY", "drop")
+
+    @property
+    def BUFFER_BLOCK_TIMEOUT(self):
+        return self._setting("BUFFER_BLOCK_TIMEOUT", 0.5)
+
+    @property
+    def SPOOL_DIR(self):
+        return self._setting("SPOOL_DIR", None)
+
+    @property
+    def SPOOL_SEGMENT_SIZE(self):
+        return self._setting("SPOOL_SEGMENT_SIZE", 64 * 1024 * 1024)
+
+    @property
+    def RETENTION_DAYS(self):
+        return self._setting("RETENTION_DAYS", None)
+
+    @property
+    def ROLLUPS(self):
+        return self._setting("ROLLUPS", False)
+
+    @property
+    def MIDDLEWARE_INCLUDE(self):
+        return self._setting("MIDDLEWARE_INCLUDE", None)
+
+    @property
+    def MIDDLEWARE_EXCLUDE(self):
+        return self._setting("MIDDLEWARE_EXCLUDE", ())
+
+    @property
+    def COMPRESS_TEXT(self):
+        return self._setting("COMPRESS_TEXT", False)
+
+    @property
+    def COMPRESS_MIN_LENGTH(self):
+        return self._setting("COMPRESS_MIN_LENGTH", 256)
+
+    @property
+    def COMPRESS_LEVEL(self):
+        return self._setting("COMPRESS_LEVEL", 6)
+
+    @property
+    def DEDUP_RESPONSES(self):
+        return self._setting("DEDUP_RESPONSES", False)
+
+    @property
+    def DEDUP_MIN_LENGTH(self):
+        return self._setting("DEDUP_MIN_LENGTH", 1024)
+
+    @property
+    def DEDUP_CACHE_SIZE(self):
+        return self._setting("DEDUP_CACHE_SIZE", 1024)
+
+    @property
+    def METRICS(self):
+        return self._setting("METRICS", False)
+
+    @property
+    def METRICS_DIR(self):
+        return self._setting("METRICS_DIR", None)
+
+    @property
+    def METRICS_FLUSH_INTERVAL(self):
+        return self._setting("METRICS_FLUSH_INTERVAL", 1.0)
+
+    @property
+    def METRICS_ALLOWED_NETWORKS(self):
+        return self._setting("METRICS_ALLOWED_NETWORKS", ())
+
+    @property
+    def SERVER_TIMING(self):
+        return self._setting("SERVER_TIMING", False)
+
+    @property
+    def TRUSTED_PROXIES(self):
+        return self._setting("TRUSTED_PROXIES", ())
+
+    @property
+    def STREAM_CAPTURE_BYTES(self):
+        return self._setting("STREAM_CAPTURE_BYTES", 64 * 1024)
+
+    @property
+    def BODY_SNAPSHOT_BYTES(self):
+        return self._setting("BODY_SNAPSHOT_BYTES", 64 * 1024)
+
+    @property
+    def DATABASE(self):
+        return self._setting("DATABASE", None)
+
+    @property
+    def SQLITE_PRAGMAS(self):
+        return self._setting(
+            "SQLITE_PRAGMAS",
+            {"journal_mode": "WAL", "synchronous": "NORMAL", "busy_timeout": 5000},
+        )
+
+    @property
+    def PARTITION(self):
+        return self._setting("PARTITION", None)
+
+    @property
+    def SEARCH_INDEX(self):
+        return self._setting("SEARCH_INDEX", False)
+
 
 app_settings = AppSetting("DRF_TRACKING_")
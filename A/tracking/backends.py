@@ -0,0 +1,260 @@
+import json
+import os
+import threading
+from collections import defaultdict, deque
+
+from django.core.signals import setting_changed
+from django.db import router, transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .app_settings import app_settings
+from .dedup import deduplicate_logs, store_blobs
+from .partitions import check_unpartitioned, write_partitioned
+from .rollups import record_logs
+from .search import index_logs
+from .spool import SpoolWriter, serialize_log
+
+
+class BaseStorageBackend:
+    """
+    Destination for finished log dicts. Backends implement ``write_many``;
+    ``write`` is the single-record path used when logs are not buffered.
+    """
+
+    def write(self, log):
+        self.write_many([log])
+
+    def write_many(self, logs):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class DatabaseBackend(BaseStorageBackend):
+    """
+    Inserts logs with the ORM. ``using`` picks a database alias; by default
+    the routers decide (see ``tracking.routers.TrackingRouter``). With
+    DRF_TRACKING_PARTITION set, logs go to per-period tables instead, which
+    the admin, the read API, search and the export and rollup commands do
+    not read; they refuse to run rather than show a partial view.
+    """
+
+    def __init__(self, model=None, using=None):
+        self.model = model
+        self.using = using
+
+    def get_model(self):
+        if self.model is None:
+            from .models import ApiRequestLog
+
+            self.model = ApiRequestLog
+        return self.model
+
+    def get_alias(self):
+        return self.using or router.db_for_write(self.get_model())
+
+    def write(self, log):
+        if app_settings.PARTITION:
+            return self.write_many([log])
+        # Blob references are only counted if the row that holds them is
+        # inserted too.
+        with transaction.atomic(using=self.get_alias()):
+            if app_settings.DEDUP_RESPONSES:
+                (stored,), blobs = deduplicate_logs([log])
+                store_blobs(blobs, using=self.using)
+            else:
+                stored = log
+            instance = self.get_model()(**stored)
+            instance.save(using=self.using)
+            if app_settings.SEARCH_INDEX:
+                index_logs([instance], [log], using=self.using)
+            if app_settings.ROLLUPS:
+                record_logs([log], using=self.using)
+
+    def write_many(self, logs):
+        model = self.get_model()
+        stored = logs
+        with transaction.atomic(using=self.get_alias()):
+            if app_settings.DEDUP_RESPONSES:
+                stored, blobs = deduplicate_logs(logs)
+                store_blobs(blobs, using=self.using)
+            if app_settings.PARTITION:
+                if app_settings.SEARCH_INDEX:
+                    check_unpartitioned("DRF_TRACKING_SEARCH_INDEX")
+                write_partitioned(stored, using=self.using)
+            else:
+                manager = model.objects
+                if self.using is not None:
+                    manager = manager.db_manager(self.using)
+                instances = manager.bulk_create([model(**log) for log in stored])
+                if app_settings.SEARCH_INDEX:
+                    index_logs(instances, logs, using=self.using)
+            if app_settings.ROLLUPS:
+                record_logs(logs, using=self.using)
+
+
+class SpoolBackend(BaseStorageBackend):
+    """
+    Appends framed records to per-process segment files; load them with
+    the ``ingest_tracking_spool`` command.
+    """
+
+    def __init__(self, directory=None, segment_size=None):
+        self.writer = SpoolWriter(directory, segment_size)
+
+    def write_many(self, logs):
+        for log in logs:
+            self.writer.write(log)
+
+    def close(self):
+        self.writer.close()
+
+
+class JSONLinesBackend(BaseStorageBackend):
+    """
+    Writes one JSON object per line to ``path``, rotating it to ``path.1``
+    ... ``path.<backup_count>`` once it grows past ``max_bytes``.
+    """
+
+    def __init__(self, path=None, max_bytes=None, backup_count=5):
+        self.path = str(path or app_settings.JSONL_PATH)
+        self.max_bytes = max_bytes or app_settings.JSONL_MAX_BYTES
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        self._fp = None
+
+    def write_many(self, logs):
+        lines = "".join(
+            json.dumps(serialize_log(log), separators=(",", ":"), default=str) + "\n"
+            for log in logs
+        )
+        with self._lock:
+            fp = self._get_file()
+            fp.write(lines)
+            fp.flush()
+            if fp.tell() >= self.max_bytes:
+                self._rotate()
+
+    def close(self):
+        with self._lock:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+
+    def _get_file(self):
+        if self._fp is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._fp = open(self.path, "a", encoding="utf-8")
+        return self._fp
+
+    def _rotate(self):
+        self._fp.close()
+        self._fp = None
+        for index in range(self.backup_count - 1, 0, -1):
+            source = "{}.{}".format(self.path, index)
+            if os.path.exists(source):
+                os.replace(source, "{}.{}".format(self.path, index + 1))
+        if self.backup_count:
+            os.replace(self.path, self.path + ".1")
+        else:
+            os.remove(self.path)
+
+
+class InMemoryStreamClient:
+    """
+    Local stand-in for a key-value/stream store client (the subset of the
+    redis-py API used by StreamBackend), for tests and development.
+    """
+
+    def __init__(self):
+        self.streams = defaultdict(deque)
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def xadd(self, name, fields, maxlen=None, approximate=True):
+        with self._lock:
+            self._sequence += 1
+            entry_id = "0-{}".format(self._sequence)
+            stream = self.streams[name]
+            stream.append((entry_id, dict(fields)))
+            while maxlen is not None and len(stream) > maxlen:
+                stream.popleft()
+            return entry_id
+
+    def xlen(self, name):
+        return len(self.streams[name])
+
+    def xrange(self, name):
+        return list(self.streams[name])
+
+    def pipeline(self, transaction=False):
+        return _InMemoryPipeline(self)
+
+
+class _InMemoryPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def xadd(self, *args, **kwargs):
+        self.commands.append((args, kwargs))
+        return self
+
+    def execute(self):
+        return [self.client.xadd(*args, **kwargs) for args, kwargs in self.commands]
+
+
+class StreamBackend(BaseStorageBackend):
+    """
+    Appends logs to a stream (e.g. a Redis stream) as JSON payloads, one
+    pipelined round-trip per batch. ``client`` may be a client instance or
+    a dotted path to a factory returning one.
+    """
+
+    def __init__(self, client=None, stream="tracking:requests", maxlen=None):
+        if client is None:
+            client = InMemoryStreamClient
+        if isinstance(client, str):
+            client = import_string(client)
+        self.client = client() if callable(client) else client
+        self.stream = stream
+        self.maxlen = maxlen
+
+    def write_many(self, logs):
+        pipeline = self.client.pipeline(transaction=False)
+        for log in logs:
+            payload = json.dumps(serialize_log(log), separators=(",", ":"), default=str)
+            pipeline.xadd(self.stream, {"log": payload}, maxlen=self.maxlen)
+        pipeline.execute()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+@receiver(setting_changed)
+def _clear_backend(**kwargs):
+    global _backend
+    if kwargs["setting"].startswith("DRF_TRACKING_") and _backend is not None:
+        _backend.close()
+        _backend = None
+
+
+def build_storage_backend():
+    path = app_settings.STORAGE_BACKEND
+    if path is None:
+        return SpoolBackend() if app_settings.SPOOL_DIR else DatabaseBackend()
+    return import_string(path)(**app_settings.STORAGE_OPTIONS)
+
+
+def get_storage_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = build_storage_backend()
+    return _backend
@@ -1,20 +1,50 @@
-import ast
-import ipaddress
+import json
 import logging
+import time
 import traceback
 
+from django.core.files.uploadedfile import UploadedFile
+from django.http import QueryDict
 from django.utils.timezone import now
+from rest_framework.exceptions import ParseError
+from rest_framework.request import Empty
 
-from .app_settings import app_settings
+from . import metrics
+from .ip import get_ip_resolver
+from .policy import get_policy
+from .sampling import get_route_sampler
+from .streaming import wrap_streaming_response
 
 logger = logging.getLogger(__name__)
 
+CAPTURE_FULL = "full"
+CAPTURE_HEADERS = "headers"
+CAPTURE_CONDITIONAL = "conditional"
+TRUNCATION_MARKER = "...[truncated {} bytes]"
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+MULTIPART_CONTENT_TYPE = "multipart/form-data"
+JSON_CONTENT_TYPE = "application/json"
+# Phases reported in the Server-Timing header, in milliseconds.
+SERVER_TIMING_METRICS = ("view", "render", "log", "total")
+
+
+def describe_upload(upload):
+    return {
+        "name": upload.name,
+        "size": upload.size,
+        "content_type": upload.content_type,
+    }
+
 
 class BaseLoggingMixin:
 
     logging_methods = "__all__"
     sensitive_fields = {}
+    sensitive_patterns = ()
+    sampler = None
     CLEAN_SUBSTITUTE = "******"
+    _started_ns = None
+    _view_finished_ns = None
 
     def __init__(self, *args, **kwargs) -> None:
         assert isinstance(
@@ -22,49 +52,244 @@ class BaseLoggingMixin:
         ), "CLEAN_SUBSTITUTE must be a string!"
         super().__init__(*args, **kwargs)
 
+    def initialize_request(self, request, *args, **kwargs):
+        # The earliest hook in APIView.dispatch, so authentication, parsing
+        # and throttling are part of the measured time.
+        self._started_ns = time.perf_counter_ns()
+        return super().initialize_request(request, *args, **kwargs)
+
     def initial(self, request, *args, **kwargs):
+        if self._started_ns is None:
+            self._started_ns = time.perf_counter_ns()
         self.log = {"requested_at": now()}
-        if not getattr(self, "decode_request_body", app_settings.DECODE_REQUEST_BODY):
-            self.log["data"] = ""
-        else:
-            self.log["data"] = request.data
         return super().initial(request, *args, **kwargs)
 
     def finalize_response(self, request, response, *args, **kwargs):
+        self._view_finished_ns = time.perf_counter_ns()
         response = super().finalize_response(request, response, *args, **kwargs)
-        if self.should_log(request, response):
-            if response.streaming:
-                rendered_content = None
-            elif hasattr(response, "rendered_content"):
-                rendered_content = response.rendered_content
-            else:
-                rendered_content = response.getvalue()
-            user = self._get_user(request)
-            self.log.update(
-                {
-                    "remote_addr": self._get_ip_address(request),
-                    "view": self._get_view_name(request),
-                    "view_method": self._get_view_method(request),
-                    "path": self._get_path(request),
-                    "host": request.get_host(),
-                    "method": request.method,
-                    "user": user,
-                    "username_persistent": user.get_username() if user else "Anonymous",
-                    "response_ms": self._get_response_ms(),
-                    "status_code": response.status_code,
-                    "query_params": self._clean_data(request.query_params.dict()),
-                    "response": self._clean_data(rendered_content),
-                }
+        if getattr(response, "is_rendered", True):
+            self._finish_response(request, response)
+        else:
+            # Log the body Django renders, after process_template_response
+            # middleware, instead of rendering it here.
+            response.add_post_render_callback(
+                lambda rendered: self._finish_response(request, rendered)
             )
-            try:
-                self.handle_log()
-            except Exception:
-                logger.exception("API request exception raised!")
         return response
 
+    def _finish_response(self, request, response):
+        if self.should_log(request, response):
+            self._log_response(request, response)
+        if self._get_policy().server_timing:
+            self._add_server_timing(response)
+
+    def _log_response(self, request, response):
+        started = time.perf_counter_ns()
+        if self._view_finished_ns is None:
+            self._view_finished_ns = started
+        self.timings = {"render": (started - self._view_finished_ns) / 1e6}
+        try:
+            self._record_response(request, response)
+        finally:
+            finished = time.perf_counter_ns()
+            self.timings["log"] = (finished - started) / 1e6
+            metrics.record_pipeline((finished - started) / 1e9)
+
+    def _add_server_timing(self, response):
+        timings = getattr(self, "timings", {})
+        if self._started_ns is not None and self._view_finished_ns is not None:
+            timings = dict(
+                timings, view=(self._view_finished_ns - self._started_ns) / 1e6
+            )
+            timings["total"] = (time.perf_counter_ns() - self._started_ns) / 1e6
+        value = ", ".join(
+            "{};dur={:.3f}".format(name, timings[name])
+            for name in SERVER_TIMING_METRICS
+            if name in timings
+        )
+        if not value:
+            return
+        if response.has_header("Server-Timing"):
+            value = response["Server-Timing"] + ", " + value
+        response["Server-Timing"] = value
+
+    def _record_response(self, request, response):
+        response_us = self._get_response_us()
+        response_ms = response_us // 1000
+        view_name = self._get_view_name(request)
+        metrics.record_request(view_name, request.method, response.status_code, response_ms)
+        path = self._get_path(request)
+        sample_weight = self._get_sample_weight(response, response_ms, view_name, path)
+        if sample_weight is None:
+            return
+        capture_body = self._should_capture_body(response, response_ms)
+        if capture_body:
+            # A streamed body is filled in once the stream has been sent.
+            response_body = None
+            if not response.streaming:
+                response_body = self._clean_data(self._get_response_body(response))
+            data = self._capture_request_data(self._get_request_data(request))
+        else:
+            response_body = self._clean_data(dict(response.items()))
+            data = ""
+        user = self._get_user(request)
+        self.log.update(
+            {
+                "remote_addr": self._get_ip_address(request),
+                "view": view_name,
+                "view_method": self._get_view_method(request),
+                "path": path,
+                "host": request.get_host(),
+                "method": request.method,
+                "user": user,
+                "username_persistent": user.get_username() if user else "Anonymous",
+                "response_ms": response_ms,
+                "response_us": response_us,
+                "status_code": response.status_code,
+                "query_params": self._clean_data(request.GET.dict()),
+                "response": response_body,
+                "data": data,
+                "sample_weight": sample_weight,
+            }
+        )
+        if response.streaming:
+            limit = self._get_policy().stream_capture_bytes if capture_body else 0
+            wrap_streaming_response(response, limit, self._finish_stream)
+            return
+        self._write_log()
+
+    def _finish_stream(self, captured, total, first_byte_ns, last_byte_ns, errors):
+        started = self._started_ns or last_byte_ns
+        if first_byte_ns is not None:
+            self.log["ttfb_us"] = (first_byte_ns - started) // 1000
+        self.log["ttlb_us"] = (last_byte_ns - started) // 1000
+        self.log["response_bytes"] = total
+        if self.log["response"] is None and (captured or total):
+            if total > len(captured):
+                captured += TRUNCATION_MARKER.format(total - len(captured)).encode()
+            self.log["response"] = self._clean_data(captured)
+        if errors:
+            self.log["errors"] = errors
+        self._write_log()
+
+    def _write_log(self):
+        try:
+            self.handle_log()
+        except Exception:
+            metrics.record_failure()
+            logger.exception("API request exception raised!")
+
     def handle_log(self):
         raise NotImplementedError
 
+    def _get_sample_weight(self, response, response_ms, view_name, path):
+        policy = self._get_policy()
+        if not 200 <= response.status_code < 300 and policy.always_log_errors:
+            return 1.0
+        slow_ms = policy.always_log_slow_ms
+        if slow_ms is not None and response_ms >= slow_ms:
+            return 1.0
+        sampler = policy.sampler
+        if sampler is None:
+            sampler = get_route_sampler(view_name, path or "")
+        if sampler is None:
+            return 1.0
+        return sampler.sample()
+
+    def _get_policy(self):
+        policy = self.__dict__.get("_policy")
+        if policy is None:
+            policy = self._policy = get_policy(self)
+        return policy
+
+    def _should_capture_body(self, response, response_ms):
+        policy = self._get_policy()
+        mode = policy.capture_mode
+        if mode == CAPTURE_FULL:
+            return True
+        if mode == CAPTURE_HEADERS:
+            return False
+        assert mode == CAPTURE_CONDITIONAL, "Unknown capture mode: {}".format(mode)
+        min_status = policy.full_capture_status
+        min_ms = policy.full_capture_ms
+        return (min_status is not None and response.status_code >= min_status) or (
+            min_ms is not None and response_ms >= min_ms
+        )
+
+    def _get_response_body(self, response):
+        if response.streaming:
+            return None
+        # Cut the raw bytes before they are decoded and sanitized.
+        return self._truncate(response.content)
+
+    def _get_request_data(self, request):
+        """
+        The request body, looked at only once the request is being logged:
+        data the view already parsed, otherwise a capped raw snapshot.
+        """
+        if not self._get_policy().decode_request_body:
+            return ""
+        if getattr(request, "_full_data", Empty) is not Empty:
+            return request.data
+        if request.content_type.startswith(MULTIPART_CONTENT_TYPE):
+            # Uploads are parsed to disk by Django's upload handlers and only
+            # their metadata is logged.
+            try:
+                return request.data
+            except ParseError:
+                return ""
+        return self._get_body_snapshot(request._request)
+
+    def _get_body_snapshot(self, http_request):
+        limit = self._get_policy().body_snapshot_bytes
+        if hasattr(http_request, "_body"):
+            body = http_request._body[: limit + 1]
+        elif http_request._read_started:
+            return ""
+        else:
+            body = http_request.read(limit + 1)
+        content_type = http_request.content_type
+        if len(body) > limit:
+            if content_type in (JSON_CONTENT_TYPE, FORM_CONTENT_TYPE):
+                # A cut off document cannot be parsed, so it cannot be
+                # sanitized either; keep only its size.
+                size = http_request.META.get("CONTENT_LENGTH") or len(body)
+                return TRUNCATION_MARKER.format(size)
+            return body
+        if content_type == JSON_CONTENT_TYPE:
+            try:
+                return json.loads(body)
+            except ValueError:
+                return body
+        if content_type == FORM_CONTENT_TYPE:
+            return QueryDict(body, encoding=http_request.encoding).dict()
+        return body
+
+    def _capture_request_data(self, data):
+        if isinstance(data, dict) and any(
+            isinstance(value, UploadedFile) for value in data.values()
+        ):
+            data = {
+                key: describe_upload(value) if isinstance(value, UploadedFile) else value
+                for key, value in data.items()
+            }
+        if isinstance(data, (str, bytes)):
+            return self._clean_data(self._truncate(data))
+        data = self._clean_data(data)
+        if self._get_policy().max_body_bytes is None or not data:
+            return data
+        # Parsed data can only be cut once it has been sanitized.
+        return self._truncate(str(data))
+
+    def _truncate(self, content):
+        max_bytes = self._get_policy().max_body_bytes
+        if max_bytes is None or content is None or len(content) <= max_bytes:
+            return content
+        marker = TRUNCATION_MARKER.format(len(content) - max_bytes)
+        if isinstance(content, bytes):
+            marker = marker.encode()
+        return content[:max_bytes] + marker
+
     def _get_user(self, request):
         user = request.user
         if user.is_anonymous:
@@ -73,26 +298,14 @@ class BaseLoggingMixin:
 
     def _get_view_name(self, request):
         method = request.method.lower()
-        try:
-            attribute = getattr(self, method)
-            attribute_self_type = type(attribute.__self__)
-            return attribute_self_type.__module__ + "." + attribute_self_type.__name__
-        except AttributeError:
-            return None
+        policy = self._get_policy()
+        # Viewsets bind their actions on the instance in as_view().
+        if method in policy.handlers or method in self.__dict__:
+            return policy.view_name
+        return None
 
     def _get_ip_address(self, request):
-        ipaddr = request.META.get("HTTP_X_FORWARDED_FOR")
-        if ipaddr:
-            ipaddr = ipaddr.split(",")[0]
-        else:
-            ipaddr = request.META.get("REMOTE_ADDR", "").split(",")[0]
-        possibles = (ipaddr.lstrip("[").split("]")[0], ipaddr.split(":")[0])
-        for addr in possibles:
-            try:
-                return str(ipaddress.ip_address(addr))
-            except:
-                pass
-        return ipaddr
+        return get_ip_resolver().resolve(request.META)
 
     def _get_view_method(self, request):
         if hasattr(self, "action"):
@@ -100,40 +313,17 @@ class BaseLoggingMixin:
         return request.method.lower()
 
     def _get_path(self, request):
-        return request.path[: app_settings.PATH_LENGTH]
+        return request.path[: self._get_policy().path_length]
 
-    def _get_response_ms(self):
-        response_timedelta = now() - self.log["requested_at"]
-        response_ms = int(response_timedelta.total_seconds() * 1000)
-        return max(response_ms, 0)
+    def _get_response_us(self):
+        # A monotonic clock, so wall clock adjustments cannot skew durations.
+        started = self._started_ns
+        if started is None:
+            return 0
+        return max(time.perf_counter_ns() - started, 0) // 1000
 
     def _clean_data(self, data):
-
-        if isinstance(data, dict):
-            SENSITIVE_FIELDS = {"key", "signature", "token", "api", "token", "password"}
-            if self.sensitive_fields:
-                SENSITIVE_FIELDS = SENSITIVE_FIELDS | {
-                    field.lower() for field in self.sensitive_fields
-                }
-
-            for key, value in data.items():
-                try:
-                    value = ast.literal_eval(value)
-                except (ValueError, SyntaxError):
-                    pass
-
-                if isinstance(value, (list, dict)):
-                    data[key] = self._clean_data(value)
-                if key.lower() in SENSITIVE_FIELDS:
-                    data[key] = self.CLEAN_SUBSTITUTE
-
-        elif isinstance(data, list):
-            return [self._clean_data(d) for d in data]
-
-        elif isinstance(data, bytes):
-            return data.decode(errors="replace")
-
-        return data
+        return self._get_policy().sanitizer.clean(data)
 
     def handle_exception(self, exc):
         response = super().handle_exception(exc)
@@ -141,6 +331,5 @@ class BaseLoggingMixin:
         return response
 
     def should_log(self, request, response):
-        return (
-            self.logging_methods == "__all__" or request.method in self.logging_methods
-        )
+        methods = self._get_policy().methods
+        return methods is None or request.method in methods
@@ -1,18 +1,38 @@
 from django.conf import settings
 from django.db import models
 
+from .fields import CompressedTextField
+from .routers import SET_NULL_ROUTED
+
 
 class BaseApiRequestLog(models.Model):
     user = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True
+        settings.AUTH_USER_MODEL,
+        on_delete=SET_NULL_ROUTED,
+        blank=True,
+        null=True,
+        # Logs may live in their own database (DRF_TRACKING_DATABASE).
+        db_constraint=False,
     )
     username_persistent = models.CharField(
         max_length=getattr(settings, "DRF_TRACKING_USERNAME_LENGTH", 200),
         null=True,
         blank=True,
     )
-    requested_at = models.DateField(db_index=True)
+    requested_at = models.DateTimeField(db_index=True)
     response_ms = models.PositiveIntegerField(default=0)
+    response_us = models.PositiveBigIntegerField(
+        null=True, blank=True, help_text="response time in microseconds"
+    )
+    ttfb_us = models.PositiveBigIntegerField(
+        null=True, blank=True, help_text="time to first streamed byte in microseconds"
+    )
+    ttlb_us = models.PositiveBigIntegerField(
+        null=True, blank=True, help_text="time to last streamed byte in microseconds"
+    )
+    response_bytes = models.PositiveBigIntegerField(
+        null=True, blank=True, help_text="size of a streamed response body"
+    )
     path = models.CharField(
         max_length=getattr(settings, "DRF_TRACKING_PATH_LENGTH", 200),
         db_index=True,
@@ -34,11 +54,21 @@ class BaseApiRequestLog(models.Model):
     remote_addr = models.GenericIPAddressField()
     host = models.URLField()
     method = models.CharField(max_length=10)
-    query_params = models.TextField(null=True, blank=True)
-    data = models.TextField(null=True, blank=True)
-    response = models.TextField(null=True, blank=True)
-    errors = models.TextField(null=True, blank=True)
+    query_params = CompressedTextField(null=True, blank=True)
+    data = CompressedTextField(null=True, blank=True)
+    response = CompressedTextField(null=True, blank=True)
+    response_digest = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="digest of a deduplicated response body",
+    )
+    errors = CompressedTextField(null=True, blank=True)
     status_code = models.PositiveSmallIntegerField(null=True, blank=True, db_index=True)
+    sample_weight = models.FloatField(
+        default=1.0, help_text="number of requests this sampled row represents"
+    )
 
     class Meta:
         abstract = True
@@ -46,3 +76,11 @@ class BaseApiRequestLog(models.Model):
 
     def __str__(self):
         return "{} {}".format(self.method, self.path)
+
+    def get_response_body(self):
+        if self.response_digest:
+            from .models import ResponseBlob
+
+            blob = ResponseBlob.objects.filter(digest=self.response_digest).first()
+            return blob.body if blob else None
+        return self.response
@@ -0,0 +1,176 @@
+"""
+Per-request overhead of LoggingMixin, driven through the request factory.
+
+Every scenario posts a JSON payload of a given size, nesting depth and
+number of sensitive keys to the echo views in ``tracking.benchmarks.views``
+and records wall time, time spent in each logging phase and allocations.
+Use the ``benchmark_tracking`` management command to run it.
+"""
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from . import views
+
+VIEWS = {
+    "no_logging": views.EchoView,
+    "logging": views.LoggingEchoView,
+    "sensitive_fields": views.SensitiveFieldsLoggingEchoView,
+}
+PAYLOAD_ITEMS = (10, 100, 1000)
+NESTING_DEPTHS = (1, 4)
+SENSITIVE_KEYS = (0, 10)
+PHASES = ("body_capture", "render", "clean_data", "ip_address", "db_write")
+
+
+class PhaseTimer:
+    """Accumulates exclusive time per phase; nested phases are not double counted."""
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self._children = []
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        self._children.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.totals[name] += elapsed - self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+
+    def reset(self):
+        self.totals.clear()
+
+
+class PhaseTimingMixin:
+    phase_timer = None
+
+    def _capture_request_data(self, data):
+        with self.phase_timer.phase("body_capture"):
+            return super()._capture_request_data(data)
+
+    def _clean_data(self, data):
+        with self.phase_timer.phase("clean_data"):
+            return super()._clean_data(data)
+
+    def _get_ip_address(self, request):
+        with self.phase_timer.phase("ip_address"):
+            return super()._get_ip_address(request)
+
+    def handle_log(self):
+        with self.phase_timer.phase("db_write"):
+            return super().handle_log()
+
+
+def make_payload(items, depth, sensitive):
+    def node(level, index):
+        value = {"id": index, "name": "item %d" % index, "price": "12.50"}
+        if level < depth:
+            value["child"] = node(level + 1, index)
+        return value
+
+    results = [node(1, index) for index in range(items)]
+    for index in range(min(sensitive, items)):
+        results[index]["token"] = "secret"
+    return {"results": results}
+
+
+def scenarios(items=PAYLOAD_ITEMS, depths=NESTING_DEPTHS, sensitive=SENSITIVE_KEYS):
+    for count in items:
+        for depth in depths:
+            for keys in sensitive:
+                yield "items={},depth={},sensitive={}".format(count, depth, keys), (
+                    make_payload(count, depth, keys)
+                )
+
+
+def build_view(view_class, timer):
+    bench_class = type(
+        "Benchmark" + view_class.__name__,
+        (PhaseTimingMixin, view_class),
+        {"phase_timer": timer, "__module__": view_class.__module__},
+    )
+    return bench_class.as_view()
+
+
+def run_scenario(view, payload, iterations, timer):
+    factory = APIRequestFactory()
+
+    def request():
+        return factory.post("/benchmark/", payload, format="json")
+
+    view(request())  # warm up caches (sanitizer, settings, DB connection)
+    timer.reset()
+    durations = []
+    for _ in range(iterations):
+        req = request()
+        start = time.perf_counter()
+        response = view(req)
+        # Logging runs from the render callback; its phases are not counted
+        # as render time.
+        with timer.phase("render"):
+            response.render()
+        durations.append(time.perf_counter() - start)
+    phases = {name: timer.totals[name] / iterations * 1e6 for name in PHASES}
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        view(request()).render()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    allocated = sum(
+        stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0
+    )
+    return {
+        "median_ms": statistics.median(durations) * 1000,
+        "mean_ms": statistics.fmean(durations) * 1000,
+        "phases_us": phases,
+        "allocated_kib": allocated / 1024,
+        "peak_kib": peak / 1024,
+    }
+
+
+def run(iterations=20, view_names=None, **scenario_options):
+    """
+    Return ``{"<view>:<scenario>": result}``. Database writes happen inside
+    a transaction that is rolled back, so nothing is left behind.
+    """
+    results = {}
+    timer = PhaseTimer()
+    with override_settings(ALLOWED_HOSTS=["testserver"]), transaction.atomic():
+        for name in view_names or VIEWS:
+            view = build_view(VIEWS[name], timer)
+            for scenario, payload in scenarios(**scenario_options):
+                results["{}:{}".format(name, scenario)] = run_scenario(
+                    view, payload, iterations, timer
+                )
+        transaction.set_rollback(True)
+    return results
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Return ``[(key, baseline_ms, current_ms)]`` for scenarios whose median
+    time grew by more than ``threshold`` (a fraction) over the baseline.
+    """
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        if result["median_ms"] > previous["median_ms"] * (1 + threshold):
+            regressions.append((key, previous["median_ms"], result["median_ms"]))
+    return regressions
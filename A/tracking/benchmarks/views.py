@@ -0,0 +1,18 @@
+"""Views the overhead benchmark posts its payloads to."""
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from tracking.mixins import LoggingMixin
+
+
+class EchoView(APIView):
+    def post(self, request):
+        return Response(request.data)
+
+
+class LoggingEchoView(LoggingMixin, EchoView):
+    pass
+
+
+class SensitiveFieldsLoggingEchoView(LoggingEchoView):
+    sensitive_fields = {"mY_fIeLd"}
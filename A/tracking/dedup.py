@@ -0,0 +1,134 @@
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+
+from django.core.signals import setting_changed
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.dispatch import receiver
+
+from .app_settings import app_settings
+
+
+class DigestCache:
+    """Bounded LRU of digests recently seen in the blob table."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._digests = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, digest):
+        with self._lock:
+            if digest in self._digests:
+                self._digests.move_to_end(digest)
+                return True
+            return False
+
+    def add(self, digest):
+        with self._lock:
+            self._digests[digest] = None
+            self._digests.move_to_end(digest)
+            while len(self._digests) > self.max_size:
+                self._digests.popitem(last=False)
+
+    def discard(self, digest):
+        with self._lock:
+            self._digests.pop(digest, None)
+
+    def clear(self):
+        with self._lock:
+            self._digests.clear()
+
+
+_digest_cache = None
+
+
+@receiver(setting_changed)
+def _clear_digest_cache(**kwargs):
+    global _digest_cache
+    if kwargs["setting"] == "DRF_TRACKING_DEDUP_CACHE_SIZE":
+        _digest_cache = None
+
+
+def get_digest_cache():
+    global _digest_cache
+    if _digest_cache is None:
+        _digest_cache = DigestCache(app_settings.DEDUP_CACHE_SIZE)
+    return _digest_cache
+
+
+def digest_body(body):
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def deduplicate_logs(logs):
+    """
+    Replace large response bodies with their digest. Returns the rewritten
+    logs and ``{digest: (body, references)}`` for ``store_blobs``.
+    """
+    min_length = app_settings.DEDUP_MIN_LENGTH
+    blobs = {}
+    references = Counter()
+    result = []
+    for log in logs:
+        body = log.get("response")
+        if not isinstance(body, str) or len(body) < min_length:
+            result.append(log)
+            continue
+        digest = digest_body(body)
+        blobs[digest] = body
+        references[digest] += 1
+        result.append(dict(log, response=None, response_digest=digest))
+    return result, {digest: (blobs[digest], references[digest]) for digest in blobs}
+
+
+def store_blobs(blobs, using=None):
+    from .models import ResponseBlob
+
+    manager = ResponseBlob.objects.db_manager(using)
+    digest_cache = get_digest_cache()
+    pending = {}
+    for digest, (body, count) in blobs.items():
+        # Digests in the hot cache almost always exist, so skip the lookup
+        # and go straight to the reference bump.
+        if digest in digest_cache and manager.filter(digest=digest).update(
+            ref_count=F("ref_count") + count
+        ):
+            continue
+        pending[digest] = (body, count)
+    if not pending:
+        return
+    existing = set(
+        manager.filter(digest__in=list(pending)).values_list("digest", flat=True)
+    )
+    for digest, (body, count) in pending.items():
+        if digest in existing:
+            manager.filter(digest=digest).update(ref_count=F("ref_count") + count)
+        else:
+            try:
+                with transaction.atomic(using=manager.db):
+                    manager.create(
+                        digest=digest, body=body, size=len(body), ref_count=count
+                    )
+            except IntegrityError:
+                manager.filter(digest=digest).update(ref_count=F("ref_count") + count)
+        digest_cache.add(digest)
+
+
+def release_blobs(references, using=None):
+    """
+    Drop ``{digest: count}`` references, e.g. for purged logs, and delete
+    blobs nobody points to any more.
+    """
+    from .models import ResponseBlob
+
+    manager = ResponseBlob.objects.db_manager(using)
+    digest_cache = get_digest_cache()
+    for digest, count in references.items():
+        manager.filter(digest=digest).update(ref_count=F("ref_count") - count)
+    # The ref_count condition is part of the DELETE itself, so a reference
+    # added concurrently keeps its blob alive.
+    manager.filter(digest__in=list(references), ref_count__lte=0).delete()
+    for digest in references:
+        digest_cache.discard(digest)
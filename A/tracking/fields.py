@@ -0,0 +1,75 @@
+import base64
+import zlib
+
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+from .app_settings import app_settings
+
+# Compressed values are stored as text: a short header naming the codec
+# followed by base85 of the compressed UTF-8 bytes. Plain legacy values never
+# start with the \x1f control character, so they are read back unchanged.
+ZLIB_HEADER = "\x1fz1:"
+
+
+def is_compressed(value):
+    return isinstance(value, str) and value.startswith(ZLIB_HEADER)
+
+
+def compress_text(value, level=None):
+    if level is None:
+        level = app_settings.COMPRESS_LEVEL
+    compressed = zlib.compress(value.encode(), level)
+    return ZLIB_HEADER + base64.b85encode(compressed).decode("ascii")
+
+
+def decompress_text(value):
+    if not is_compressed(value):
+        return value
+    compressed = base64.b85decode(value[len(ZLIB_HEADER) :])
+    return zlib.decompress(compressed).decode()
+
+
+class CompressedTextDescriptor(DeferredAttribute):
+    """
+    Keeps the stored text on the instance and only decompresses it the
+    first time the attribute is read.
+    """
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        data = instance.__dict__
+        attname = self.field.attname
+        if attname not in data:
+            super().__get__(instance, cls)
+        value = data[attname]
+        if is_compressed(value):
+            value = data[attname] = decompress_text(value)
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class CompressedTextField(models.TextField):
+    """
+    TextField that zlib-compresses values of at least
+    DRF_TRACKING_COMPRESS_MIN_LENGTH characters when DRF_TRACKING_COMPRESS_TEXT
+    is enabled. Uncompressed rows keep working, so it can be switched on for
+    an existing table. Lookups on the column only see the stored form, and
+    ``values()`` querysets return it as stored; use ``decompress_text`` there.
+    """
+
+    descriptor_class = CompressedTextDescriptor
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if (
+            value is None
+            or not app_settings.COMPRESS_TEXT
+            or len(value) < app_settings.COMPRESS_MIN_LENGTH
+            or is_compressed(value)
+        ):
+            return value
+        return compress_text(value)
@@ -0,0 +1,136 @@
+import ipaddress
+from functools import lru_cache
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .app_settings import app_settings
+
+ADDRESS_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def normalize_address(value):
+    """
+    Return the canonical form of an address as found in REMOTE_ADDR or a
+    forwarding header (optionally quoted, bracketed or with a port), or
+    None if it is not an IP address.
+    """
+    value = value.strip().strip('"')
+    if value.startswith("["):
+        candidates = (value[1:].split("]")[0],)
+    else:
+        candidates = (value, value.split(":")[0])
+    for candidate in candidates:
+        try:
+            return str(ipaddress.ip_address(candidate))
+        except ValueError:
+            pass
+    return None
+
+
+def parse_forwarded(header):
+    """Return the ``for=`` values of an RFC 7239 Forwarded header, in order."""
+    hops = []
+    for element in header.split(","):
+        for pair in element.split(";"):
+            name, _, value = pair.partition("=")
+            if name.strip().lower() == "for":
+                hops.append(value.strip())
+    return hops
+
+
+class ProxyNetworks:
+    """
+    Membership test for a set of CIDRs. Networks are grouped by prefix
+    length, so a lookup masks the address once per distinct length instead
+    of scanning every network.
+    """
+
+    BITS = {4: 32, 6: 128}
+
+    def __init__(self, cidrs):
+        self.prefixes = {4: {}, 6: {}}
+        for cidr in cidrs:
+            network = ipaddress.ip_network(cidr, strict=False)
+            by_length = self.prefixes[network.version]
+            by_length.setdefault(network.prefixlen, set()).add(
+                int(network.network_address)
+            )
+
+    def __bool__(self):
+        return any(self.prefixes.values())
+
+    def __contains__(self, address):
+        address = ipaddress.ip_address(address)
+        if address.version == 6 and address.ipv4_mapped is not None:
+            address = address.ipv4_mapped
+        value = int(address)
+        bits = self.BITS[address.version]
+        for length, networks in self.prefixes[address.version].items():
+            if (value >> (bits - length)) << (bits - length) in networks:
+                return True
+        return False
+
+
+class IPResolver:
+    """
+    Finds the client address of a request. Without trusted proxies the
+    first X-Forwarded-For entry is used, as before. With
+    DRF_TRACKING_TRUSTED_PROXIES set, the chain of REMOTE_ADDR and the
+    Forwarded (or X-Forwarded-For) header is walked from the right and the
+    first address that is not a trusted proxy wins.
+    """
+
+    def __init__(self, trusted_proxies=()):
+        self.trusted = ProxyNetworks(trusted_proxies)
+        self.is_trusted = lru_cache(maxsize=ADDRESS_CACHE_SIZE)(
+            self.trusted.__contains__
+        )
+
+    def resolve(self, meta):
+        if not self.trusted:
+            return self._resolve_untrusted(meta)
+        remote_addr = meta.get("REMOTE_ADDR", "").split(",")[0]
+        client = normalize_address(remote_addr)
+        if client is None or not self.is_trusted(client):
+            return client or remote_addr
+        if "HTTP_FORWARDED" in meta:
+            hops = parse_forwarded(meta["HTTP_FORWARDED"])
+        else:
+            hops = meta.get("HTTP_X_FORWARDED_FOR", "").split(",")
+        for hop in reversed(hops):
+            address = normalize_address(hop)
+            if address is None:
+                # An obfuscated or garbled hop; the proxy that reported it
+                # is the last address we can vouch for.
+                break
+            client = address
+            if not self.is_trusted(address):
+                break
+        return client
+
+    def _resolve_untrusted(self, meta):
+        address = meta.get("HTTP_X_FORWARDED_FOR")
+        if address:
+            address = address.split(",")[0]
+        else:
+            address = meta.get("REMOTE_ADDR", "").split(",")[0]
+        return normalize_address(address) or address
+
+
+_resolver = None
+
+
+@receiver(setting_changed)
+def _clear_resolver(**kwargs):
+    global _resolver
+    if kwargs["setting"] == "DRF_TRACKING_TRUSTED_PROXIES":
+        _resolver = None
+
+
+def get_ip_resolver():
+    global _resolver
+    if _resolver is None:
+        _resolver = IPResolver(app_settings.TRUSTED_PROXIES)
+    return _resolver
@@ -0,0 +1,74 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tracking.benchmarks import overhead
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request overhead of LoggingMixin. Timings depend on the "
+        "machine, so compare against a baseline saved on the same one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--view",
+            action="append",
+            choices=sorted(overhead.VIEWS),
+            help="Only benchmark this view, may be repeated.",
+        )
+        parser.add_argument(
+            "--items", type=int, action="append", help="Payload sizes to run."
+        )
+        parser.add_argument("--save-baseline", metavar="PATH")
+        parser.add_argument("--compare", metavar="PATH", help="Baseline file to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed slowdown as a fraction of the baseline median.",
+        )
+
+    def handle(self, *args, **options):
+        scenario_options = {}
+        if options["items"]:
+            scenario_options["items"] = options["items"]
+        results = overhead.run(
+            iterations=options["iterations"],
+            view_names=options["view"],
+            **scenario_options
+        )
+        self.report(results)
+
+        if options["save_baseline"]:
+            with open(options["save_baseline"], "w") as fp:
+                json.dump(results, fp, indent=2, sort_keys=True)
+            self.stdout.write("Baseline written to {}".format(options["save_baseline"]))
+
+        if options["compare"]:
+            with open(options["compare"]) as fp:
+                baseline = json.load(fp)
+            regressions = overhead.compare(results, baseline, options["threshold"])
+            for key, previous, current in regressions:
+                self.stdout.write(
+                    "REGRESSION {}: {:.3f} ms -> {:.3f} ms".format(key, previous, current)
+                )
+            if regressions:
+                raise CommandError("{} scenario(s) regressed.".format(len(regressions)))
+            self.stdout.write("No regressions against {}".format(options["compare"]))
+
+    def report(self, results):
+        header = "{:<52} {:>9} {:>9}".format("scenario", "median ms", "alloc KiB")
+        header += "".join(" {:>12}".format(phase) for phase in overhead.PHASES)
+        self.stdout.write(header)
+        for key, result in results.items():
+            line = "{:<52} {:>9.3f} {:>9.1f}".format(
+                key, result["median_ms"], result["allocated_kib"]
+            )
+            line += "".join(
+                " {:>12.1f}".format(result["phases_us"][phase]) for phase in overhead.PHASES
+            )
+            self.stdout.write(line)
+        self.stdout.write("Phase columns are mean microseconds per request.")
@@ -0,0 +1,73 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import router, transaction
+
+from tracking.app_settings import app_settings
+from tracking.fields import compress_text, decompress_text, is_compressed
+from tracking.models import ApiRequestLog
+
+FIELDS = ("query_params", "data", "response", "errors")
+
+
+class Command(BaseCommand):
+    help = "Compress (or decompress) the large text columns of existing logs in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--sleep", type=float, default=0.0)
+        parser.add_argument(
+            "--min-length",
+            type=int,
+            default=None,
+            help="Defaults to DRF_TRACKING_COMPRESS_MIN_LENGTH.",
+        )
+        parser.add_argument(
+            "--decompress",
+            action="store_true",
+            help="Restore plain text. Run with DRF_TRACKING_COMPRESS_TEXT disabled.",
+        )
+
+    def handle(self, *args, **options):
+        min_length = options["min_length"]
+        if min_length is None:
+            min_length = app_settings.COMPRESS_MIN_LENGTH
+        decompress = options["decompress"]
+        convert = decompress_text if decompress else compress_text
+        last_pk = 0
+        updated = 0
+        while True:
+            # values_list returns the stored text, nothing is decompressed
+            # unless it is about to be rewritten.
+            rows = list(
+                ApiRequestLog.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", *FIELDS)[: options["batch_size"]]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            changed = []
+            for pk, *values in rows:
+                changes = {
+                    field: convert(value)
+                    for field, value in zip(FIELDS, values)
+                    if self.should_convert(value, decompress, min_length)
+                }
+                if changes:
+                    changed.append((pk, changes))
+            updated += self.update(changed)
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+        self.stdout.write("Rewrote {} log(s).".format(updated))
+
+    def should_convert(self, value, decompress, min_length):
+        if decompress:
+            return is_compressed(value)
+        return value is not None and not is_compressed(value) and len(value) >= min_length
+
+    def update(self, changed):
+        with transaction.atomic(using=router.db_for_write(ApiRequestLog)):
+            for pk, changes in changed:
+                ApiRequestLog.objects.filter(pk=pk).update(**changes)
+        return len(changed)
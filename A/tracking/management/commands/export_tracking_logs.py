@@ -0,0 +1,418 @@
+import csv
+import datetime
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Max, Min
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+from tracking.fields import decompress_text
+from tracking.models import ApiRequestLog, ResponseBlob
+from tracking.partitions import check_unpartitioned
+from tracking.rollups import status_lookups
+
+TEXT_FIELDS = ("query_params", "data", "response", "errors")
+FORMATS = ("csv", "jsonl", "parquet")
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+
+def default_fields():
+    return [field.attname for field in ApiRequestLog._meta.concrete_fields]
+
+
+def to_text(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+class CSVPart:
+    """
+    Rows of one id range as CSV. ``offset`` is where the last checkpointed
+    chunk ended; anything written after it is discarded.
+    """
+
+    def __init__(self, path, fields):
+        self.path = path
+        self.fields = fields
+
+    def open(self, offset, with_header):
+        self.fp = open(self.path, "a+", newline="", encoding="utf-8")
+        self.fp.truncate(offset)
+        self.fp.seek(offset)
+        if offset == 0 and with_header:
+            self.fp.write(self.header())
+        self.writer = csv.writer(self.fp)
+
+    def write(self, rows):
+        self.writer.writerows(
+            ["" if value is None else to_text(value) for value in row] for row in rows
+        )
+        self.fp.flush()
+        return self.fp.tell()
+
+    def header(self):
+        return ",".join(self.fields) + "\r\n"
+
+    def close(self):
+        self.fp.close()
+
+
+class JSONLinesPart(CSVPart):
+    def open(self, offset, with_header):
+        self.fp = open(self.path, "a+", encoding="utf-8")
+        self.fp.truncate(offset)
+        self.fp.seek(offset)
+
+    def write(self, rows):
+        self.fp.write(
+            "".join(
+                json.dumps(
+                    dict(zip(self.fields, row)), separators=(",", ":"), default=to_text
+                )
+                + "\n"
+                for row in rows
+            )
+        )
+        self.fp.flush()
+        return self.fp.tell()
+
+    def header(self):
+        return ""
+
+
+class ParquetPart:
+    """
+    Writes each chunk to its own zstd-compressed file in the output
+    directory, named after the chunk's first id, so re-exporting a chunk
+    after an interruption replaces the file instead of duplicating rows.
+    """
+
+    def __init__(self, path, fields):
+        import pyarrow
+        import pyarrow.parquet
+
+        self.pyarrow = pyarrow
+        self.parquet = pyarrow.parquet
+        self.directory = os.path.dirname(path)
+        self.fields = fields
+
+    def open(self, offset, with_header):
+        pass
+
+    def write(self, rows):
+        columns = {field: [] for field in self.fields}
+        for row in rows:
+            for field, value in zip(self.fields, row):
+                columns[field].append(value)
+        table = self.pyarrow.table(columns)
+        name = os.path.join(self.directory, "part-{:012d}.parquet".format(rows[0][0]))
+        self.parquet.write_table(table, name + ".tmp", compression="zstd")
+        os.replace(name + ".tmp", name)
+        return 0
+
+    def close(self):
+        pass
+
+
+PART_CLASSES = {"csv": CSVPart, "jsonl": JSONLinesPart, "parquet": ParquetPart}
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream ApiRequestLog rows to CSV, JSON lines or a directory of parquet "
+        "files, in primary key order with constant memory. Interrupted exports "
+        "continue with --resume. Parquet needs the optional pyarrow package."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Output file, or directory for parquet.")
+        parser.add_argument("--format", choices=FORMATS, default="csv")
+        parser.add_argument("--since", default=None, help="ISO datetime.")
+        parser.add_argument("--until", default=None, help="ISO datetime, exclusive.")
+        parser.add_argument("--view", action="append", help="May be repeated.")
+        parser.add_argument("--method", action="append", help="May be repeated.")
+        parser.add_argument(
+            "--status", help="Status code (e.g. 404) or class (e.g. 5xx)."
+        )
+        parser.add_argument(
+            "--fields", help="Comma separated columns, defaults to all of them."
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Export disjoint id ranges in parallel threads.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted export of the same query.",
+        )
+
+    def handle(self, *args, **options):
+        check_unpartitioned("export_tracking_logs", CommandError)
+        fields = self.get_fields(options["fields"])
+        queryset = self.get_queryset(options)
+        output = options["output"]
+        export_format = options["format"]
+        if export_format == "parquet":
+            try:
+                import pyarrow.parquet  # noqa: F401
+            except ImportError:
+                raise CommandError(
+                    "The parquet format requires pyarrow (pip install pyarrow)."
+                )
+        # On resume the id ranges come from the checkpoints, so rows logged
+        # since the export started cannot move its upper bound.
+        ranges = None
+        if options["resume"]:
+            ranges = self.read_ranges(output, export_format)
+        resumed = ranges is not None
+        if not resumed:
+            bounds = queryset.aggregate(first=Min("pk"), last=Max("pk"))
+            ranges = self.split(bounds["first"], bounds["last"], options["workers"])
+        state = {
+            "format": export_format,
+            "fields": fields,
+            "query": str(queryset.values("pk").query),
+            "ranges": [list(bounds) for bounds in ranges],
+        }
+        parts = self.prepare(output, export_format, ranges, options["resume"])
+        if not resumed:
+            for path, (start, end) in zip(parts, ranges):
+                self.write_checkpoint(
+                    path + CHECKPOINT_SUFFIX,
+                    dict(state, start=start, end=end, last_pk=start, offset=0, rows=0),
+                )
+
+        jobs = [
+            (queryset, fields, export_format, path, start, end, state, options["chunk_size"])
+            for path, (start, end) in zip(parts, ranges)
+        ]
+        if len(jobs) > 1:
+            with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                counts = list(executor.map(lambda job: self.export_in_thread(job), jobs))
+        else:
+            counts = [self.export_range(*jobs[0], with_header=True)]
+
+        self.finish(output, export_format, fields, parts)
+        self.stdout.write("Exported {} log(s) to {}.".format(sum(counts), output))
+
+    def get_fields(self, value):
+        available = default_fields()
+        if not value:
+            return available
+        fields = [field.strip() for field in value.split(",") if field.strip()]
+        unknown = set(fields) - set(available)
+        if unknown:
+            raise CommandError("Unknown field(s): {}".format(", ".join(sorted(unknown))))
+        # The id drives chunking and resuming, so it is always exported.
+        return ["id"] + [field for field in fields if field != "id"]
+
+    def get_columns(self, fields):
+        """
+        Return the columns to load for ``fields``: a deduplicated response
+        is only found through its digest, so that is loaded as well.
+        """
+        if "response" in fields and "response_digest" not in fields:
+            return fields + ["response_digest"]
+        return fields
+
+    def get_queryset(self, options):
+        queryset = ApiRequestLog.objects.all()
+        since = self.parse(options["since"])
+        until = self.parse(options["until"])
+        if since is not None:
+            queryset = queryset.filter(requested_at__gte=since)
+        if until is not None:
+            queryset = queryset.filter(requested_at__lt=until)
+        if options["view"]:
+            queryset = queryset.filter(view__in=options["view"])
+        if options["method"]:
+            queryset = queryset.filter(method__in=[m.upper() for m in options["method"]])
+        status = options["status"]
+        if status:
+            try:
+                queryset = queryset.filter(**status_lookups(status))
+            except ValueError as error:
+                raise CommandError(error)
+        return queryset
+
+    def parse(self, value):
+        if value is None:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise CommandError("Invalid datetime: {}".format(value))
+        return make_aware(parsed) if is_naive(parsed) else parsed
+
+    def split(self, first, last, workers):
+        if first is None:
+            return [(0, 0)]
+        step = max((last - first + 1) // max(workers, 1), 1)
+        ranges = []
+        start = first - 1
+        while start < last and len(ranges) < workers:
+            end = last if len(ranges) == workers - 1 else min(start + step, last)
+            ranges.append((start, end))
+            start = end
+        return ranges
+
+    def prepare(self, output, export_format, ranges, resume):
+        """Return one part path per range, checking for a previous export."""
+        if export_format == "parquet":
+            if os.path.exists(output) and os.listdir(output) and not resume:
+                raise CommandError("{} is not empty, pass --resume.".format(output))
+            os.makedirs(output, exist_ok=True)
+            # Parts only name the checkpoints, chunks get files of their own.
+            return [
+                os.path.join(output, "range-{}".format(index))
+                for index in range(len(ranges))
+            ]
+        if len(ranges) == 1:
+            parts = [output]
+        else:
+            parts = ["{}.part{}".format(output, index) for index in range(len(ranges))]
+        checkpoints = [part + CHECKPOINT_SUFFIX for part in parts]
+        started = any(os.path.exists(path) for path in checkpoints)
+        if not resume and (os.path.exists(output) or started):
+            raise CommandError("{} already exists, pass --resume.".format(output))
+        if resume and os.path.exists(output) and not started:
+            # A finished export leaves no checkpoints behind.
+            raise CommandError("{} is already complete.".format(output))
+        return parts
+
+    def export_in_thread(self, job):
+        try:
+            return self.export_range(*job, with_header=False)
+        finally:
+            connections.close_all()
+
+    def export_range(
+        self, queryset, fields, export_format, path, start, end, state, chunk_size,
+        with_header,
+    ):
+        checkpoint_path = path + CHECKPOINT_SUFFIX
+        state = dict(state, start=start, end=end)
+        checkpoint = self.read_checkpoint(checkpoint_path, state)
+        last_pk = checkpoint.get("last_pk", start)
+        count = checkpoint.get("rows", 0)
+        part = PART_CLASSES[export_format](path, fields)
+        part.open(checkpoint.get("offset", 0), with_header)
+        try:
+            while last_pk < end:
+                # Keyset pagination: every chunk is one indexed range scan,
+                # and last_pk is all that is needed to pick up again.
+                rows = list(
+                    queryset.filter(pk__gt=last_pk, pk__lte=end)
+                    .order_by("pk")
+                    .values_list(*self.get_columns(fields))[:chunk_size]
+                )
+                if not rows:
+                    break
+                rows = self.decode(rows, fields)
+                offset = part.write(rows)
+                last_pk = rows[-1][0]
+                count += len(rows)
+                self.write_checkpoint(
+                    checkpoint_path,
+                    dict(state, last_pk=last_pk, offset=offset, rows=count),
+                )
+        finally:
+            part.close()
+        return count
+
+    def decode(self, rows, fields):
+        """
+        Decompress text columns and inline deduplicated response bodies of
+        rows loaded with ``get_columns(fields)``, returning ``fields`` only.
+        """
+        columns = self.get_columns(fields)
+        text_indexes = [index for index, field in enumerate(fields) if field in TEXT_FIELDS]
+        bodies = {}
+        if "response" in fields:
+            digest_index = columns.index("response_digest")
+            digests = {row[digest_index] for row in rows if row[digest_index]}
+            if digests:
+                bodies = dict(
+                    ResponseBlob.objects.filter(digest__in=digests).values_list(
+                        "digest", "body"
+                    )
+                )
+        decoded = []
+        for row in rows:
+            row = list(row)
+            for index in text_indexes:
+                row[index] = decompress_text(row[index])
+            if bodies and row[digest_index] in bodies:
+                row[fields.index("response")] = decompress_text(bodies[row[digest_index]])
+            decoded.append(row[: len(fields)])
+        return decoded
+
+    def read_ranges(self, output, export_format):
+        """Return the id ranges of an interrupted export, if there is one."""
+        if export_format == "parquet":
+            paths = [os.path.join(output, "range-0")]
+        else:
+            paths = [output, "{}.part0".format(output)]
+        for path in paths:
+            try:
+                with open(path + CHECKPOINT_SUFFIX) as fp:
+                    return [tuple(bounds) for bounds in json.load(fp)["ranges"]]
+            except FileNotFoundError:
+                pass
+            except (KeyError, TypeError, ValueError):
+                raise CommandError(
+                    "{} belongs to a different export, remove it to start over.".format(
+                        path + CHECKPOINT_SUFFIX
+                    )
+                )
+        return None
+
+    def read_checkpoint(self, path, state):
+        try:
+            with open(path) as fp:
+                checkpoint = json.load(fp)
+        except FileNotFoundError:
+            return {}
+        if any(checkpoint.get(key) != value for key, value in state.items()):
+            raise CommandError(
+                "{} belongs to a different export, remove it to start over.".format(path)
+            )
+        return checkpoint
+
+    def write_checkpoint(self, path, checkpoint):
+        with open(path + ".tmp", "w") as fp:
+            json.dump(checkpoint, fp)
+        os.replace(path + ".tmp", path)
+
+    def finish(self, output, export_format, fields, parts):
+        if export_format == "parquet":
+            for part in parts:
+                self.remove(part + CHECKPOINT_SUFFIX)
+            return
+        if len(parts) == 1:
+            self.remove(output + CHECKPOINT_SUFFIX)
+            return
+        with open(output + ".tmp", "w", encoding="utf-8", newline="") as merged:
+            merged.write(PART_CLASSES[export_format](output, fields).header())
+            for part in parts:
+                with open(part, encoding="utf-8", newline="") as fp:
+                    shutil.copyfileobj(fp, merged)
+        os.replace(output + ".tmp", output)
+        for part in parts:
+            self.remove(part)
+            self.remove(part + CHECKPOINT_SUFFIX)
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
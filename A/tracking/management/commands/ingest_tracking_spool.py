@@ -0,0 +1,88 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router, transaction
+
+from tracking.app_settings import app_settings
+from tracking.backends import DatabaseBackend
+from tracking.models import SpoolCursor
+from tracking.spool import deserialize_log, list_segments, read_frames
+
+
+class Command(BaseCommand):
+    help = "Load spooled API request logs into ApiRequestLog in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--directory", default=None)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--follow",
+            action="store_true",
+            help="Keep tailing the spool directory instead of exiting.",
+        )
+        parser.add_argument("--interval", type=float, default=1.0)
+        parser.add_argument(
+            "--delete-ingested",
+            action="store_true",
+            help="Remove segments that are fully ingested and no longer written to.",
+        )
+        parser.add_argument(
+            "--idle-seconds",
+            type=float,
+            default=300,
+            help="A segment untouched for this long is considered closed.",
+        )
+
+    def handle(self, *args, **options):
+        directory = options["directory"] or app_settings.SPOOL_DIR
+        if not directory:
+            raise CommandError("Set DRF_TRACKING_SPOOL_DIR or pass --directory.")
+        while True:
+            total = self.ingest(directory, options)
+            if total:
+                self.stdout.write("Ingested {} log(s).".format(total))
+            if not options["follow"]:
+                break
+            time.sleep(options["interval"])
+
+    def ingest(self, directory, options):
+        total = 0
+        for name in list_segments(directory):
+            path = os.path.join(directory, name)
+            cursor, _ = SpoolCursor.objects.get_or_create(segment=name)
+            with open(path, "rb") as fp:
+                while True:
+                    count, advanced = self.ingest_batch(
+                        fp, cursor, options["batch_size"]
+                    )
+                    total += count
+                    if not advanced:
+                        break
+            if options["delete_ingested"] and self.is_retired(path, cursor, options):
+                os.remove(path)
+                cursor.delete()
+        return total
+
+    def ingest_batch(self, fp, cursor, batch_size):
+        logs = []
+        offset = cursor.offset
+        for record, offset in read_frames(fp, cursor.offset, limit=batch_size):
+            logs.append(deserialize_log(record))
+        if offset == cursor.offset:
+            return 0, False
+        # The cursor moves in the same transaction as the insert, so a crash
+        # at any point never loads a record twice.
+        with transaction.atomic(using=router.db_for_write(SpoolCursor)):
+            DatabaseBackend().write_many(logs)
+            cursor.offset = offset
+            cursor.save(update_fields=["offset", "updated_at"])
+        return len(logs), True
+
+    def is_retired(self, path, cursor, options):
+        stat = os.stat(path)
+        if cursor.offset < stat.st_size:
+            return False
+        rotated = stat.st_size >= app_settings.SPOOL_SEGMENT_SIZE
+        idle = time.time() - stat.st_mtime >= options["idle_seconds"]
+        return rotated or idle
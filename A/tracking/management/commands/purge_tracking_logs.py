@@ -0,0 +1,92 @@
+import datetime
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import now
+
+from tracking.app_settings import app_settings
+from tracking.dedup import release_blobs
+from tracking.models import ApiRequestLog
+from tracking.partitions import drop_partitions
+from tracking.search import get_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete API request logs older than the retention period in small "
+        "batches, and drop partitions that lie entirely before it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=float,
+            default=None,
+            help="Retention period, defaults to DRF_TRACKING_RETENTION_DAYS.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.1,
+            help="Seconds to pause between batches.",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        if days is None:
+            days = app_settings.RETENTION_DAYS
+        if days is None:
+            raise CommandError("Set DRF_TRACKING_RETENTION_DAYS or pass --days.")
+        cutoff = now() - datetime.timedelta(days=days)
+        expired = ApiRequestLog.objects.filter(requested_at__lt=cutoff)
+        if options["dry_run"]:
+            self.stdout.write("{} log(s) would be deleted.".format(expired.count()))
+            partitions = drop_partitions(cutoff, dry_run=True)
+            if partitions:
+                self.stdout.write(
+                    "Partition(s) {} would be dropped.".format(", ".join(partitions))
+                )
+            return
+        # A partition only goes once all of it has expired, so retention is
+        # as coarse as DRF_TRACKING_PARTITION.
+        partitions = drop_partitions(cutoff)
+        if partitions:
+            self.stdout.write("Dropped partition(s) {}.".format(", ".join(partitions)))
+        deleted = self.purge(expired, options["batch_size"], options["sleep"])
+        self.stdout.write("Deleted {} log(s) older than {}.".format(deleted, cutoff))
+
+    def purge(self, expired, batch_size, pause):
+        deleted = 0
+        while True:
+            # Walk the requested_at index and delete by primary key so every
+            # batch is its own short transaction.
+            pks = list(
+                expired.order_by("requested_at").values_list("pk", flat=True)[
+                    :batch_size
+                ]
+            )
+            if not pks:
+                return deleted
+            deleted += self.delete_batch(pks)
+            if len(pks) < batch_size:
+                return deleted
+            time.sleep(pause)
+
+    def delete_batch(self, pks):
+        batch = ApiRequestLog.objects.filter(pk__in=pks)
+        with transaction.atomic(using=batch.db):
+            references = Counter(
+                batch.exclude(response_digest=None).values_list(
+                    "response_digest", flat=True
+                )
+            )
+            count, _ = batch.delete()
+            if references:
+                release_blobs(references)
+            if app_settings.SEARCH_INDEX:
+                get_search_index(batch.db).remove(pks)
+        return count
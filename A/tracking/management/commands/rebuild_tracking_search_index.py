@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router, transaction
+
+from tracking.fields import decompress_text
+from tracking.models import ApiRequestLog, ResponseBlob
+from tracking.partitions import check_unpartitioned
+from tracking.search import SEARCH_FIELDS, document, get_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Index existing API request logs for full-text search in batches, then "
+        "drop entries of logs that are gone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--sleep", type=float, default=0.0)
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Empty the index first instead of updating it in place.",
+        )
+
+    def handle(self, *args, **options):
+        check_unpartitioned("rebuild_tracking_search_index", CommandError)
+        using = router.db_for_write(ApiRequestLog)
+        index = get_search_index(using)
+        if options["clear"]:
+            index.clear()
+        batch_size = options["batch_size"]
+        last_pk = 0
+        indexed = 0
+        while True:
+            # values_list returns the stored text, decompress_text restores it
+            rows = list(
+                ApiRequestLog.objects.using(using)
+                .filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", "response_digest", *SEARCH_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+            with transaction.atomic(using=using):
+                index.add(self.documents(rows, using))
+            last_pk = rows[-1][0]
+            indexed += len(rows)
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+        pruned = index.prune()
+        self.stdout.write(
+            "Indexed {} log(s), removed {} stale entries.".format(indexed, pruned)
+        )
+
+    def documents(self, rows, using):
+        digests = {digest for _, digest, *_ in rows if digest}
+        bodies = {}
+        if digests:
+            bodies = dict(
+                ResponseBlob.objects.using(using)
+                .filter(digest__in=digests)
+                .values_list("digest", "body")
+            )
+        documents = []
+        for pk, digest, *values in rows:
+            log = {
+                field: decompress_text(value)
+                for field, value in zip(SEARCH_FIELDS, values)
+            }
+            if digest in bodies:
+                log["response"] = decompress_text(bodies[digest])
+            documents.append(document(pk, log))
+        return documents
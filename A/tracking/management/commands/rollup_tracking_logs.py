@@ -0,0 +1,83 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router, transaction
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware, now
+
+from tracking.models import ApiRequestLog, ApiRequestRollup
+from tracking.partitions import check_unpartitioned
+from tracking.rollups import GRANULARITIES, aggregate_logs, apply_increments, bucket_start
+
+LOG_FIELDS = (
+    "requested_at",
+    "response_ms",
+    "view",
+    "method",
+    "status_code",
+    "sample_weight",
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuild API request rollups from ApiRequestLog for a time range."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            default=None,
+            help="ISO datetime, defaults to 24 hours ago.",
+        )
+        parser.add_argument("--until", default=None, help="ISO datetime, defaults to now.")
+        parser.add_argument(
+            "--granularity",
+            choices=sorted(GRANULARITIES),
+            action="append",
+            help="Granularity to rebuild, may be repeated. Defaults to all.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        check_unpartitioned("rollup_tracking_logs", CommandError)
+        until = self.parse(options["until"]) or now()
+        since = self.parse(options["since"]) or until - datetime.timedelta(days=1)
+        granularities = options["granularity"] or list(GRANULARITIES)
+        for granularity in granularities:
+            # Only whole buckets are rebuilt, otherwise the edges would lose
+            # the rows outside the requested range.
+            start = bucket_start(since, granularity)
+            end = bucket_start(until, granularity) + datetime.timedelta(
+                seconds=GRANULARITIES[granularity]
+            )
+            count = self.rebuild(granularity, start, end, options["chunk_size"])
+            self.stdout.write(
+                "Rolled up {} log(s) into {} buckets.".format(count, granularity)
+            )
+
+    def parse(self, value):
+        if value is None:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise CommandError("Invalid datetime: {}".format(value))
+        return make_aware(parsed) if is_naive(parsed) else parsed
+
+    def rebuild(self, granularity, start, end, chunk_size):
+        logs = ApiRequestLog.objects.filter(
+            requested_at__gte=start, requested_at__lt=end
+        ).values(*LOG_FIELDS)
+        count = 0
+        with transaction.atomic(using=router.db_for_write(ApiRequestRollup)):
+            ApiRequestRollup.objects.filter(
+                granularity=granularity, bucket_start__gte=start, bucket_start__lt=end
+            ).delete()
+            chunk = []
+            for log in logs.iterator(chunk_size=chunk_size):
+                chunk.append(log)
+                if len(chunk) >= chunk_size:
+                    apply_increments(aggregate_logs(chunk, [granularity]))
+                    count += len(chunk)
+                    chunk = []
+            apply_increments(aggregate_logs(chunk, [granularity]))
+            count += len(chunk)
+        return count
@@ -0,0 +1,292 @@
+import atexit
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from .app_settings import app_settings
+from .rollups import LATENCY_BUCKETS_MS, status_class
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Upper bounds of the histogram for time spent in the logging pipeline.
+PIPELINE_BUCKETS_S = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25
+)
+
+METRICS = {
+    "drf_tracking_requests_total": (
+        "counter",
+        "Requests seen by the tracking mixins, before sampling.",
+    ),
+    "drf_tracking_response_ms": (
+        "histogram",
+        "Response time of tracked requests in milliseconds.",
+    ),
+    "drf_tracking_pipeline_seconds": (
+        "histogram",
+        "Time spent inside the logging pipeline per request.",
+    ),
+    "drf_tracking_handle_log_failures_total": (
+        "counter",
+        "handle_log calls that raised.",
+    ),
+    "drf_tracking_dropped_logs_total": (
+        "counter",
+        "Log entries dropped because the write buffer was full.",
+    ),
+}
+BUCKETS = {
+    "drf_tracking_response_ms": LATENCY_BUCKETS_MS,
+    "drf_tracking_pipeline_seconds": PIPELINE_BUCKETS_S,
+}
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms, keyed by ``(name, labels)`` where
+    labels is a tuple of ``(label, value)`` pairs. A histogram value is
+    ``[per-bucket counts..., +Inf count, sum]``; buckets are not cumulative
+    until they are rendered.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+
+    def inc(self, name, labels=(), value=1.0):
+        with self._lock:
+            self._check_fork()
+            self.counters[(name, labels)] += value
+
+    def observe(self, name, value, labels=()):
+        buckets = BUCKETS[name]
+        with self._lock:
+            self._check_fork()
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[(name, labels)] = [0] * (len(buckets) + 2)
+            histogram[bisect.bisect_left(buckets, value)] += 1
+            histogram[-1] += value
+
+    def snapshot(self):
+        with self._lock:
+            self._check_fork()
+            return {
+                "counters": [
+                    [name, labels, value] for (name, labels), value in self.counters.items()
+                ],
+                "histograms": [
+                    [name, labels, list(values)]
+                    for (name, labels), values in self.histograms.items()
+                ],
+            }
+
+    def clear(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def _check_fork(self):
+        # A forked worker starts with a copy of the parent's values, which
+        # the parent already reports.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self.counters.clear()
+            self.histograms.clear()
+
+
+class MetricsDirectory:
+    """
+    Shares metrics between worker processes through one JSON file per
+    process in ``path``. Files of exited processes are kept, so counters
+    never go backwards; clear the directory when the service restarts.
+    """
+
+    def __init__(self, path, interval):
+        self.path = str(path)
+        self.interval = interval
+        self._last_dump = 0.0
+        self._lock = threading.Lock()
+
+    def filename(self, pid=None):
+        return os.path.join(self.path, "{}.json".format(pid or os.getpid()))
+
+    def maybe_dump(self, registry):
+        current = time.monotonic()
+        if current - self._last_dump < self.interval or not self._lock.acquire(False):
+            return
+        try:
+            self._last_dump = current
+            self.dump(registry)
+        finally:
+            self._lock.release()
+
+    def dump(self, registry):
+        os.makedirs(self.path, exist_ok=True)
+        filename = self.filename()
+        temporary = "{}.{}.tmp".format(filename, threading.get_ident())
+        with open(temporary, "w") as fp:
+            json.dump(registry.snapshot(), fp, separators=(",", ":"))
+        os.replace(temporary, filename)
+
+    def load(self, exclude_pid=None):
+        snapshots = []
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return snapshots
+        for name in sorted(names):
+            if not name.endswith(".json") or name == "{}.json".format(exclude_pid):
+                continue
+            try:
+                with open(os.path.join(self.path, name)) as fp:
+                    snapshots.append(json.load(fp))
+            except (OSError, ValueError):
+                logger.warning("Skipping unreadable metrics file %s", name)
+        return snapshots
+
+
+registry = MetricsRegistry()
+_directory = None
+
+
+def get_directory():
+    global _directory
+    path = app_settings.METRICS_DIR
+    if path is None:
+        return None
+    if _directory is None or _directory.path != str(path):
+        _directory = MetricsDirectory(path, app_settings.METRICS_FLUSH_INTERVAL)
+    return _directory
+
+
+def _publish():
+    directory = get_directory()
+    if directory is not None:
+        directory.maybe_dump(registry)
+
+
+@atexit.register
+def _dump_at_exit():
+    try:
+        if app_settings.METRICS and app_settings.METRICS_DIR is not None:
+            get_directory().dump(registry)
+    except Exception:
+        logger.exception("Could not write tracking metrics on exit.")
+
+
+def record_request(view, method, status_code, response_ms):
+    if not app_settings.METRICS:
+        return
+    labels = (("view", view or ""), ("method", method))
+    registry.inc(
+        "drf_tracking_requests_total",
+        labels + (("status_class", "{}xx".format(status_class(status_code))),),
+    )
+    registry.observe("drf_tracking_response_ms", response_ms, labels)
+
+
+def record_pipeline(seconds):
+    if not app_settings.METRICS:
+        return
+    registry.observe("drf_tracking_pipeline_seconds", seconds)
+    # The pipeline is timed last for every request, so this is the point
+    # where the process's file in DRF_TRACKING_METRICS_DIR gets refreshed.
+    _publish()
+
+
+def record_failure():
+    if app_settings.METRICS:
+        registry.inc("drf_tracking_handle_log_failures_total")
+
+
+def record_dropped():
+    if app_settings.METRICS:
+        registry.inc("drf_tracking_dropped_logs_total")
+
+
+def merge_snapshots(snapshots):
+    counters = defaultdict(float)
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            counters[(name, _labels(labels))] += value
+        for name, labels, values in snapshot["histograms"]:
+            key = (name, _labels(labels))
+            if key not in histograms:
+                histograms[key] = list(values)
+            else:
+                histograms[key] = [a + b for a, b in zip(histograms[key], values)]
+    return counters, histograms
+
+
+def _labels(labels):
+    return tuple(tuple(pair) for pair in labels)
+
+
+def collect():
+    """Merge this process's metrics with those published by other workers."""
+    snapshots = [registry.snapshot()]
+    directory = get_directory()
+    if directory is not None:
+        snapshots.extend(directory.load(exclude_pid=os.getpid()))
+    return merge_snapshots(snapshots)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        '{}="{}"'.format(
+            name, str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+        )
+        for name, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value):
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def render(counters=None, histograms=None):
+    """Render metrics in the Prometheus text exposition format."""
+    if counters is None:
+        counters, histograms = collect()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append("# HELP {} {}".format(name, help_text))
+        lines.append("# TYPE {} {}".format(name, kind))
+        if kind == "counter":
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(
+                        "{}{} {}".format(name, _format_labels(labels), _format_value(value))
+                    )
+            continue
+        bounds = [str(bound) for bound in BUCKETS[name]] + ["+Inf"]
+        for (metric, labels), values in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                lines.append(
+                    "{}_bucket{} {}".format(
+                        name, _format_labels(labels + (("le", bound),)), cumulative
+                    )
+                )
+            lines.append(
+                "{}_sum{} {}".format(name, _format_labels(labels), _format_value(values[-1]))
+            )
+            lines.append("{}_count{} {}".format(name, _format_labels(labels), cumulative))
+    return "\n".join(lines) + "\n"
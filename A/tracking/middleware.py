@@ -0,0 +1,92 @@
+import re
+import time
+import traceback
+
+from django.utils.timezone import now
+
+from .app_settings import app_settings
+from .base_mixins import MULTIPART_CONTENT_TYPE, BaseLoggingMixin
+from .mixins import LoggingMixin
+
+
+class RequestLogger(LoggingMixin):
+    """
+    Builds an ApiRequestLog entry from a plain HttpRequest/HttpResponse,
+    reusing the mixin's IP, path, timing, capture and sanitizing logic.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._started_ns = time.perf_counter_ns()
+        self.log = {"requested_at": now()}
+
+    def _get_request_data(self, request):
+        if not self._get_policy().decode_request_body:
+            return ""
+        if hasattr(request, "_post"):
+            data = request.POST.dict()
+            data.update(request.FILES.dict())
+            return data
+        if request.content_type == MULTIPART_CONTENT_TYPE:
+            # Never parse an upload the view did not look at.
+            return ""
+        return self._get_body_snapshot(request)
+
+    def _get_user(self, request):
+        user = getattr(request, "user", None)
+        if user is None or user.is_anonymous:
+            return None
+        return user
+
+    def _get_view_name(self, request):
+        resolver_match = request.resolver_match
+        return resolver_match._func_path if resolver_match else None
+
+
+class RequestTrackingMiddleware:
+    """
+    Logs requests to non-DRF views. Paths are matched against the
+    DRF_TRACKING_MIDDLEWARE_INCLUDE / _EXCLUDE regexes, compiled once at
+    startup, so excluded routes skip all logging work. Views that already
+    use a logging mixin are left to the mixin.
+    """
+
+    logger_class = RequestLogger
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.include = self._compile(app_settings.MIDDLEWARE_INCLUDE)
+        self.exclude = self._compile(app_settings.MIDDLEWARE_EXCLUDE)
+
+    @staticmethod
+    def _compile(patterns):
+        if not patterns:
+            return None
+        return re.compile("|".join("(?:{})".format(pattern) for pattern in patterns))
+
+    def is_tracked(self, path):
+        if self.exclude is not None and self.exclude.match(path):
+            return False
+        return self.include is None or self.include.match(path) is not None
+
+    def __call__(self, request):
+        if not self.is_tracked(request.path_info):
+            return self.get_response(request)
+        request_logger = request._tracking_logger = self.logger_class()
+        response = self.get_response(request)
+        if getattr(request, "_tracking_logger", None) is request_logger:
+            if request_logger.should_log(request, response):
+                request_logger._log_response(request, response)
+            if request_logger._get_policy().server_timing:
+                request_logger._add_server_timing(response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "cls", None)
+        if isinstance(view_class, type) and issubclass(view_class, BaseLoggingMixin):
+            request._tracking_logger = None
+
+    def process_exception(self, request, exception):
+        request_logger = getattr(request, "_tracking_logger", None)
+        if request_logger is not None:
+            request_logger.log["errors"] = traceback.format_exc()
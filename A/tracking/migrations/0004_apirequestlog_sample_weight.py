@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0003_spoolcursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='sample_weight',
+            field=models.FloatField(default=1.0, help_text='number of requests this sampled row represents'),
+        ),
+    ]
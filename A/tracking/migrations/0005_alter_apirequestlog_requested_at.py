@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+def date_to_datetime(apps, schema_editor):
+    # SQLite keeps the old 'YYYY-MM-DD' text when the column is rebuilt, which
+    # the datetime converter cannot read back. Other backends cast in ALTER.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    ApiRequestLog = apps.get_model("tracking", "ApiRequestLog")
+    schema_editor.execute(
+        "UPDATE {table} SET requested_at = requested_at || ' 00:00:00' "
+        "WHERE length(requested_at) = 10".format(
+            table=schema_editor.quote_name(ApiRequestLog._meta.db_table)
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0004_apirequestlog_sample_weight'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='apirequestlog',
+            name='requested_at',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.RunPython(date_to_datetime, migrations.RunPython.noop),
+    ]
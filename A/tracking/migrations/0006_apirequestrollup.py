@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0005_alter_apirequestlog_requested_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiRequestRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('minute', 'Minute'), ('hour', 'Hour')], max_length=10)),
+                ('bucket_start', models.DateTimeField()),
+                ('view', models.CharField(blank=True, default='', max_length=200)),
+                ('method', models.CharField(max_length=10)),
+                ('status_class', models.PositiveSmallIntegerField(help_text='status code // 100')),
+                ('latency_bin', models.PositiveSmallIntegerField(help_text='index into tracking.rollups.LATENCY_BUCKETS_MS')),
+                ('count', models.FloatField(default=0, help_text='weighted request count')),
+                ('sum_ms', models.FloatField(default=0)),
+            ],
+            options={
+                'verbose_name': 'API Request Rollup',
+                'indexes': [models.Index(fields=['granularity', 'bucket_start', 'view'], name='tracking_ap_granula_6643e5_idx')],
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'bucket_start', 'view', 'method', 'status_class', 'latency_bin'), name='tracking_rollup_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:54
+
+import tracking.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0007_apirequestlog_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='apirequestlog',
+            name='data',
+            field=tracking.fields.CompressedTextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='apirequestlog',
+            name='errors',
+            field=tracking.fields.CompressedTextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='apirequestlog',
+            name='query_params',
+            field=tracking.fields.CompressedTextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='apirequestlog',
+            name='response',
+            field=tracking.fields.CompressedTextField(blank=True, null=True),
+        ),
+    ]
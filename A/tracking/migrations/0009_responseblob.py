@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:55
+
+import tracking.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0008_compressed_text_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResponseBlob',
+            fields=[
+                ('digest', models.CharField(help_text='sha256 of body', max_length=64, primary_key=True, serialize=False)),
+                ('body', tracking.fields.CompressedTextField()),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('ref_count', models.BigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Response Blob',
+            },
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='response_digest',
+            field=models.CharField(blank=True, db_index=True, help_text='digest of a deduplicated response body', max_length=64, null=True),
+        ),
+    ]
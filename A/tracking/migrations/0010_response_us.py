@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0009_responseblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='response_us',
+            field=models.PositiveBigIntegerField(blank=True, help_text='response time in microseconds', null=True),
+        ),
+    ]
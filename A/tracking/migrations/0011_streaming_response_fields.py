@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0010_response_us'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='response_bytes',
+            field=models.PositiveBigIntegerField(blank=True, help_text='size of a streamed response body', null=True),
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='ttfb_us',
+            field=models.PositiveBigIntegerField(blank=True, help_text='time to first streamed byte in microseconds', null=True),
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='ttlb_us',
+            field=models.PositiveBigIntegerField(blank=True, help_text='time to last streamed byte in microseconds', null=True),
+        ),
+    ]
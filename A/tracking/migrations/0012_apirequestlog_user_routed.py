@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:10
+
+import tracking.routers
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0011_streaming_response_fields'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='apirequestlog',
+            name='user',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=tracking.routers.SET_NULL_ROUTED, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
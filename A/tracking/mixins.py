@@ -1,8 +1,48 @@
+import asyncio
+
+from .app_settings import app_settings
+from .backends import get_storage_backend
 from .base_mixins import BaseLoggingMixin
-from .models import ApiRequestLog
+from .writers import get_buffered_writer
 
 
 class LoggingMixin(BaseLoggingMixin):
 
     def handle_log(self):
-        ApiRequestLog(**self.log).save()
+        if app_settings.BUFFERED_WRITER:
+            get_buffered_writer().put(self.log)
+        else:
+            get_storage_backend().write(self.log)
+
+
+class AsyncLoggingMixin(LoggingMixin):
+    """
+    Logging mixin for views with an async dispatch (e.g. adrf's APIView).
+
+    ``finalize_response`` runs on the event loop there, where a blocking
+    storage write is not allowed. Logs are handed to the buffered writer
+    instead, whose thread passes them to the storage backend in batches; a
+    full buffer drops the entry rather than stalling the loop. Requests
+    dispatched synchronously fall back to LoggingMixin.
+    """
+
+    _async_dispatch = False
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Django renders the response, and so logs it, in a worker thread
+        # once the async dispatch has returned.
+        self._async_dispatch = _loop_is_running()
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def handle_log(self):
+        if not (self._async_dispatch or _loop_is_running()):
+            return super().handle_log()
+        get_buffered_writer().put(self.log, block=False)
+
+
+def _loop_is_running():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
@@ -1,8 +1,80 @@
 from django.db import models
 from .base_models import BaseApiRequestLog
+from .fields import CompressedTextField
 
 
 # Create your models here.
 
 class ApiRequestLog(BaseApiRequestLog):
-    pass
+    class Meta(BaseApiRequestLog.Meta):
+        indexes = [
+            models.Index(
+                fields=["status_code", "requested_at"], name="tracking_log_status_idx"
+            ),
+            models.Index(fields=["method", "requested_at"], name="tracking_log_method_idx"),
+            models.Index(fields=["view", "requested_at"], name="tracking_log_view_idx"),
+        ]
+
+
+class SpoolCursor(models.Model):
+    segment = models.CharField(max_length=255, unique=True)
+    offset = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return "{}@{}".format(self.segment, self.offset)
+
+
+ROLLUP_KEY_FIELDS = [
+    "granularity",
+    "bucket_start",
+    "view",
+    "method",
+    "status_class",
+    "latency_bin",
+]
+
+
+class ApiRequestRollup(models.Model):
+    GRANULARITY_CHOICES = (("minute", "Minute"), ("hour", "Hour"))
+    KEY_FIELDS = ROLLUP_KEY_FIELDS
+
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+    view = models.CharField(max_length=200, blank=True, default="")
+    method = models.CharField(max_length=10)
+    status_class = models.PositiveSmallIntegerField(help_text="status code // 100")
+    latency_bin = models.PositiveSmallIntegerField(
+        help_text="index into tracking.rollups.LATENCY_BUCKETS_MS"
+    )
+    count = models.FloatField(default=0, help_text="weighted request count")
+    sum_ms = models.FloatField(default=0)
+
+    class Meta:
+        verbose_name = "API Request Rollup"
+        constraints = [
+            models.UniqueConstraint(
+                fields=ROLLUP_KEY_FIELDS,
+                name="tracking_rollup_key",
+            )
+        ]
+        indexes = [models.Index(fields=["granularity", "bucket_start", "view"])]
+
+    def __str__(self):
+        return "{} {} {} {}xx".format(
+            self.bucket_start, self.view, self.method, self.status_class
+        )
+
+
+class ResponseBlob(models.Model):
+    digest = models.CharField(max_length=64, primary_key=True, help_text="sha256 of body")
+    body = CompressedTextField()
+    size = models.PositiveIntegerField(default=0)
+    ref_count = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Response Blob"
+
+    def __str__(self):
+        return self.digest
@@ -0,0 +1,88 @@
+import base64
+import binascii
+
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Newest-first pages over ``(requested_at, id)``. The cursor is the last
+    row's position, so a page is one range scan on a requested_at index
+    however deep it is, and rows logged while paging never shift it.
+    """
+
+    page_size = 100
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by("-requested_at", "-id")
+        position = self.decode_cursor(request)
+        if position is not None:
+            requested_at, pk = position
+            # The upper bound alone is index friendly; the exclude only
+            # trims rows sharing the cursor's timestamp.
+            queryset = queryset.filter(requested_at__lte=requested_at).exclude(
+                requested_at=requested_at, id__gte=pk
+            )
+        page = list(queryset[: self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        self.page = page[: self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(last.requested_at, last.pk),
+        )
+
+    def encode_cursor(self, requested_at, pk):
+        position = "{}|{}".format(requested_at.isoformat(), pk)
+        return base64.urlsafe_b64encode(position.encode()).decode("ascii")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = base64.urlsafe_b64decode(encoded.encode("ascii")).decode()
+            requested_at, pk = position.split("|")
+            requested_at = parse_datetime(requested_at)
+            pk = int(pk)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if requested_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return requested_at, pk
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
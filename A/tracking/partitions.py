@@ -0,0 +1,270 @@
+import datetime
+import re
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.db import DatabaseError, connections, models, router, transaction
+from django.db.models import Count
+from django.dispatch import receiver
+
+from .app_settings import app_settings
+from .dedup import release_blobs
+
+TABLE_PREFIX = "tracking_apirequestlog_p"
+# Partition keys are the UTC period they hold: YYYYMMDD or YYYYMM.
+PERIODS = {"day": "%Y%m%d", "month": "%Y%m"}
+KEY_RE = re.compile(r"^(\d{8}|\d{6})$")
+
+_models = {}
+_models_lock = threading.Lock()
+# (alias, key) pairs whose table is known to exist.
+_tables = set()
+
+
+@receiver(setting_changed)
+def _clear_tables(**kwargs):
+    setting = kwargs["setting"]
+    if setting.startswith("DRF_TRACKING_") or setting == "DATABASES":
+        _tables.clear()
+
+
+def partition_key(requested_at, period=None):
+    period = period or app_settings.PARTITION
+    try:
+        key_format = PERIODS[period]
+    except KeyError:
+        raise ImproperlyConfigured(
+            "DRF_TRACKING_PARTITION must be one of {}.".format(", ".join(PERIODS))
+        )
+    if requested_at.tzinfo is not None:
+        requested_at = requested_at.astimezone(datetime.timezone.utc)
+    return requested_at.strftime(key_format)
+
+
+def check_unpartitioned(reader, exception=ImproperlyConfigured):
+    """
+    Refuse ``reader``, which only knows the ApiRequestLog table, while logs
+    are written to partitions it would never see.
+    """
+    if app_settings.PARTITION:
+        raise exception(
+            "{} reads the ApiRequestLog table only and cannot be used with "
+            "DRF_TRACKING_PARTITION; query partitions with "
+            "tracking.partitions.PartitionedLogs.".format(reader)
+        )
+
+
+def partition_bounds(key):
+    """Return the ``[start, end)`` datetimes covered by partition ``key``."""
+    year, month = int(key[:4]), int(key[4:6])
+    tzinfo = datetime.timezone.utc if settings.USE_TZ else None
+    if len(key) == 8:
+        start = datetime.datetime(year, month, int(key[6:]), tzinfo=tzinfo)
+        return start, start + datetime.timedelta(days=1)
+    start = datetime.datetime(year, month, 1, tzinfo=tzinfo)
+    if month == 12:
+        return start, start.replace(year=year + 1, month=1)
+    return start, start.replace(month=month + 1)
+
+
+def get_partition_model(key):
+    """
+    Return the model for partition ``key``, a copy of ApiRequestLog stored
+    in its own table. The model is built once per process; its table is
+    created by ``ensure_partition``.
+    """
+    try:
+        return _models[key]
+    except KeyError:
+        pass
+    with _models_lock:
+        if key not in _models:
+            _models[key] = _build_model(key)
+    return _models[key]
+
+
+def _build_model(key):
+    from .base_models import BaseApiRequestLog
+
+    meta = type(
+        "Meta",
+        (),
+        {
+            "app_label": "tracking",
+            "db_table": TABLE_PREFIX + key,
+            # Partitions are created and dropped at run time, not by
+            # migrations.
+            "managed": False,
+            "verbose_name": "API Request Log {}".format(key),
+            "indexes": [
+                models.Index(
+                    fields=[field, "requested_at"], name="p{}_{}_idx".format(key, field)
+                )
+                for field in ("status_code", "method", "view")
+            ],
+        },
+    )
+    return type(
+        "ApiRequestLogP" + key,
+        (BaseApiRequestLog,),
+        {
+            "__module__": __name__,
+            "Meta": meta,
+            # Deleting a user leaves partitions untouched, rows keep the id
+            # and username_persistent.
+            "user": models.ForeignKey(
+                settings.AUTH_USER_MODEL,
+                on_delete=models.DO_NOTHING,
+                blank=True,
+                null=True,
+                db_constraint=False,
+                related_name="+",
+            ),
+        },
+    )
+
+
+def get_alias(using=None):
+    from .models import ApiRequestLog
+
+    return using or router.db_for_write(ApiRequestLog)
+
+
+@contextmanager
+def _schema_editor(alias):
+    """
+    A schema editor usable inside an atomic block. The SQLite one refuses
+    to be entered there because foreign key checks cannot be switched off,
+    which partition tables, having no constraints, do not need.
+    """
+    editor = connections[alias].schema_editor(atomic=False)
+    editor.deferred_sql = []
+    with transaction.atomic(using=alias):
+        yield editor
+        for sql in editor.deferred_sql:
+            editor.execute(sql)
+
+
+def list_partitions(using=None):
+    """Keys of the partition tables in the database, oldest first."""
+    alias = get_alias(using)
+    with connections[alias].cursor() as cursor:
+        tables = connections[alias].introspection.table_names(cursor)
+    keys = [
+        table[len(TABLE_PREFIX):]
+        for table in tables
+        if table.startswith(TABLE_PREFIX) and KEY_RE.match(table[len(TABLE_PREFIX):])
+    ]
+    return sorted(keys, key=partition_bounds)
+
+
+def ensure_partition(key, using=None):
+    alias = get_alias(using)
+    model = get_partition_model(key)
+    if (alias, key) in _tables:
+        return model
+    if key not in list_partitions(alias):
+        try:
+            with _schema_editor(alias) as editor:
+                editor.create_model(model)
+        except DatabaseError:
+            # Another process created it first.
+            if key not in list_partitions(alias):
+                raise
+    # Only a committed table can be trusted to stay; a rolled back
+    # transaction takes the CREATE TABLE with it.
+    transaction.on_commit(lambda: _tables.add((alias, key)), using=alias)
+    return model
+
+
+def write_partitioned(logs, using=None):
+    """Insert ``logs`` into the partitions of their ``requested_at``."""
+    alias = get_alias(using)
+    groups = defaultdict(list)
+    for log in logs:
+        groups[partition_key(log["requested_at"])].append(log)
+    for key, group in groups.items():
+        model = ensure_partition(key, alias)
+        model.objects.using(alias).bulk_create([model(**log) for log in group])
+
+
+def drop_partitions(before, using=None, dry_run=False):
+    """
+    Drop every partition that ends at or before ``before`` and return their
+    keys. Each drop is a DROP TABLE, however many rows the partition holds;
+    only the references to deduplicated bodies are counted first.
+    """
+    alias = get_alias(using)
+    expired = [
+        key for key in list_partitions(alias) if partition_bounds(key)[1] <= before
+    ]
+    if dry_run:
+        return expired
+    for key in expired:
+        model = get_partition_model(key)
+        references = Counter(
+            dict(
+                model.objects.using(alias)
+                .exclude(response_digest=None)
+                .values("response_digest")
+                .annotate(count=Count("pk"))
+                .values_list("response_digest", "count")
+            )
+        )
+        with _schema_editor(alias) as editor:
+            editor.delete_model(model)
+            if references:
+                release_blobs(references, using=alias)
+        _tables.discard((alias, key))
+    return expired
+
+
+class PartitionedLogs:
+    """
+    Lazy query over the partitions overlapping ``[since, until)``. Only
+    those partitions are touched; ``filter`` adds lookups applied to each.
+    """
+
+    def __init__(self, since=None, until=None, using=None, filters=None):
+        self.since = since
+        self.until = until
+        self.using = using
+        self.filters = filters or {}
+
+    def filter(self, **filters):
+        return PartitionedLogs(
+            self.since, self.until, self.using, dict(self.filters, **filters)
+        )
+
+    def partitions(self):
+        keys = []
+        for key in list_partitions(self.using):
+            start, end = partition_bounds(key)
+            if self.since is not None and end <= self.since:
+                continue
+            if self.until is not None and start >= self.until:
+                continue
+            keys.append(key)
+        return keys
+
+    def querysets(self):
+        alias = get_alias(self.using)
+        for key in self.partitions():
+            model = get_partition_model(key)
+            queryset = model.objects.using(alias).filter(**self.filters)
+            if self.since is not None:
+                queryset = queryset.filter(requested_at__gte=self.since)
+            if self.until is not None:
+                queryset = queryset.filter(requested_at__lt=self.until)
+            yield queryset
+
+    def count(self):
+        return sum(queryset.count() for queryset in self.querysets())
+
+    def __iter__(self):
+        for queryset in self.querysets():
+            yield from queryset.order_by("requested_at", "pk").iterator()
@@ -0,0 +1,110 @@
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .app_settings import app_settings
+from .sampling import build_sampler
+from .sanitizers import Sanitizer
+
+# View attributes that feed the policy. A view instance overriding one of
+# them (e.g. through ``as_view(**initkwargs)``) gets an uncached policy.
+POLICY_ATTRIBUTES = frozenset(
+    (
+        "logging_methods",
+        "sensitive_fields",
+        "sensitive_patterns",
+        "sampler",
+        "CLEAN_SUBSTITUTE",
+        "decode_request_body",
+        "capture_mode",
+        "max_body_bytes",
+        "full_capture_status",
+        "full_capture_ms",
+        "server_timing",
+        "stream_capture_bytes",
+        "body_snapshot_bytes",
+    )
+)
+
+_policies = {}
+
+
+@receiver(setting_changed)
+def _clear_policies(**kwargs):
+    if kwargs["setting"].startswith("DRF_TRACKING_"):
+        _policies.clear()
+
+
+class LoggingPolicy:
+    """
+    Everything the logging mixin needs to know about a view class, resolved
+    once from its attributes and the DRF_TRACKING_* settings.
+    """
+
+    __slots__ = (
+        "methods",
+        "handlers",
+        "view_name",
+        "sampler",
+        "sanitizer",
+        "decode_request_body",
+        "capture_mode",
+        "max_body_bytes",
+        "full_capture_status",
+        "full_capture_ms",
+        "server_timing",
+        "stream_capture_bytes",
+        "body_snapshot_bytes",
+        "path_length",
+        "always_log_errors",
+        "always_log_slow_ms",
+    )
+
+    def __init__(self, view):
+        cls = view if isinstance(view, type) else type(view)
+
+        def setting(name):
+            return getattr(view, name.lower(), getattr(app_settings, name))
+
+        methods = view.logging_methods
+        self.methods = None if methods == "__all__" else frozenset(methods)
+        self.handlers = frozenset(
+            name
+            for name in getattr(cls, "http_method_names", ())
+            if callable(getattr(cls, name, None))
+        )
+        self.view_name = cls.__module__ + "." + cls.__name__
+        self.sampler = build_sampler(view.sampler)
+        self.sanitizer = Sanitizer(
+            sensitive_fields=view.sensitive_fields,
+            patterns=tuple(view.sensitive_patterns)
+            + tuple(app_settings.SENSITIVE_PATTERNS),
+            substitute=view.CLEAN_SUBSTITUTE,
+        )
+        self.decode_request_body = setting("DECODE_REQUEST_BODY")
+        self.capture_mode = setting("CAPTURE_MODE")
+        self.max_body_bytes = setting("MAX_BODY_BYTES")
+        self.full_capture_status = setting("FULL_CAPTURE_STATUS")
+        self.full_capture_ms = setting("FULL_CAPTURE_MS")
+        self.server_timing = setting("SERVER_TIMING")
+        self.stream_capture_bytes = setting("STREAM_CAPTURE_BYTES")
+        if self.max_body_bytes is not None:
+            self.stream_capture_bytes = min(
+                self.stream_capture_bytes, self.max_body_bytes
+            )
+        self.body_snapshot_bytes = setting("BODY_SNAPSHOT_BYTES")
+        self.path_length = app_settings.PATH_LENGTH
+        self.always_log_errors = app_settings.ALWAYS_LOG_ERRORS
+        self.always_log_slow_ms = app_settings.ALWAYS_LOG_SLOW_MS
+
+
+def get_policy(view):
+    """Return the cached policy for ``view``'s class."""
+    if POLICY_ATTRIBUTES.intersection(vars(view)):
+        return LoggingPolicy(view)
+    cls = type(view)
+    try:
+        return _policies[cls]
+    except KeyError:
+        pass
+    policy = _policies[cls] = LoggingPolicy(cls)
+    return policy
@@ -0,0 +1,161 @@
+import bisect
+import datetime
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+# Upper bounds (inclusive) of the response_ms histogram; the last bin
+# collects everything slower than the final bound.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+GRANULARITIES = {"minute": 60, "hour": 3600}
+
+
+def latency_bin(response_ms):
+    return bisect.bisect_left(LATENCY_BUCKETS_MS, response_ms)
+
+
+def bucket_start(requested_at, granularity):
+    if granularity == "minute":
+        return requested_at.replace(second=0, microsecond=0)
+    return requested_at.replace(minute=0, second=0, microsecond=0)
+
+
+def status_class(status_code):
+    return (status_code or 0) // 100
+
+
+def status_lookups(value):
+    """
+    Queryset lookups for a status code such as "404" or a class such as
+    "5xx". Raises ValueError for anything else.
+    """
+    if value.lower().endswith("xx") and value[:-2].isdigit():
+        low = int(value[:-2]) * 100
+        return {"status_code__gte": low, "status_code__lt": low + 100}
+    if value.isdigit():
+        return {"status_code": int(value)}
+    raise ValueError("Invalid status: {}".format(value))
+
+
+def aggregate_logs(logs, granularities=None):
+    """
+    Fold log dicts into ``{rollup key: [count, sum_ms]}`` increments.
+    Counts are weighted by ``sample_weight`` so sampled traffic adds up.
+    """
+    increments = defaultdict(lambda: [0.0, 0.0])
+    for log in logs:
+        requested_at = log["requested_at"]
+        if not isinstance(requested_at, datetime.datetime):
+            continue
+        response_ms = log.get("response_ms") or 0
+        weight = log.get("sample_weight") or 1.0
+        for granularity in granularities or GRANULARITIES:
+            key = (
+                granularity,
+                bucket_start(requested_at, granularity),
+                log.get("view") or "",
+                log.get("method") or "",
+                status_class(log.get("status_code")),
+                latency_bin(response_ms),
+            )
+            totals = increments[key]
+            totals[0] += weight
+            totals[1] += response_ms * weight
+    return increments
+
+
+def apply_increments(increments, using=None):
+    from .models import ApiRequestRollup
+
+    manager = ApiRequestRollup.objects.db_manager(using)
+    for key, (count, sum_ms) in increments.items():
+        lookup = dict(zip(ApiRequestRollup.KEY_FIELDS, key))
+        rows = manager.filter(**lookup)
+        if rows.update(count=F("count") + count, sum_ms=F("sum_ms") + sum_ms):
+            continue
+        try:
+            with transaction.atomic(using=manager.db):
+                manager.create(count=count, sum_ms=sum_ms, **lookup)
+        except IntegrityError:
+            # Another writer created the row first.
+            rows.update(count=F("count") + count, sum_ms=F("sum_ms") + sum_ms)
+
+
+def record_logs(logs, using=None):
+    apply_increments(aggregate_logs(logs), using=using)
+
+
+def _percentile(histogram, total, percentile):
+    target = total * percentile / 100
+    seen = 0.0
+    for index, count in enumerate(histogram):
+        if not count:
+            continue
+        if seen + count >= target:
+            lower = LATENCY_BUCKETS_MS[index - 1] if index else 0
+            if index == len(LATENCY_BUCKETS_MS):
+                return float(lower)
+            upper = LATENCY_BUCKETS_MS[index]
+            return lower + (upper - lower) * (target - seen) / count
+        seen += count
+    return float(LATENCY_BUCKETS_MS[-1])
+
+
+def latency_summary(
+    since,
+    until=None,
+    granularity="minute",
+    group_by=None,
+    percentiles=(50, 95, 99),
+    **filters,
+):
+    """
+    Summarize traffic between ``since`` and ``until`` from the rollup table.
+
+    ``filters`` narrow the rollup rows (``view``, ``method``,
+    ``status_class``) and ``group_by`` is one of those fields. Returns
+    ``{group: {"count", "mean_ms", "status_classes", "p50", ...}}`` with a
+    single ``None`` group when ungrouped. Percentiles are interpolated from
+    the fixed histogram bins.
+    """
+    from .models import ApiRequestRollup
+
+    rows = ApiRequestRollup.objects.filter(
+        granularity=granularity, bucket_start__gte=since, **filters
+    )
+    if until is not None:
+        rows = rows.filter(bucket_start__lt=until)
+    fields = ["latency_bin", "status_class"] + ([group_by] if group_by else [])
+    rows = rows.values(*fields).annotate(total=Sum("count"), total_ms=Sum("sum_ms"))
+
+    groups = {}
+    for row in rows:
+        group = groups.setdefault(
+            row[group_by] if group_by else None,
+            {
+                "histogram": [0.0] * (len(LATENCY_BUCKETS_MS) + 1),
+                "status_classes": defaultdict(float),
+                "count": 0.0,
+                "sum_ms": 0.0,
+            },
+        )
+        group["histogram"][row["latency_bin"]] += row["total"]
+        group["status_classes"][row["status_class"]] += row["total"]
+        group["count"] += row["total"]
+        group["sum_ms"] += row["total_ms"]
+
+    summary = {}
+    for key, group in groups.items():
+        total = group["count"]
+        result = {
+            "count": total,
+            "mean_ms": group["sum_ms"] / total if total else 0.0,
+            "status_classes": dict(group["status_classes"]),
+        }
+        for percentile in percentiles:
+            result["p{}".format(percentile)] = _percentile(
+                group["histogram"], total, percentile
+            )
+        summary[key] = result
+    return summary
@@ -0,0 +1,62 @@
+from django.db import router
+
+from .app_settings import app_settings
+
+APP_LABEL = "tracking"
+
+
+class TrackingRouter:
+    """
+    Sends reads, writes and migrations of the tracking models to the
+    DRF_TRACKING_DATABASE alias and keeps every other app off it. Enable it
+    with ``DATABASE_ROUTERS = ["tracking.routers.TrackingRouter"]``; while
+    the setting is None the router has no opinion.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == APP_LABEL:
+            return app_settings.DATABASE
+        return None
+
+    db_for_write = db_for_read
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Logs point at users in another database; the foreign key has no
+        # constraint, so the relation is only a stored id.
+        if APP_LABEL in (obj1._meta.app_label, obj2._meta.app_label):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        alias = app_settings.DATABASE
+        if alias is None:
+            return None
+        if app_label == APP_LABEL:
+            return db == alias
+        if db == alias:
+            return False
+        return None
+
+
+def SET_NULL_ROUTED(collector, field, sub_objs, using):
+    """
+    ``on_delete`` for foreign keys from tracking models: like SET_NULL, but
+    the update runs on the database the logs are routed to, which need not
+    be the one the deleted object lives in.
+    """
+    alias = router.db_for_write(sub_objs.model)
+    if alias != using:
+        sub_objs = sub_objs.using(alias)
+    collector.add_field_update(field, None, sub_objs)
+
+
+SET_NULL_ROUTED.lazy_sub_objs = True
+
+
+def configure_connection(sender, connection, **kwargs):
+    """Apply DRF_TRACKING_SQLITE_PRAGMAS to new connections to the log database."""
+    if connection.vendor != "sqlite" or connection.alias != app_settings.DATABASE:
+        return
+    with connection.cursor() as cursor:
+        for name, value in app_settings.SQLITE_PRAGMAS.items():
+            cursor.execute("PRAGMA {} = {}".format(name, value))
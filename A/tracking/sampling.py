@@ -0,0 +1,114 @@
+import random
+import threading
+import time
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .app_settings import app_settings
+
+
+class Sampler:
+    """
+    Decides whether a request is logged. ``sample`` returns the weight of
+    the kept row (how many requests it stands for) or ``None`` to skip it.
+    """
+
+    def sample(self):
+        raise NotImplementedError
+
+
+class FixedRateSampler(Sampler):
+    """Keeps a ``rate`` fraction of requests; a rate of 0 drops them all."""
+
+    def __init__(self, rate):
+        if not 0 <= rate <= 1:
+            raise ValueError("rate must be between 0 and 1, got {!r}".format(rate))
+        self.rate = rate
+        self.weight = 1 / rate if rate else None
+
+    def sample(self):
+        if self.rate >= 1 or random.random() < self.rate:
+            return self.weight
+        return None
+
+
+class TokenBucketSampler(Sampler):
+    """
+    Keeps at most ``rate`` requests per second with bursts up to ``burst``.
+    Each kept row carries the number of requests skipped since the previous
+    one, so sums of ``sample_weight`` still estimate the real traffic.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive, got {!r}".format(rate))
+        self.rate = rate
+        self.burst = burst or max(rate, 1)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._skipped = 0
+        self._lock = threading.Lock()
+
+    def sample(self):
+        with self._lock:
+            current = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (current - self._updated) * self.rate
+            )
+            self._updated = current
+            if self._tokens < 1:
+                self._skipped += 1
+                return None
+            self._tokens -= 1
+            weight = self._skipped + 1
+            self._skipped = 0
+            return float(weight)
+
+
+def build_sampler(value):
+    if value is None or isinstance(value, Sampler):
+        return value
+    return FixedRateSampler(value)
+
+
+_route_samplers = None
+
+
+@receiver(setting_changed)
+def _clear_route_samplers(**kwargs):
+    global _route_samplers
+    if kwargs["setting"] in ("DRF_TRACKING_SAMPLERS", "DRF_TRACKING_SAMPLE_RATE"):
+        _route_samplers = None
+
+
+def _get_route_samplers():
+    global _route_samplers
+    if _route_samplers is None:
+        by_view = {}
+        by_path = []
+        for key, value in app_settings.SAMPLERS.items():
+            if key.startswith("/"):
+                by_path.append((key, build_sampler(value)))
+            else:
+                by_view[key] = build_sampler(value)
+        # Longest prefix wins.
+        by_path.sort(key=lambda item: len(item[0]), reverse=True)
+        rate = app_settings.SAMPLE_RATE
+        default = build_sampler(rate) if rate < 1 else None
+        _route_samplers = (by_view, tuple(by_path), default)
+    return _route_samplers
+
+
+def get_route_sampler(view_name, path):
+    """
+    Resolve the sampler configured in DRF_TRACKING_SAMPLERS for a view (by
+    dotted name) or a path prefix, falling back to DRF_TRACKING_SAMPLE_RATE.
+    """
+    by_view, by_path, default = _get_route_samplers()
+    if view_name in by_view:
+        return by_view[view_name]
+    for prefix, sampler in by_path:
+        if path.startswith(prefix):
+            return sampler
+    return default
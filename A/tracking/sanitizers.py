@@ -0,0 +1,116 @@
+import ast
+import re
+
+DEFAULT_SENSITIVE_FIELDS = frozenset({"key", "signature", "token", "api", "password"})
+LITERAL_ERRORS = (ValueError, TypeError, SyntaxError, MemoryError, RecursionError)
+
+
+class _Frame:
+    __slots__ = ("source", "items", "changes", "is_dict", "parent_key", "original")
+
+    def __init__(self, source, parent_key=None, original=None):
+        self.source = source
+        self.is_dict = isinstance(source, dict)
+        self.items = iter(source.items() if self.is_dict else enumerate(source))
+        self.changes = None
+        self.parent_key = parent_key
+        self.original = source if original is None else original
+
+    def change(self, key, value):
+        if self.changes is None:
+            self.changes = {}
+        self.changes[key] = value
+
+    def result(self):
+        if self.changes is None:
+            return self.source
+        changes = self.changes
+        if self.is_dict:
+            return {key: changes.get(key, value) for key, value in self.source.items()}
+        return [changes.get(index, value) for index, value in enumerate(self.source)]
+
+
+class Sanitizer:
+    """
+    Masks sensitive keys in nested request/response data.
+
+    Build one per view class and reuse it: the sensitive key set and the
+    pattern rules are compiled once, and key lookups are memoized. Cleaning
+    walks the structure iteratively and only copies the containers that
+    actually change, so the caller's data is never mutated.
+    """
+
+    KEY_CACHE_SIZE = 4096
+
+    def __init__(self, sensitive_fields=(), patterns=(), substitute="******"):
+        self.fields = DEFAULT_SENSITIVE_FIELDS | {
+            field.lower() for field in sensitive_fields
+        }
+        self.pattern = (
+            re.compile("|".join("(?:{})".format(p) for p in patterns), re.IGNORECASE)
+            if patterns
+            else None
+        )
+        self.substitute = substitute
+        self._key_cache = {}
+
+    def is_sensitive(self, key):
+        try:
+            return self._key_cache[key]
+        except KeyError:
+            pass
+        lowered = key.lower()
+        sensitive = lowered in self.fields or (
+            self.pattern is not None and self.pattern.search(lowered) is not None
+        )
+        if len(self._key_cache) < self.KEY_CACHE_SIZE:
+            self._key_cache[key] = sensitive
+        return sensitive
+
+    def clean(self, data):
+        if isinstance(data, bytes):
+            return data.decode(errors="replace")
+        if not isinstance(data, (dict, list)):
+            return data
+
+        stack = [_Frame(data)]
+        while True:
+            frame = stack[-1]
+            for key, value in frame.items:
+                child = self._visit(frame, key, value)
+                if child is not None:
+                    stack.append(child)
+                    break
+            else:
+                stack.pop()
+                result = frame.result()
+                if not stack:
+                    return result
+                if result is not frame.original:
+                    stack[-1].change(frame.parent_key, result)
+
+    def _visit(self, frame, key, value):
+        if frame.is_dict:
+            if isinstance(key, str) and self.is_sensitive(key):
+                frame.change(key, self.substitute)
+                return None
+            if isinstance(value, str) and self.looks_like_literal(value):
+                try:
+                    parsed = ast.literal_eval(value)
+                except LITERAL_ERRORS:
+                    return None
+                if isinstance(parsed, (list, dict)):
+                    return _Frame(parsed, key, original=value)
+                return None
+        elif isinstance(value, bytes):
+            frame.change(key, value.decode(errors="replace"))
+            return None
+        if isinstance(value, (list, dict)):
+            return _Frame(value, key)
+        return None
+
+    @staticmethod
+    def looks_like_literal(value):
+        # ast.literal_eval only tolerates leading spaces and tabs, and only
+        # list and dict results are ever cleaned.
+        return value.lstrip(" \t")[:1] in ("[", "{")
@@ -0,0 +1,226 @@
+import operator
+from functools import reduce
+
+from django.core.signals import setting_changed
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.dispatch import receiver
+
+TABLE = "tracking_apirequestlog_search"
+SEARCH_FIELDS = ("path", "errors", "response", "data")
+
+# Aliases whose index table is known to exist.
+_ready = set()
+
+
+@receiver(setting_changed)
+def _clear_ready(**kwargs):
+    setting = kwargs["setting"]
+    if setting.startswith("DRF_TRACKING_") or setting == "DATABASES":
+        _ready.clear()
+
+
+class BaseSearchIndex:
+    """
+    Full-text index over the SEARCH_FIELDS of ApiRequestLog, keyed by log
+    id and kept in a table of its own next to the logs. Documents are the
+    ``(id, path, errors, response, data)`` tuples made by ``document``.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.quote = connection.ops.quote_name
+
+    def create_sql(self):
+        raise NotImplementedError
+
+    def ensure(self):
+        alias = self.connection.alias
+        if alias in _ready:
+            return
+        with self.connection.cursor() as cursor:
+            for sql in self.create_sql():
+                cursor.execute(sql)
+        transaction.on_commit(lambda: _ready.add(alias), using=alias)
+
+    def add(self, documents):
+        raise NotImplementedError
+
+    def remove(self, ids):
+        ids = list(ids)
+        if not ids:
+            return
+        self.ensure()
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM {} WHERE {} IN ({})".format(
+                    self.quote(TABLE), self.key, ", ".join(["%s"] * len(ids))
+                ),
+                ids,
+            )
+
+    def prune(self):
+        """Drop entries of logs that no longer exist."""
+        from .models import ApiRequestLog
+
+        self.ensure()
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM {} WHERE {} NOT IN (SELECT id FROM {})".format(
+                    self.quote(TABLE),
+                    self.key,
+                    self.quote(ApiRequestLog._meta.db_table),
+                )
+            )
+            return cursor.rowcount
+
+    def clear(self):
+        self.ensure()
+        with self.connection.cursor() as cursor:
+            cursor.execute("DELETE FROM {}".format(self.quote(TABLE)))
+
+    def match_sql(self, query):
+        raise NotImplementedError
+
+    def filter(self, queryset, query):
+        self.ensure()
+        return queryset.filter(pk__in=RawSQL(*self.match_sql(query)))
+
+
+class SQLiteSearchIndex(BaseSearchIndex):
+    """An FTS5 table whose rowid is the log id."""
+
+    key = "rowid"
+
+    def create_sql(self):
+        return [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS {} USING fts5({})".format(
+                self.quote(TABLE), ", ".join(SEARCH_FIELDS)
+            )
+        ]
+
+    def add(self, documents):
+        self.ensure()
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT OR REPLACE INTO {} (rowid, {}) "
+                "VALUES (%s, %s, %s, %s, %s)".format(
+                    self.quote(TABLE), ", ".join(SEARCH_FIELDS)
+                ),
+                documents,
+            )
+
+    def match_sql(self, query):
+        # Every word becomes a quoted phrase, so user input never reaches
+        # the FTS5 query syntax and all words have to match.
+        terms = " ".join(
+            '"{}"'.format(word.replace('"', '""')) for word in query.split()
+        )
+        return (
+            "SELECT rowid FROM {table} WHERE {table} MATCH %s".format(
+                table=self.quote(TABLE)
+            ),
+            [terms],
+        )
+
+
+class PostgreSQLSearchIndex(BaseSearchIndex):
+    """A tsvector per log with a GIN index, using the ``simple`` configuration."""
+
+    key = "log_id"
+
+    def create_sql(self):
+        table = self.quote(TABLE)
+        return [
+            "CREATE TABLE IF NOT EXISTS {} "
+            "(log_id bigint PRIMARY KEY, document tsvector NOT NULL)".format(table),
+            "CREATE INDEX IF NOT EXISTS {} ON {} USING GIN (document)".format(
+                self.quote(TABLE + "_document"), table
+            ),
+        ]
+
+    def add(self, documents):
+        self.ensure()
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO {} (log_id, document) "
+                "VALUES (%s, to_tsvector('simple', concat_ws(' ', %s, %s, %s, %s))) "
+                "ON CONFLICT (log_id) "
+                "DO UPDATE SET document = EXCLUDED.document".format(self.quote(TABLE)),
+                documents,
+            )
+
+    def match_sql(self, query):
+        return (
+            "SELECT log_id FROM {} "
+            "WHERE document @@ plainto_tsquery('simple', %s)".format(self.quote(TABLE)),
+            [query],
+        )
+
+
+class UnindexedSearch(BaseSearchIndex):
+    """
+    Fallback for databases without a supported full-text engine: a LIKE
+    scan, which misses compressed values.
+    """
+
+    def ensure(self):
+        pass
+
+    def add(self, documents):
+        pass
+
+    def remove(self, ids):
+        pass
+
+    def prune(self):
+        return 0
+
+    def clear(self):
+        pass
+
+    def filter(self, queryset, query):
+        for word in query.split():
+            conditions = [
+                Q(**{field + "__icontains": word}) for field in SEARCH_FIELDS
+            ]
+            queryset = queryset.filter(reduce(operator.or_, conditions))
+        return queryset
+
+
+SEARCH_INDEXES = {"sqlite": SQLiteSearchIndex, "postgresql": PostgreSQLSearchIndex}
+
+
+def get_search_index(using=None):
+    from .models import ApiRequestLog
+
+    connection = connections[using or router.db_for_write(ApiRequestLog)]
+    return SEARCH_INDEXES.get(connection.vendor, UnindexedSearch)(connection)
+
+
+def document(pk, log):
+    """Return the index document of log ``pk`` from a dict of its fields."""
+    values = [log.get(field) for field in SEARCH_FIELDS]
+    return (pk,) + tuple("" if value is None else str(value) for value in values)
+
+
+def index_logs(instances, logs, using=None):
+    """
+    Index freshly inserted ``instances`` from the ``logs`` they were built
+    from, which still hold the uncompressed, undeduplicated bodies.
+    """
+    documents = [
+        document(instance.pk, log)
+        for instance, log in zip(instances, logs)
+        if instance.pk is not None
+    ]
+    if documents:
+        get_search_index(using).add(documents)
+
+
+def search_logs(queryset, query):
+    """Narrow ``queryset`` to the logs matching every word of ``query``."""
+    if not query.strip():
+        return queryset
+    return get_search_index(queryset.db).filter(queryset, query)
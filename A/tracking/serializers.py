@@ -0,0 +1,55 @@
+from rest_framework import serializers
+
+from .models import ApiRequestLog
+
+
+class ApiRequestLogSerializer(serializers.ModelSerializer):
+    """
+    Read-only representation of a log. ``selected_fields`` limits the
+    output to a subset of ``Meta.fields``. Deduplicated response bodies are
+    looked up in the ``blobs`` context entry, ``{digest: body}``, before
+    falling back to one query per log.
+    """
+
+    class Meta:
+        model = ApiRequestLog
+        fields = [
+            "id",
+            "requested_at",
+            "response_ms",
+            "response_us",
+            "ttfb_us",
+            "ttlb_us",
+            "response_bytes",
+            "user",
+            "username_persistent",
+            "path",
+            "view",
+            "view_method",
+            "remote_addr",
+            "host",
+            "method",
+            "status_code",
+            "sample_weight",
+            "query_params",
+            "data",
+            "response",
+            "errors",
+        ]
+        read_only_fields = fields
+
+    def __init__(self, *args, selected_fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if selected_fields is not None:
+            for name in set(self.fields) - set(selected_fields):
+                self.fields.pop(name)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if "response" in data and instance.response_digest:
+            blobs = self.context.get("blobs", {})
+            if instance.response_digest in blobs:
+                data["response"] = blobs[instance.response_digest]
+            else:
+                data["response"] = instance.get_response_body()
+        return data
@@ -0,0 +1,131 @@
+import datetime
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+import zlib
+
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .app_settings import app_settings
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".seg"
+# Every record is framed as <payload length><crc32 of payload><payload>.
+FRAME_HEADER = struct.Struct(">II")
+
+TEXT_FIELDS = ("query_params", "data", "response", "errors")
+
+
+def serialize_log(log):
+    record = {}
+    for key, value in log.items():
+        if key == "user":
+            record["user_id"] = value.pk if value is not None else None
+        elif isinstance(value, (datetime.datetime, datetime.date)):
+            record[key] = value.isoformat()
+        elif key in TEXT_FIELDS and value is not None and not isinstance(value, str):
+            # Mirror TextField.to_python so spooled rows match direct saves.
+            record[key] = str(value)
+        else:
+            record[key] = value
+    return record
+
+
+def deserialize_log(record):
+    log = dict(record)
+    requested_at = log.get("requested_at")
+    if isinstance(requested_at, str):
+        log["requested_at"] = parse_datetime(requested_at) or parse_date(requested_at)
+    return log
+
+
+def encode_frame(record):
+    payload = json.dumps(record, separators=(",", ":"), default=str).encode()
+    return FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_frames(fp, offset=0, limit=None):
+    """
+    Yield ``(record, end_offset)`` for every complete frame after ``offset``.
+    A partially written trailing frame is left for the next read.
+    """
+    fp.seek(offset)
+    count = 0
+    while limit is None or count < limit:
+        header = fp.read(FRAME_HEADER.size)
+        if len(header) < FRAME_HEADER.size:
+            return
+        length, checksum = FRAME_HEADER.unpack(header)
+        payload = fp.read(length)
+        if len(payload) < length:
+            return
+        offset += FRAME_HEADER.size + length
+        if zlib.crc32(payload) != checksum:
+            logger.warning("Skipping corrupt spool frame ending at %s", offset)
+            continue
+        count += 1
+        yield json.loads(payload), offset
+
+
+def list_segments(directory):
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return sorted(name for name in names if name.endswith(SEGMENT_SUFFIX))
+
+
+class SpoolWriter:
+    """
+    Appends framed log records to a segment file owned by the current
+    process, starting a new segment once ``segment_size`` bytes are written.
+    """
+
+    def __init__(self, directory=None, segment_size=None):
+        self.directory = str(directory or app_settings.SPOOL_DIR)
+        self.segment_size = segment_size or app_settings.SPOOL_SEGMENT_SIZE
+        self._lock = threading.Lock()
+        self._fp = None
+        self._pid = None
+        self._sequence = 0
+
+    def write(self, log):
+        frame = encode_frame(serialize_log(log))
+        with self._lock:
+            fp = self._get_file()
+            fp.write(frame)
+            fp.flush()
+            if fp.tell() >= self.segment_size:
+                self._close()
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _get_file(self):
+        if self._fp is not None and self._pid == os.getpid():
+            return self._fp
+        # Forked workers must never share the parent's segment.
+        self._fp = None
+        self._pid = os.getpid()
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        name = "{}-{}-{}-{:06d}{}".format(
+            int(time.time() * 1000),
+            socket.gethostname(),
+            self._pid,
+            self._sequence,
+            SEGMENT_SUFFIX,
+        )
+        self._fp = open(os.path.join(self.directory, name), "ab")
+        return self._fp
+
+    def _close(self):
+        if self._fp is not None and self._pid == os.getpid():
+            self._fp.close()
+        self._fp = None
@@ -0,0 +1,90 @@
+import time
+import traceback
+
+
+class StreamCapture:
+    """
+    Base for the pass-through wrappers put around ``streaming_content``.
+    Keeps at most ``limit`` bytes of the body, counts every byte and calls
+    ``on_finish(captured, total, first_byte_ns, last_byte_ns, errors)``
+    exactly once, when the stream is exhausted, fails or is closed.
+    """
+
+    def __init__(self, iterator, limit, on_finish):
+        self._iterator = iterator
+        self.limit = limit
+        self.on_finish = on_finish
+        self.total = 0
+        self.first_byte_ns = None
+        self.finished = False
+        self._chunks = []
+        self._captured = 0
+
+    def _record(self, chunk):
+        if self.first_byte_ns is None:
+            self.first_byte_ns = time.perf_counter_ns()
+        self.total += len(chunk)
+        room = self.limit - self._captured
+        if room > 0:
+            chunk = chunk[:room]
+            self._chunks.append(chunk)
+            self._captured += len(chunk)
+
+    def finish(self, errors=None):
+        if self.finished:
+            return
+        self.finished = True
+        captured = b"".join(self._chunks)
+        self._chunks = []
+        self.on_finish(
+            captured, self.total, self.first_byte_ns, time.perf_counter_ns(), errors
+        )
+
+    def close(self):
+        # The original iterator's close() is already registered with the
+        # response, so only the log needs finishing here.
+        self.finish()
+
+
+class SyncStreamCapture(StreamCapture):
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            chunk = next(self._iterator)
+        except StopIteration:
+            self.finish()
+            raise
+        except Exception:
+            self.finish(traceback.format_exc())
+            raise
+        self._record(chunk)
+        return chunk
+
+
+class AsyncStreamCapture(StreamCapture):
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            chunk = await self._iterator.__anext__()
+        except StopAsyncIteration:
+            self.finish()
+            raise
+        except Exception:
+            self.finish(traceback.format_exc())
+            raise
+        self._record(chunk)
+        return chunk
+
+
+def wrap_streaming_response(response, limit, on_finish):
+    content = response.streaming_content
+    if response.is_async:
+        capture = AsyncStreamCapture(content, limit, on_finish)
+    else:
+        capture = SyncStreamCapture(iter(content), limit, on_finish)
+    response.streaming_content = capture
+    return capture
@@ -0,0 +1,77 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from tracking.admin import EstimatedCountPaginator
+from tracking.models import ApiRequestLog
+
+from .utils import make_log
+
+
+class TestApiRequestLogAdmin(TestCase):
+    url = "/admin/tracking/apirequestlog/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", password="pass")
+        ApiRequestLog.objects.bulk_create(
+            [
+                ApiRequestLog(
+                    **make_log(
+                        user=cls.admin,
+                        status_code=200 if i % 2 else 500,
+                        view="app.views.View{}".format(i % 3),
+                        response="x" * 100,
+                    )
+                )
+                for i in range(150)
+            ]
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_changelist_query_count(self):
+        with self.assertNumQueries(5):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_changelist_defers_large_columns(self):
+        response = self.client.get(self.url)
+        log = response.context["cl"].result_list[0]
+        self.assertEqual(
+            log.get_deferred_fields(), {"response", "data", "errors"}
+        )
+
+    def test_filters(self):
+        response = self.client.get(
+            self.url, {"status_class": 5, "method": "GET", "view": "app.views.View1"}
+        )
+        self.assertEqual(response.context["cl"].result_count, 25)
+
+    def test_search_matches_path_prefix(self):
+        ApiRequestLog.objects.create(**make_log(path="/orders/1/"))
+        response = self.client.get(self.url, {"q": "/orders/"})
+        self.assertEqual(
+            [log.path for log in response.context["cl"].result_list], ["/orders/1/"]
+        )
+        response = self.client.get(self.url, {"q": "orders"})
+        self.assertEqual(list(response.context["cl"].result_list), [])
+
+    def test_keyset_navigation(self):
+        response = self.client.get(self.url)
+        cl = response.context["cl"]
+        last_id = list(cl.result_list)[-1].pk
+        self.assertEqual(cl.keyset_next_url, "?id__lt={}".format(last_id))
+        self.assertContains(response, "Older entries")
+        response = self.client.get(self.url, {"id__lt": last_id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["cl"].result_count, 50)
+
+
+class TestEstimatedCountPaginator(TestCase):
+    def test_count_is_capped(self):
+        ApiRequestLog.objects.bulk_create([ApiRequestLog(**make_log()) for _ in range(5)])
+        paginator = EstimatedCountPaginator(ApiRequestLog.objects.order_by("-id"), 2)
+        paginator.count_limit = 3
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.num_pages, 2)
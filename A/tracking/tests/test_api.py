@@ -0,0 +1,146 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from tracking.backends import DatabaseBackend
+from tracking.models import ApiRequestLog
+
+from .utils import make_log
+
+
+@override_settings(ROOT_URLCONF="tracking.tests.urls")
+class TestApiRequestLogViewSet(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create(username="staff", is_staff=True)
+        self.client.force_login(self.staff)
+        self.start = now() - datetime.timedelta(hours=1)
+        for index in range(5):
+            ApiRequestLog.objects.create(
+                **make_log(
+                    requested_at=self.start + datetime.timedelta(minutes=index),
+                    path="/v{}/items/".format(index % 2),
+                    method="POST" if index == 4 else "GET",
+                    status_code=500 if index in (1, 3) else 200,
+                    view="app.views.Items",
+                    response='{"items": []}',
+                    data="{}",
+                )
+            )
+
+    def get(self, params=None, **extra):
+        return self.client.get("/logs/", params or {}, **extra)
+
+    def ids(self, response):
+        return [log["id"] for log in response.json()["results"]]
+
+    def test_requires_staff(self):
+        self.client.logout()
+        self.assertEqual(self.get().status_code, 403)
+
+    def test_newest_first(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        expected = list(
+            ApiRequestLog.objects.order_by("-requested_at").values_list("id", flat=True)
+        )
+        self.assertEqual(self.ids(response), expected)
+        self.assertIsNone(response.json()["next"])
+
+    def test_keyset_pages(self):
+        # Two rows share a timestamp, so id breaks the tie.
+        ApiRequestLog.objects.create(**make_log(requested_at=self.start))
+        seen = []
+        response = self.get({"page_size": 2})
+        while True:
+            self.assertLessEqual(len(self.ids(response)), 2)
+            seen.extend(self.ids(response))
+            if response.json()["next"] is None:
+                break
+            response = self.client.get(response.json()["next"])
+        expected = list(
+            ApiRequestLog.objects.order_by("-requested_at", "-id").values_list(
+                "id", flat=True
+            )
+        )
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.get({"cursor": "garbage"}).status_code, 404)
+
+    def test_filters(self):
+        self.assertEqual(len(self.ids(self.get({"status": "5xx"}))), 2)
+        self.assertEqual(len(self.ids(self.get({"status": ["200", "500"]}))), 5)
+        self.assertEqual(len(self.ids(self.get({"method": "post"}))), 1)
+        self.assertEqual(len(self.ids(self.get({"path": "/v1/"}))), 2)
+        self.assertEqual(len(self.ids(self.get({"view": "app.views.Items"}))), 5)
+        since = (self.start + datetime.timedelta(minutes=2)).isoformat()
+        self.assertEqual(len(self.ids(self.get({"since": since}))), 3)
+        self.assertEqual(len(self.ids(self.get({"until": since}))), 2)
+
+    def test_user_filter(self):
+        ApiRequestLog.objects.create(**make_log(user=self.staff))
+        response = self.get({"user": self.staff.pk})
+        self.assertEqual(len(self.ids(response)), 1)
+        self.assertEqual(response.json()["results"][0]["user"], self.staff.pk)
+
+    def test_invalid_filters(self):
+        self.assertEqual(self.get({"status": "oops"}).status_code, 400)
+        self.assertEqual(self.get({"since": "yesterday"}).status_code, 400)
+        self.assertEqual(self.get({"user": "staff"}).status_code, 400)
+        self.assertEqual(self.get({"fields": "secret"}).status_code, 400)
+
+    def test_field_selection(self):
+        response = self.get({"fields": "path,status_code"})
+        self.assertEqual(set(response.json()["results"][0]), {"path", "status_code"})
+        response = self.get({"exclude": "response,data"})
+        result = response.json()["results"][0]
+        self.assertNotIn("response", result)
+        self.assertNotIn("data", result)
+        self.assertIn("requested_at", result)
+
+    def test_excluded_columns_are_not_loaded(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get({"exclude": "response,data,errors,query_params"})
+        self.assertEqual(response.status_code, 200)
+        (sql,) = [
+            query["sql"]
+            for query in queries
+            if "tracking_apirequestlog" in query["sql"]
+        ]
+        self.assertIn('"path"', sql)
+        self.assertNotIn('"response"', sql)
+        self.assertNotIn('"data"', sql)
+
+    @override_settings(
+        DRF_TRACKING_DEDUP_RESPONSES=True, DRF_TRACKING_DEDUP_MIN_LENGTH=10
+    )
+    def test_deduplicated_responses_are_inlined(self):
+        ApiRequestLog.objects.all().delete()
+        body = "x" * 100
+        DatabaseBackend().write_many([make_log(response=body), make_log(response=body)])
+        response = self.get({"fields": "response"})
+        self.assertEqual(
+            response.json()["results"], [{"response": body}, {"response": body}]
+        )
+
+    def test_etag(self):
+        response = self.get({"status": "5xx"})
+        etag = response["ETag"]
+        self.assertEqual(self.get({"status": "5xx"})["ETag"], etag)
+        self.assertEqual(
+            self.get({"status": "5xx"}, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+        ApiRequestLog.objects.create(**make_log(status_code=503))
+        response = self.get({"status": "5xx"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_retrieve(self):
+        log = ApiRequestLog.objects.first()
+        response = self.client.get("/logs/{}/".format(log.pk), {"fields": "id"})
+        self.assertEqual(response.json(), {"id": log.pk})
+        self.assertIn("ETag", response)
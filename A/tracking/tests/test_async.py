@@ -0,0 +1,43 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from tracking.models import ApiRequestLog
+from tracking.writers import BufferedLogWriter
+
+
+@override_settings(ROOT_URLCONF="tracking.tests.urls")
+@mock.patch.object(BufferedLogWriter, "_ensure_started")
+class TestAsyncLoggingMixin(TestCase):
+    def setUp(self):
+        self.writer = BufferedLogWriter(flush_interval=60)
+        patcher = mock.patch("tracking.mixins.get_buffered_writer", return_value=self.writer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_async_request_is_buffered(self, mock_start):
+        response = await self.async_client.get("/async-logging/", {"a": "1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(await ApiRequestLog.objects.acount(), 0)
+        self.assertEqual(self.writer._queue.qsize(), 1)
+
+    async def test_async_log_fields(self, mock_start):
+        await self.async_client.get("/async-logging/", {"a": "1"})
+        log = self.writer._queue.get_nowait()
+        self.assertEqual(log["path"], "/async-logging/")
+        self.assertEqual(log["view"], "tracking.tests.views.MockAsyncLoggingView")
+        self.assertEqual(log["status_code"], 200)
+        self.assertEqual(log["query_params"], {"a": "1"})
+
+    async def test_full_buffer_never_blocks(self, mock_start):
+        self.writer.full_policy = "block"
+        self.writer.block_timeout = 60
+        self.writer._queue.maxsize = 1
+        await self.async_client.get("/async-logging/")
+        await self.async_client.get("/async-logging/")
+        self.assertEqual(self.writer.dropped, 1)
+
+    def test_flush_persists_async_logs(self, mock_start):
+        self.client.get("/async-logging/")
+        self.writer.flush()
+        self.assertEqual(ApiRequestLog.objects.count(), 1)
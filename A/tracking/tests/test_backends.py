@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from tracking.backends import (
+    DatabaseBackend,
+    InMemoryStreamClient,
+    JSONLinesBackend,
+    SpoolBackend,
+    StreamBackend,
+    get_storage_backend,
+)
+from tracking.models import ApiRequestLog
+
+from .utils import make_log
+
+stream_client = InMemoryStreamClient()
+
+
+class TestDatabaseBackend(TestCase):
+    def test_write_many_uses_bulk_create(self):
+        with mock.patch.object(
+            ApiRequestLog.objects, "bulk_create", wraps=ApiRequestLog.objects.bulk_create
+        ) as mock_bulk_create:
+            DatabaseBackend().write_many([make_log(), make_log()])
+        self.assertEqual(mock_bulk_create.call_count, 1)
+        self.assertEqual(ApiRequestLog.objects.count(), 2)
+
+    def test_write(self):
+        DatabaseBackend().write(make_log())
+        self.assertEqual(ApiRequestLog.objects.count(), 1)
+
+
+class TestJSONLinesBackend(TestCase):
+    def test_write_and_rotate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "logs", "requests.jsonl")
+            backend = JSONLinesBackend(path, max_bytes=1, backup_count=2)
+            for index in range(3):
+                backend.write_many([make_log(status_code=index)])
+            backend.close()
+            self.assertFalse(os.path.exists(path))
+            with open(path + ".1") as fp:
+                self.assertEqual(json.loads(fp.readline())["status_code"], 2)
+            with open(path + ".2") as fp:
+                self.assertEqual(json.loads(fp.readline())["status_code"], 1)
+            self.assertFalse(os.path.exists(path + ".3"))
+
+
+class TestStreamBackend(TestCase):
+    def test_write_many(self):
+        client = InMemoryStreamClient()
+        backend = StreamBackend(client, stream="logs", maxlen=2)
+        backend.write_many([make_log(status_code=code) for code in (200, 201, 202)])
+        entries = client.xrange("logs")
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(json.loads(entries[-1][1]["log"])["status_code"], 202)
+
+
+@override_settings(ROOT_URLCONF="tracking.tests.urls")
+class TestStorageBackendSetting(TestCase):
+    def test_default_backend(self):
+        self.assertIsInstance(get_storage_backend(), DatabaseBackend)
+
+    def test_spool_dir_selects_spool_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(DRF_TRACKING_SPOOL_DIR=directory):
+                self.assertIsInstance(get_storage_backend(), SpoolBackend)
+
+    @override_settings(
+        DRF_TRACKING_STORAGE_BACKEND="tracking.backends.StreamBackend",
+        DRF_TRACKING_STORAGE_OPTIONS={
+            "client": "tracking.tests.test_backends.stream_client",
+            "stream": "requests",
+        },
+    )
+    def test_configured_backend_receives_logs(self):
+        self.client.get("/logging/")
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+        ((entry_id, fields),) = stream_client.xrange("requests")
+        self.assertEqual(json.loads(fields["log"])["path"], "/logging/")
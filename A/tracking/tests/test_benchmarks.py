@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from tracking.benchmarks import overhead
+from tracking.models import ApiRequestLog
+
+
+class TestOverheadBenchmark(TestCase):
+    def benchmark(self, *args):
+        out = StringIO()
+        call_command(
+            "benchmark_tracking",
+            "--iterations", "1", "--items", "10", "--view", "logging",
+            *args,
+            stdout=out
+        )
+        return out.getvalue()
+
+    def test_reports_phases_and_leaves_no_rows(self):
+        output = self.benchmark()
+        self.assertIn("logging:items=10,depth=1,sensitive=0", output)
+        for phase in overhead.PHASES:
+            self.assertIn(phase, output)
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+
+    def test_phases_are_measured(self):
+        results = overhead.run(iterations=1, view_names=["logging"], items=[10])
+        result = results["logging:items=10,depth=4,sensitive=10"]
+        self.assertGreater(result["phases_us"]["db_write"], 0)
+        self.assertGreater(result["phases_us"]["clean_data"], 0)
+
+    def test_save_and_compare_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            self.benchmark("--save-baseline", path)
+            with open(path) as fp:
+                baseline = json.load(fp)
+            self.assertIn("logging:items=10,depth=1,sensitive=0", baseline)
+
+            output = self.benchmark("--compare", path, "--threshold", "100")
+            self.assertIn("No regressions", output)
+
+            for result in baseline.values():
+                result["median_ms"] = 1e-6
+            with open(path, "w") as fp:
+                json.dump(baseline, fp)
+            with self.assertRaises(CommandError):
+                self.benchmark("--compare", path)
+
+    def test_compare(self):
+        baseline = {"a": {"median_ms": 1.0}, "b": {"median_ms": 1.0}}
+        results = {"a": {"median_ms": 1.1}, "b": {"median_ms": 1.5}, "c": {"median_ms": 9}}
+        self.assertEqual(overhead.compare(results, baseline, 0.2), [("b", 1.0, 1.5)])
@@ -0,0 +1,138 @@
+import ast
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APITestCase
+
+from tracking.base_mixins import BaseLoggingMixin
+from tracking.models import ApiRequestLog
+
+
+@override_settings(ROOT_URLCONF="tracking.tests.urls")
+class TestPayloadCapture(APITestCase):
+    def test_full_capture_by_default(self):
+        self.client.get("/large-response-logging/")
+        log = ApiRequestLog.objects.first()
+        self.assertEqual(len(ast.literal_eval(log.response)), 1)
+        self.assertIn('"results":[0,1,2', log.response)
+
+    @override_settings(DRF_TRACKING_MAX_BODY_BYTES=20)
+    def test_response_truncated(self):
+        response = self.client.get("/large-response-logging/")
+        log = ApiRequestLog.objects.first()
+        self.assertTrue(log.response.startswith(response.content[:20].decode()))
+        self.assertTrue(
+            log.response.endswith(
+                "...[truncated {} bytes]".format(len(response.content) - 20)
+            )
+        )
+
+    @override_settings(DRF_TRACKING_MAX_BODY_BYTES=30)
+    def test_request_data_truncated_after_sanitizing(self):
+        self.client.post(
+            "/large-response-logging/",
+            {"password": "secret", "comment": "x" * 100},
+            format="json",
+        )
+        log = ApiRequestLog.objects.first()
+        self.assertIn(BaseLoggingMixin.CLEAN_SUBSTITUTE, log.data)
+        self.assertNotIn("secret", log.data)
+        self.assertIn("...[truncated", log.data)
+
+    def test_headers_only(self):
+        self.client.get("/headers-only-logging/")
+        log = ApiRequestLog.objects.first()
+        self.assertEqual(ast.literal_eval(log.response)["Allow"], "GET, HEAD, OPTIONS")
+        self.assertEqual(log.data, "")
+
+    @override_settings(DRF_TRACKING_CAPTURE_MODE="conditional")
+    def test_conditional_capture_on_error(self):
+        self.client.get("/large-response-logging/")
+        self.client.post("/large-response-logging/", {"a": "b"}, format="json")
+        ok = ApiRequestLog.objects.get(method="GET")
+        failed = ApiRequestLog.objects.get(method="POST")
+        self.assertNotIn("results", ok.response)
+        self.assertIn("bad request", failed.response)
+        self.assertEqual(ast.literal_eval(failed.data), {"a": "b"})
+
+    @override_settings(
+        DRF_TRACKING_CAPTURE_MODE="conditional",
+        DRF_TRACKING_FULL_CAPTURE_STATUS=None,
+        DRF_TRACKING_FULL_CAPTURE_MS=0,
+    )
+    def test_conditional_capture_on_slow_response(self):
+        self.client.get("/large-response-logging/")
+        log = ApiRequestLog.objects.first()
+        self.assertIn("results", log.response)
+
+
+@override_settings(ROOT_URLCONF="tracking.tests.urls")
+class TestLazyRequestDataCapture(APITestCase):
+    def test_unlogged_method_body_is_not_parsed(self):
+        with mock.patch.object(Request, "_parse") as mock_parse:
+            self.client.generic(
+                "GET", "/explicit-logging/", "{broken", content_type="application/json"
+            )
+        mock_parse.assert_not_called()
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+
+    @mock.patch("tracking.sampling.random.random", return_value=0.99)
+    def test_sampled_out_body_is_not_parsed(self, mock_random):
+        with mock.patch.object(Request, "_parse") as mock_parse:
+            self.client.generic(
+                "GET", "/sampled-logging/", '{"a": 1}', content_type="application/json"
+            )
+        mock_parse.assert_not_called()
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+
+    def test_raw_snapshot_is_parsed_and_sanitized(self):
+        self.client.put("/upload-logging/", {"password": "secret", "a": 1}, format="json")
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(ast.literal_eval(log.data), {"password": "******", "a": 1})
+
+    def test_malformed_body_of_view_that_ignores_it(self):
+        response = self.client.generic(
+            "PUT", "/upload-logging/", "{broken", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ApiRequestLog.objects.get().data, "{broken")
+
+    def test_form_snapshot(self):
+        self.client.put(
+            "/upload-logging/",
+            "token=abc&a=b",
+            content_type="application/x-www-form-urlencoded",
+        )
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(ast.literal_eval(log.data), {"token": "******", "a": "b"})
+
+    @override_settings(DRF_TRACKING_BODY_SNAPSHOT_BYTES=10)
+    def test_oversized_json_snapshot_keeps_only_size(self):
+        body = '{"password": "secret", "a": "bbbbbbbbbb"}'
+        self.client.generic("PUT", "/upload-logging/", body, content_type="application/json")
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(log.data, "...[truncated {} bytes]".format(len(body)))
+
+    def test_uploads_logged_as_metadata(self):
+        upload = SimpleUploadedFile("report.csv", b"a,b\n" * 100, content_type="text/csv")
+        response = self.client.post(
+            "/upload-logging/", {"report": upload, "api": "x"}, format="multipart"
+        )
+        self.assertEqual(response.data, {"files": ["report"]})
+        data = ast.literal_eval(ApiRequestLog.objects.get().data)
+        self.assertEqual(
+            data,
+            {
+                "report": {"name": "report.csv", "size": 400, "content_type": "text/csv"},
+                "api": "******",
+            },
+        )
+
+    def test_unread_upload_logged_as_metadata(self):
+        upload = SimpleUploadedFile("notes.txt", b"secret notes", content_type="text/plain")
+        self.client.put("/upload-logging/", {"notes": upload}, format="multipart")
+        data = ast.literal_eval(ApiRequestLog.objects.get().data)
+        self.assertEqual(data["notes"]["name"], "notes.txt")
+        self.assertNotIn("secret notes", str(data))
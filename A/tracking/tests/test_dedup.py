@@ -0,0 +1,82 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from tracking.backends import DatabaseBackend
+from tracking.dedup import digest_body, get_digest_cache
+from tracking.models import ApiRequestLog, ResponseBlob
+
+from .utils import make_log
+
+BODY = '{"config": "%s"}' % ("x" * 2000)
+
+
+@override_settings(DRF_TRACKING_DEDUP_RESPONSES=True)
+class TestResponseDeduplication(TestCase):
+    def setUp(self):
+        get_digest_cache().clear()
+        self.backend = DatabaseBackend()
+
+    def test_identical_bodies_stored_once(self):
+        self.backend.write_many([make_log(response=BODY) for _ in range(3)])
+        self.backend.write(make_log(response=BODY))
+        blob = ResponseBlob.objects.get()
+        self.assertEqual(blob.digest, digest_body(BODY))
+        self.assertEqual(blob.ref_count, 4)
+        self.assertEqual(blob.body, BODY)
+        log = ApiRequestLog.objects.first()
+        self.assertIsNone(log.response)
+        self.assertEqual(log.get_response_body(), BODY)
+
+    def test_small_bodies_kept_inline(self):
+        self.backend.write(make_log(response="[]"))
+        self.assertEqual(ResponseBlob.objects.count(), 0)
+        self.assertEqual(ApiRequestLog.objects.get().get_response_body(), "[]")
+
+    def test_cached_digest_skips_lookup(self):
+        self.backend.write(make_log(response=BODY))
+        # Savepoint, reference bump, insert and release: no digest lookup.
+        with self.assertNumQueries(4):
+            self.backend.write(make_log(response=BODY))
+
+    @override_settings(DRF_TRACKING_DEDUP_CACHE_SIZE=0)
+    def test_cache_size_setting(self):
+        self.assertEqual(get_digest_cache().max_size, 0)
+        self.backend.write(make_log(response=BODY))
+        self.assertNotIn(digest_body(BODY), get_digest_cache())
+
+    def test_stale_cache_recreates_blob(self):
+        self.backend.write(make_log(response=BODY))
+        ResponseBlob.objects.all().delete()
+        self.backend.write(make_log(response=BODY))
+        self.assertEqual(ResponseBlob.objects.get().ref_count, 1)
+
+    def test_failed_insert_keeps_no_reference(self):
+        self.backend.write(make_log(response=BODY))
+        with mock.patch.object(
+            ApiRequestLog.objects, "bulk_create", side_effect=IntegrityError
+        ), self.assertRaises(IntegrityError):
+            self.backend.write_many([make_log(response=BODY), make_log(response=BODY)])
+        with mock.patch.object(ApiRequestLog, "save", side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                self.backend.write(make_log(response=BODY))
+        self.assertEqual(ResponseBlob.objects.get().ref_count, 1)
+
+    def test_purge_releases_blobs(self):
+        old = now() - datetime.timedelta(days=30)
+        self.backend.write_many(
+            [make_log(response=BODY, requested_at=old) for _ in range(2)]
+        )
+        other = BODY.replace("x", "y")
+        self.backend.write_many(
+            [make_log(response=BODY), make_log(response=other, requested_at=old)]
+        )
+        call_command("purge_tracking_logs", "--days", "1", stdout=StringIO())
+        blob = ResponseBlob.objects.get()
+        self.assertEqual(blob.digest, digest_body(BODY))
+        self.assertEqual(blob.ref_count, 1)
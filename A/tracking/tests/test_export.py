@@ -0,0 +1,230 @@
+import csv
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils.timezone import now
+
+from tracking.backends import DatabaseBackend
+from tracking.management.commands.export_tracking_logs import CSVPart, ParquetPart
+from tracking.models import ApiRequestLog
+
+from .utils import make_log
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+def create_logs(count, **kwargs):
+    current = now()
+    for index in range(count):
+        ApiRequestLog.objects.create(
+            **make_log(
+                requested_at=current - datetime.timedelta(hours=index),
+                status_code=500 if index % 2 else 200,
+                view="app.views.V{}".format(index % 3),
+                **kwargs
+            )
+        )
+
+
+class ExportMixin:
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, "logs.csv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def export(self, *args):
+        out = StringIO()
+        call_command("export_tracking_logs", self.output, *args, stdout=out)
+        return out.getvalue()
+
+    def read_csv(self):
+        with open(self.output, newline="") as fp:
+            return list(csv.DictReader(fp))
+
+
+class TestExportCommand(ExportMixin, TestCase):
+    def test_csv(self):
+        create_logs(5)
+        output = self.export("--chunk-size", "2")
+        self.assertIn("Exported 5 log(s)", output)
+        rows = self.read_csv()
+        self.assertEqual(
+            [int(row["id"]) for row in rows],
+            list(ApiRequestLog.objects.order_by("pk").values_list("pk", flat=True)),
+        )
+        self.assertEqual(rows[0]["path"], "/logging/")
+        self.assertFalse(os.path.exists(self.output + ".checkpoint"))
+
+    def test_jsonl_with_filters_and_fields(self):
+        create_logs(6)
+        self.export(
+            "--format", "jsonl", "--status", "5xx", "--view", "app.views.V1",
+            "--fields", "view,status_code",
+        )
+        with open(self.output) as fp:
+            rows = [json.loads(line) for line in fp]
+        self.assertEqual(
+            rows, [{"id": rows[0]["id"], "view": "app.views.V1", "status_code": 500}]
+        )
+
+    def test_time_range(self):
+        create_logs(5)
+        since = (now() - datetime.timedelta(hours=2, minutes=30)).isoformat()
+        self.export("--since", since)
+        self.assertEqual(len(self.read_csv()), 3)
+
+    @override_settings(
+        DRF_TRACKING_COMPRESS_TEXT=True,
+        DRF_TRACKING_COMPRESS_MIN_LENGTH=10,
+        DRF_TRACKING_DEDUP_RESPONSES=True,
+        DRF_TRACKING_DEDUP_MIN_LENGTH=10,
+    )
+    def test_text_is_decompressed_and_blobs_inlined(self):
+        DatabaseBackend().write_many(
+            [make_log(response="x" * 50, errors="y" * 50) for _ in range(2)]
+        )
+        self.export()
+        rows = self.read_csv()
+        self.assertEqual([row["response"] for row in rows], ["x" * 50] * 2)
+        self.assertEqual(rows[0]["errors"], "y" * 50)
+
+    @override_settings(
+        DRF_TRACKING_DEDUP_RESPONSES=True, DRF_TRACKING_DEDUP_MIN_LENGTH=10
+    )
+    def test_blobs_inlined_without_digest_field(self):
+        DatabaseBackend().write_many([make_log(response="x" * 50) for _ in range(2)])
+        self.export("--format", "jsonl", "--fields", "path,response")
+        with open(self.output) as fp:
+            rows = [json.loads(line) for line in fp]
+        self.assertEqual(
+            [(set(row), row["response"]) for row in rows],
+            [({"id", "path", "response"}, "x" * 50)] * 2,
+        )
+
+    def test_resume_after_interruption(self):
+        create_logs(6)
+        write = CSVPart.write
+        calls = []
+
+        def failing_write(part, rows):
+            calls.append(len(rows))
+            if len(calls) == 2:
+                part.fp.write("partial garbage")
+                raise RuntimeError("disk gone")
+            return write(part, rows)
+
+        with mock.patch.object(CSVPart, "write", failing_write):
+            with self.assertRaises(RuntimeError):
+                self.export("--chunk-size", "2")
+        self.assertTrue(os.path.exists(self.output + ".checkpoint"))
+
+        with self.assertRaises(CommandError):
+            self.export("--chunk-size", "2")
+        with self.assertRaises(CommandError):
+            self.export("--chunk-size", "2", "--resume", "--status", "500")
+        self.export("--chunk-size", "2", "--resume")
+        rows = self.read_csv()
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(len({row["id"] for row in rows}), 6)
+        with self.assertRaises(CommandError):
+            self.export("--resume")
+
+    def test_resume_keeps_the_original_bounds(self):
+        create_logs(6)
+        write = CSVPart.write
+
+        def failing_write(part, rows):
+            if rows[-1][0] > self.pks()[1]:
+                raise RuntimeError("disk gone")
+            return write(part, rows)
+
+        with mock.patch.object(CSVPart, "write", failing_write):
+            with self.assertRaises(RuntimeError):
+                self.export("--chunk-size", "2")
+        # Logged after the export started, so it is not part of it.
+        create_logs(1)
+        output = self.export("--chunk-size", "2", "--resume")
+        self.assertIn("Exported 6 log(s)", output)
+        self.assertEqual([int(row["id"]) for row in self.read_csv()], self.pks()[:6])
+
+    def test_resume_before_first_chunk(self):
+        create_logs(3)
+        with mock.patch.object(CSVPart, "write", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.export()
+        self.export("--resume")
+        self.assertEqual(len(self.read_csv()), 3)
+
+    def test_empty_export(self):
+        self.export()
+        self.assertEqual(self.read_csv(), [])
+
+    def test_parquet_requires_pyarrow(self):
+        with mock.patch.dict("sys.modules", {"pyarrow": None, "pyarrow.parquet": None}):
+            with self.assertRaises(CommandError):
+                self.export("--format", "parquet")
+
+    @skipUnless(pyarrow, "pyarrow is not installed")
+    def test_parquet_resume_after_interruption(self):
+        create_logs(6)
+        self.output = os.path.join(self.directory.name, "logs")
+        write = ParquetPart.write
+        calls = []
+
+        def failing_write(part, rows):
+            calls.append(len(rows))
+            if len(calls) == 2:
+                raise RuntimeError("disk gone")
+            return write(part, rows)
+
+        with mock.patch.object(ParquetPart, "write", failing_write):
+            with self.assertRaises(RuntimeError):
+                self.export("--format", "parquet", "--chunk-size", "2")
+        self.assertEqual(len(os.listdir(self.output)), 2)
+
+        with self.assertRaises(CommandError):
+            self.export("--format", "parquet", "--chunk-size", "2")
+        output = self.export("--format", "parquet", "--chunk-size", "2", "--resume")
+        self.assertIn("Exported 6 log(s)", output)
+        self.assertEqual(
+            sorted(os.listdir(self.output)),
+            ["part-{:012d}.parquet".format(pk) for pk in self.pks()[::2]],
+        )
+        table = pyarrow.parquet.read_table(self.output)
+        self.assertEqual(sorted(table.column("id").to_pylist()), self.pks())
+        self.assertEqual(set(table.column("path").to_pylist()), {"/logging/"})
+        self.assertEqual(
+            sorted(table.column("status_code").to_pylist()), [200] * 3 + [500] * 3
+        )
+
+    def pks(self):
+        return list(ApiRequestLog.objects.order_by("pk").values_list("pk", flat=True))
+
+    def test_invalid_options(self):
+        with self.assertRaises(CommandError):
+            self.export("--fields", "nope")
+        with self.assertRaises(CommandError):
+            self.export("--status", "5x")
+
+
+class TestParallelExport(ExportMixin, TransactionTestCase):
+    def test_workers_cover_disjoint_ranges(self):
+        create_logs(11)
+        self.export("--workers", "3", "--chunk-size", "2")
+        rows = self.read_csv()
+        self.assertEqual(
+            [int(row["id"]) for row in rows],
+            list(ApiRequestLog.objects.order_by("pk").values_list("pk", flat=True)),
+        )
+        self.assertEqual(os.listdir(self.directory.name), ["logs.csv"])
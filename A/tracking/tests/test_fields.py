@@ -0,0 +1,67 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from tracking.fields import compress_text, decompress_text, is_compressed
+from tracking.models import ApiRequestLog
+
+from .utils import make_log
+
+BODY = '{"results": [%s]}' % ", ".join(['{"id": 1, "name": "item"}'] * 100)
+
+
+class TestCompression(SimpleTestCase):
+    def test_round_trip(self):
+        compressed = compress_text(BODY)
+        self.assertTrue(is_compressed(compressed))
+        self.assertLess(len(compressed), len(BODY) / 5)
+        self.assertEqual(decompress_text(compressed), BODY)
+
+    def test_plain_text_passes_through(self):
+        self.assertEqual(decompress_text("plain"), "plain")
+        self.assertIsNone(decompress_text(None))
+
+
+@override_settings(DRF_TRACKING_COMPRESS_TEXT=True)
+class TestCompressedTextField(TestCase):
+    def stored(self, log, field="response"):
+        return ApiRequestLog.objects.values_list(field, flat=True).get(pk=log.pk)
+
+    def test_large_values_stored_compressed(self):
+        log = ApiRequestLog.objects.create(**make_log(response=BODY, errors="short"))
+        self.assertTrue(is_compressed(self.stored(log)))
+        self.assertEqual(self.stored(log, "errors"), "short")
+        self.assertEqual(ApiRequestLog.objects.get(pk=log.pk).response, BODY)
+
+    def test_decompressed_lazily(self):
+        log = ApiRequestLog.objects.create(**make_log(response=BODY))
+        log = ApiRequestLog.objects.get(pk=log.pk)
+        self.assertTrue(is_compressed(log.__dict__["response"]))
+        self.assertEqual(log.response, BODY)
+        self.assertEqual(log.__dict__["response"], BODY)
+
+    def test_deferred_field(self):
+        log = ApiRequestLog.objects.create(**make_log(response=BODY))
+        log = ApiRequestLog.objects.defer("response").get(pk=log.pk)
+        self.assertEqual(log.response, BODY)
+
+    def test_legacy_rows_readable(self):
+        with override_settings(DRF_TRACKING_COMPRESS_TEXT=False):
+            log = ApiRequestLog.objects.create(**make_log(response=BODY))
+        self.assertEqual(self.stored(log), BODY)
+        self.assertEqual(ApiRequestLog.objects.get(pk=log.pk).response, BODY)
+
+    def test_compress_command(self):
+        with override_settings(DRF_TRACKING_COMPRESS_TEXT=False):
+            logs = [ApiRequestLog.objects.create(**make_log(response=BODY)) for _ in range(3)]
+        call_command("compress_tracking_logs", "--batch-size", "2", stdout=StringIO())
+        for log in logs:
+            self.assertTrue(is_compressed(self.stored(log)))
+            self.assertEqual(ApiRequestLog.objects.get(pk=log.pk).response, BODY)
+
+    def test_decompress_command(self):
+        log = ApiRequestLog.objects.create(**make_log(response=BODY))
+        with override_settings(DRF_TRACKING_COMPRESS_TEXT=False):
+            call_command("compress_tracking_logs", "--decompress", stdout=StringIO())
+        self.assertEqual(self.stored(log), BODY)
@@ -0,0 +1,93 @@
+from django.test import TestCase, override_settings
+
+from tracking.ip import IPResolver, ProxyNetworks, normalize_address, parse_forwarded
+from tracking.models import ApiRequestLog
+
+PROXIES = ("10.0.0.0/8", "192.168.1.1", "2001:db8::/32")
+
+
+class TestNormalizeAddress(TestCase):
+    def test_forms(self):
+        self.assertEqual(normalize_address("127.0.0.1"), "127.0.0.1")
+        self.assertEqual(normalize_address(" 127.0.0.1:8080"), "127.0.0.1")
+        self.assertEqual(normalize_address('"[2001:DB8::1]:4711"'), "2001:db8::1")
+        self.assertEqual(normalize_address("::1"), "::1")
+        self.assertIsNone(normalize_address("unknown"))
+        self.assertIsNone(normalize_address("_hidden"))
+
+    def test_cached(self):
+        normalize_address.cache_clear()
+        normalize_address("10.1.2.3")
+        normalize_address("10.1.2.3")
+        self.assertEqual(normalize_address.cache_info().hits, 1)
+
+
+class TestProxyNetworks(TestCase):
+    def test_membership(self):
+        networks = ProxyNetworks(PROXIES)
+        self.assertIn("10.20.30.40", networks)
+        self.assertIn("192.168.1.1", networks)
+        self.assertNotIn("192.168.1.2", networks)
+        self.assertIn("2001:db8:ffff::1", networks)
+        self.assertNotIn("2001:db9::1", networks)
+        self.assertIn("::ffff:10.0.0.1", networks)
+        self.assertFalse(ProxyNetworks(()))
+
+
+class TestIPResolver(TestCase):
+    def setUp(self):
+        self.resolver = IPResolver(PROXIES)
+
+    def resolve(self, remote_addr, **headers):
+        return self.resolver.resolve(dict(headers, REMOTE_ADDR=remote_addr))
+
+    def test_untrusted_peer_ignores_headers(self):
+        self.assertEqual(
+            self.resolve("203.0.113.9", HTTP_X_FORWARDED_FOR="1.2.3.4"), "203.0.113.9"
+        )
+
+    def test_walks_chain_from_the_right(self):
+        self.assertEqual(
+            self.resolve(
+                "10.0.0.1", HTTP_X_FORWARDED_FOR="6.6.6.6, 198.51.100.7, 192.168.1.1"
+            ),
+            "198.51.100.7",
+        )
+
+    def test_all_trusted_returns_leftmost(self):
+        self.assertEqual(
+            self.resolve("10.0.0.1", HTTP_X_FORWARDED_FOR="10.0.0.3, 10.0.0.2"),
+            "10.0.0.3",
+        )
+
+    def test_invalid_hop_stops_walk(self):
+        self.assertEqual(
+            self.resolve("10.0.0.1", HTTP_X_FORWARDED_FOR="1.2.3.4, garbage, 10.0.0.2"),
+            "10.0.0.2",
+        )
+
+    def test_forwarded_header(self):
+        header = 'for=192.0.2.60;proto=http;by=10.0.0.1, for="[2001:db8::7]:4711"'
+        self.assertEqual(parse_forwarded(header), ["192.0.2.60", '"[2001:db8::7]:4711"'])
+        self.assertEqual(
+            self.resolve("10.0.0.1", HTTP_FORWARDED=header, HTTP_X_FORWARDED_FOR="9.9.9.9"),
+            "192.0.2.60",
+        )
+
+    def test_no_trusted_proxies_keeps_first_forwarded_entry(self):
+        resolver = IPResolver()
+        self.assertEqual(
+            resolver.resolve(
+                {"REMOTE_ADDR": "10.0.0.1", "HTTP_X_FORWARDED_FOR": "1.2.3.4, 5.6.7.8"}
+            ),
+            "1.2.3.4",
+        )
+
+
+@override_settings(ROOT_URLCONF="tracking.tests.urls", DRF_TRACKING_TRUSTED_PROXIES=PROXIES)
+class TestTrustedProxySetting(TestCase):
+    def test_logged_address(self):
+        self.client.get(
+            "/logging/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="6.6.6.6, 198.51.100.7"
+        )
+        self.assertEqual(ApiRequestLog.objects.get().remote_addr, "198.51.100.7")
@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from tracking import metrics
+from tracking.models import ApiRequestLog
+from tracking.writers import BufferedLogWriter
+
+from .utils import make_log
+
+
+@override_settings(
+    ROOT_URLCONF="tracking.tests.urls",
+    DRF_TRACKING_METRICS=True,
+    DRF_TRACKING_METRICS_ALLOWED_NETWORKS=["127.0.0.0/8"],
+)
+class TestMetrics(TestCase):
+    def setUp(self):
+        metrics.registry.clear()
+
+    def tearDown(self):
+        metrics.registry.clear()
+
+    def scrape(self):
+        response = self.client.get("/metrics/")
+        self.assertEqual(response["Content-Type"], metrics.CONTENT_TYPE)
+        return response.content.decode()
+
+    def test_requests_and_latency_are_counted(self):
+        self.client.get("/logging/")
+        self.client.get("/logging/")
+        self.client.get("/404-logging/")
+        output = self.scrape()
+        self.assertIn(
+            'drf_tracking_requests_total{view="tracking.tests.views.MockLoggingView",'
+            'method="GET",status_class="2xx"} 2',
+            output,
+        )
+        self.assertIn(
+            'drf_tracking_response_ms_count{'
+            'view="tracking.tests.views.MockLoggingView",method="GET"} 2',
+            output,
+        )
+        self.assertIn(
+            'drf_tracking_response_ms_bucket{'
+            'view="tracking.tests.views.MockLoggingView",method="GET",le="+Inf"} 2',
+            output,
+        )
+        self.assertIn("drf_tracking_pipeline_seconds_count 2", output)
+        self.assertIn("# TYPE drf_tracking_response_ms histogram", output)
+
+    @override_settings(DRF_TRACKING_SAMPLERS={"/logging/": 0.5})
+    @mock.patch("tracking.sampling.random.random", return_value=0.99)
+    def test_requests_are_counted_before_sampling(self, mock_random):
+        self.client.get("/logging/")
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+        self.assertIn(
+            'drf_tracking_requests_total{view="tracking.tests.views.MockLoggingView",'
+            'method="GET",status_class="2xx"} 1',
+            self.scrape(),
+        )
+
+    @mock.patch("tracking.models.ApiRequestLog.save", side_effect=Exception("db failure"))
+    def test_handle_log_failures_are_counted(self, mock_save):
+        self.client.get("/logging/")
+        self.assertIn("drf_tracking_handle_log_failures_total 1", self.scrape())
+
+    @mock.patch.object(BufferedLogWriter, "_ensure_started")
+    def test_dropped_logs_are_counted(self, mock_start):
+        writer = BufferedLogWriter(max_size=1, full_policy="drop")
+        writer.put(make_log())
+        writer.put(make_log())
+        self.assertIn("drf_tracking_dropped_logs_total 1", self.scrape())
+
+    @override_settings(DRF_TRACKING_METRICS=False)
+    def test_disabled(self):
+        self.client.get("/logging/")
+        self.assertEqual(self.client.get("/metrics/").status_code, 404)
+
+    @override_settings(DRF_TRACKING_METRICS_ALLOWED_NETWORKS=["10.0.0.0/8"])
+    def test_access(self):
+        self.assertEqual(self.client.get("/metrics/").status_code, 403)
+        self.assertEqual(
+            self.client.get("/metrics/", REMOTE_ADDR="10.1.2.3").status_code, 200
+        )
+        # Without trusted proxies a forwarded address is not believed.
+        response = self.client.get("/metrics/", HTTP_X_FORWARDED_FOR="10.1.2.3")
+        self.assertEqual(response.status_code, 403)
+        with override_settings(DRF_TRACKING_TRUSTED_PROXIES=["127.0.0.1"]):
+            response = self.client.get("/metrics/", HTTP_X_FORWARDED_FOR="10.1.2.3")
+        self.assertEqual(response.status_code, 200)
+        staff = User.objects.create(username="staff", is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get("/metrics/").status_code, 200)
+
+    def test_aggregates_across_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(DRF_TRACKING_METRICS_DIR=directory):
+                other = metrics.MetricsRegistry()
+                other.inc("drf_tracking_dropped_logs_total", value=3)
+                other.observe("drf_tracking_pipeline_seconds", 0.002)
+                with open(os.path.join(directory, "1.json"), "w") as fp:
+                    json.dump(other.snapshot(), fp)
+
+                self.client.get("/logging/")
+                metrics.record_dropped()
+                output = self.scrape()
+        self.assertIn("drf_tracking_dropped_logs_total 4", output)
+        self.assertIn("drf_tracking_pipeline_seconds_count 2", output)
+        # The live request's duration varies, only the +Inf bucket is certain.
+        self.assertIn('drf_tracking_pipeline_seconds_bucket{le="+Inf"} 2', output)
+
+    def test_own_file_is_not_counted_twice(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(
+                DRF_TRACKING_METRICS_DIR=directory, DRF_TRACKING_METRICS_FLUSH_INTERVAL=0
+            ):
+                self.client.get("/logging/")
+                self.assertTrue(
+                    os.path.exists(os.path.join(directory, "{}.json".format(os.getpid())))
+                )
+                output = self.scrape()
+        self.assertIn("drf_tracking_pipeline_seconds_count 1", output)
+
+    def test_label_values_are_escaped(self):
+        metrics.registry.inc("drf_tracking_requests_total", (("view", 'a"b\\c'),))
+        self.assertIn('drf_tracking_requests_total{view="a\\"b\\\\c"} 1', self.scrape())
@@ -0,0 +1,62 @@
+import ast
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from tracking.models import ApiRequestLog
+
+MIDDLEWARE = settings.MIDDLEWARE + ["tracking.middleware.RequestTrackingMiddleware"]
+
+
+@override_settings(
+    ROOT_URLCONF="tracking.tests.urls",
+    MIDDLEWARE=MIDDLEWARE,
+    DRF_TRACKING_MIDDLEWARE_EXCLUDE=[r"^/health/"],
+)
+class TestRequestTrackingMiddleware(TestCase):
+    def test_plain_view_logged(self):
+        self.client.get("/plain/", {"api": "1", "a": "2"}, REMOTE_ADDR="127.0.0.9")
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(log.path, "/plain/")
+        self.assertEqual(log.view, "tracking.tests.views.mock_plain_view")
+        self.assertEqual(log.view_method, "get")
+        self.assertEqual(log.remote_addr, "127.0.0.9")
+        self.assertEqual(log.status_code, 200)
+        self.assertEqual(ast.literal_eval(log.query_params), {"api": "******", "a": "2"})
+
+    def test_request_body_captured(self):
+        self.client.post(
+            "/plain/",
+            "password=secret&a=b",
+            content_type="application/x-www-form-urlencoded",
+        )
+        self.client.post("/plain/", {"token": "secret"}, content_type="application/json")
+        data = [ast.literal_eval(log.data) for log in ApiRequestLog.objects.order_by("id")]
+        self.assertEqual(data, [{"password": "******", "a": "b"}, {"token": "******"}])
+
+    def test_unread_upload_not_parsed(self):
+        self.client.post("/plain/", {"a": "b"})
+        self.assertEqual(ApiRequestLog.objects.get().data, "")
+
+    def test_excluded_path_not_logged(self):
+        self.client.get("/health/")
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+
+    def test_mixin_views_logged_once(self):
+        self.client.get("/logging/")
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(log.view, "tracking.tests.views.MockLoggingView")
+
+    def test_exception_logged(self):
+        self.client.raise_request_exception = False
+        response = self.client.get("/plain-error/")
+        self.assertEqual(response.status_code, 500)
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(log.status_code, 500)
+        self.assertIn("plain failure", log.errors)
+
+    @override_settings(DRF_TRACKING_MIDDLEWARE_INCLUDE=[r"^/health/", r"^/plain/$"])
+    def test_include_patterns(self):
+        self.client.get("/plain/")
+        self.client.get("/health/")
+        self.assertEqual(ApiRequestLog.objects.count(), 1)
@@ -1,5 +1,5 @@
 import ast
-import datetime
+import itertools
 from unittest import mock
 
 from django.contrib.auth.models import User
@@ -151,14 +151,14 @@ class TestLoggingMixin(APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(ApiRequestLog.objects.all().count(), 0)
 
-    @override_settings(USE_TZ=False)
-    @mock.patch("tracking.base_mixins.now")
-    def test_log_doesnt_fail_with_negative_response_ms(self, mock_now):
-        mock_now.side_effect = [
-            datetime.datetime(2019, 1, 1, 10, 0, 10),
-            datetime.datetime(2019, 1, 1, 10, 0, 0),
-        ]
+    @mock.patch("tracking.base_mixins.time.perf_counter_ns")
+    def test_log_doesnt_fail_with_negative_response_ms(self, mock_counter):
+        # The request starts later than every reading taken after it.
+        mock_counter.side_effect = itertools.chain(
+            [20_000_000], itertools.repeat(10_000_000)
+        )
         response = self.client.get("/logging/")
         log = ApiRequestLog.objects.first()
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(log.response_us, 0)
         self.assertEqual(log.response_ms, 0)
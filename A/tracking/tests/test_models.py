@@ -0,0 +1,31 @@
+import datetime
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from tracking.models import ApiRequestLog
+
+from .utils import make_log
+
+
+class TestApiRequestLog(TestCase):
+    def test_requested_at_keeps_time(self):
+        requested_at = now().replace(hour=13, minute=37, second=5, microsecond=42)
+        log = ApiRequestLog.objects.create(**make_log(requested_at=requested_at))
+        log.refresh_from_db()
+        self.assertEqual(log.requested_at, requested_at)
+
+    def test_filter_by_recent_window(self):
+        current = now()
+        ApiRequestLog.objects.create(**make_log(requested_at=current))
+        ApiRequestLog.objects.create(
+            **make_log(requested_at=current - datetime.timedelta(hours=1))
+        )
+        recent = ApiRequestLog.objects.filter(
+            requested_at__gte=current - datetime.timedelta(minutes=15)
+        )
+        self.assertEqual(recent.count(), 1)
+
+    def test_str(self):
+        log = ApiRequestLog(**make_log())
+        self.assertEqual(str(log), "GET /logging/")
@@ -0,0 +1,145 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from tracking.backends import DatabaseBackend
+from tracking.models import ApiRequestLog, ResponseBlob
+from tracking.partitions import (
+    PartitionedLogs,
+    drop_partitions,
+    get_partition_model,
+    list_partitions,
+    partition_bounds,
+    partition_key,
+)
+
+from .utils import make_log
+
+UTC = datetime.timezone.utc
+
+
+def at(*args):
+    return datetime.datetime(*args, tzinfo=UTC)
+
+
+class TestPartitionKeys(TestCase):
+    def test_keys(self):
+        self.assertEqual(partition_key(at(2024, 3, 5, 23), "day"), "20240305")
+        self.assertEqual(partition_key(at(2024, 3, 5, 23), "month"), "202403")
+        plus_five = datetime.timezone(datetime.timedelta(hours=5))
+        local = at(2024, 3, 1, 1).astimezone(plus_five)
+        self.assertEqual(partition_key(local, "day"), "20240301")
+
+    def test_bounds(self):
+        self.assertEqual(
+            partition_bounds("20240229"), (at(2024, 2, 29), at(2024, 3, 1))
+        )
+        self.assertEqual(partition_bounds("202412"), (at(2024, 12, 1), at(2025, 1, 1)))
+
+    def test_unknown_period(self):
+        with self.assertRaises(ImproperlyConfigured):
+            partition_key(at(2024, 3, 5), "week")
+
+
+@override_settings(DRF_TRACKING_PARTITION="day")
+class TestPartitionedStorage(TestCase):
+    def setUp(self):
+        DatabaseBackend().write_many(
+            [
+                make_log(requested_at=at(2024, 3, 1, 12), status_code=200),
+                make_log(requested_at=at(2024, 3, 1, 13), status_code=500),
+                make_log(requested_at=at(2024, 3, 2, 9), status_code=200),
+            ]
+        )
+        DatabaseBackend().write(
+            make_log(requested_at=at(2024, 3, 4, 9), status_code=200)
+        )
+
+    def test_writes_go_to_partitions(self):
+        self.assertEqual(list_partitions(), ["20240301", "20240302", "20240304"])
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+        self.assertEqual(get_partition_model("20240301").objects.count(), 2)
+        self.assertIn(
+            "tracking_apirequestlog_p20240302", connection.introspection.table_names()
+        )
+
+    def test_query_fans_out_to_overlapping_partitions(self):
+        logs = PartitionedLogs(since=at(2024, 3, 1, 13), until=at(2024, 3, 3))
+        self.assertEqual(logs.partitions(), ["20240301", "20240302"])
+        self.assertEqual(logs.count(), 2)
+        self.assertEqual(
+            [log.requested_at for log in logs], [at(2024, 3, 1, 13), at(2024, 3, 2, 9)]
+        )
+        self.assertEqual(PartitionedLogs().filter(status_code=200).count(), 3)
+
+    def test_drop_partitions(self):
+        cutoff = at(2024, 3, 2, 12)
+        self.assertEqual(drop_partitions(cutoff, dry_run=True), ["20240301"])
+        self.assertEqual(drop_partitions(cutoff), ["20240301"])
+        self.assertEqual(list_partitions(), ["20240302", "20240304"])
+        self.assertEqual(PartitionedLogs().count(), 2)
+
+    def test_purge_command_drops_expired_partitions(self):
+        out = StringIO()
+        call_command("purge_tracking_logs", "--days", "1", stdout=out)
+        self.assertIn(
+            "Dropped partition(s) 20240301, 20240302, 20240304.", out.getvalue()
+        )
+        self.assertEqual(list_partitions(), [])
+
+    def test_new_partition_after_drop(self):
+        drop_partitions(at(2024, 3, 5))
+        DatabaseBackend().write(make_log(requested_at=at(2024, 3, 4, 10)))
+        self.assertEqual(PartitionedLogs().count(), 1)
+
+
+@override_settings(
+    DRF_TRACKING_PARTITION="month",
+    DRF_TRACKING_DEDUP_RESPONSES=True,
+    DRF_TRACKING_DEDUP_MIN_LENGTH=10,
+)
+class TestPartitionedDedup(TestCase):
+    def test_drop_releases_blobs(self):
+        body = "x" * 100
+        DatabaseBackend().write_many(
+            [
+                make_log(requested_at=at(2024, 1, 10), response=body),
+                make_log(requested_at=at(2024, 2, 10), response=body),
+            ]
+        )
+        self.assertEqual(ResponseBlob.objects.get().ref_count, 2)
+        self.assertEqual(drop_partitions(at(2024, 2, 1)), ["202401"])
+        self.assertEqual(ResponseBlob.objects.get().ref_count, 1)
+        drop_partitions(at(2024, 3, 1))
+        self.assertFalse(ResponseBlob.objects.exists())
+
+
+@override_settings(DRF_TRACKING_PARTITION="day")
+class TestUnpartitionedReaders(TestCase):
+    def test_readers_refuse_partitions(self):
+        staff = User.objects.create_superuser("admin", password="pass")
+        self.client.force_login(staff)
+        with self.assertRaises(ImproperlyConfigured):
+            self.client.get("/admin/tracking/apirequestlog/")
+        with override_settings(ROOT_URLCONF="tracking.tests.urls"):
+            with self.assertRaises(ImproperlyConfigured):
+                self.client.get("/logs/")
+        for command in (
+            "export_tracking_logs",
+            "rollup_tracking_logs",
+            "rebuild_tracking_search_index",
+        ):
+            args = ["-"] if command == "export_tracking_logs" else []
+            with self.assertRaises(CommandError):
+                call_command(command, *args, stdout=StringIO())
+
+    @override_settings(DRF_TRACKING_SEARCH_INDEX=True)
+    def test_search_index_refuses_partitions(self):
+        with self.assertRaises(ImproperlyConfigured):
+            DatabaseBackend().write(make_log())
+        self.assertEqual(list_partitions(), [])
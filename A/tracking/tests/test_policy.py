@@ -0,0 +1,49 @@
+from django.test import TestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.viewsets import ViewSet
+
+from tracking.mixins import LoggingMixin
+from tracking.models import ApiRequestLog
+from tracking.policy import get_policy
+
+from .views import MockExplicitLoggingView, MockLoggingView
+
+
+class MockLoggingViewSet(LoggingMixin, ViewSet):
+    def list(self, request):
+        return Response([])
+
+
+class TestLoggingPolicy(TestCase):
+    def test_policy_is_cached_per_class(self):
+        first = get_policy(MockLoggingView())
+        self.assertIs(get_policy(MockLoggingView()), first)
+        self.assertIsNot(get_policy(MockExplicitLoggingView()), first)
+
+    def test_policy_is_compiled(self):
+        policy = get_policy(MockExplicitLoggingView())
+        self.assertEqual(policy.methods, frozenset(["POST"]))
+        self.assertEqual(policy.view_name, "tracking.tests.views.MockExplicitLoggingView")
+        self.assertIn("get", policy.handlers)
+        self.assertIsNone(get_policy(MockLoggingView()).methods)
+
+    def test_setting_change_invalidates_policy(self):
+        first = get_policy(MockLoggingView())
+        with override_settings(DRF_TRACKING_CAPTURE_MODE="headers"):
+            policy = get_policy(MockLoggingView())
+            self.assertIsNot(policy, first)
+            self.assertEqual(policy.capture_mode, "headers")
+        self.assertEqual(get_policy(MockLoggingView()).capture_mode, "full")
+
+    def test_instance_overrides_are_not_cached(self):
+        view = MockLoggingView(capture_mode="headers")
+        self.assertEqual(get_policy(view).capture_mode, "headers")
+        self.assertEqual(get_policy(MockLoggingView()).capture_mode, "full")
+
+    def test_viewset_view_name(self):
+        view = MockLoggingViewSet.as_view({"get": "list"})
+        view(APIRequestFactory().get("/viewset/")).render()
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(log.view, "tracking.tests.test_policy.MockLoggingViewSet")
+        self.assertEqual(log.view_method, "list")
@@ -0,0 +1,46 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from tracking.models import ApiRequestLog
+
+from .utils import make_log
+
+
+class TestPurgeCommand(TestCase):
+    def setUp(self):
+        current = now()
+        for days in (1, 10, 20, 30, 40):
+            ApiRequestLog.objects.create(
+                **make_log(requested_at=current - datetime.timedelta(days=days))
+            )
+
+    def purge(self, *args):
+        out = StringIO()
+        call_command("purge_tracking_logs", *args, stdout=out)
+        return out.getvalue()
+
+    @mock.patch("tracking.management.commands.purge_tracking_logs.time.sleep")
+    def test_purge_in_batches(self, mock_sleep):
+        output = self.purge("--days", "15", "--batch-size", "1")
+        self.assertIn("Deleted 3 log(s)", output)
+        self.assertEqual(ApiRequestLog.objects.count(), 2)
+        self.assertEqual(mock_sleep.call_count, 3)
+
+    @override_settings(DRF_TRACKING_RETENTION_DAYS=35)
+    def test_purge_uses_setting(self):
+        self.purge()
+        self.assertEqual(ApiRequestLog.objects.count(), 4)
+
+    def test_dry_run(self):
+        output = self.purge("--days", "15", "--dry-run")
+        self.assertIn("3 log(s) would be deleted", output)
+        self.assertEqual(ApiRequestLog.objects.count(), 5)
+
+    def test_requires_retention(self):
+        with self.assertRaises(CommandError):
+            self.purge()
@@ -0,0 +1,76 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from tracking.models import ApiRequestLog, ApiRequestRollup
+from tracking.rollups import latency_bin, latency_summary, record_logs
+
+from .utils import make_log
+
+
+def rollup_log(response_ms, status_code=200, view="app.views.Hot", **kwargs):
+    return make_log(
+        response_ms=response_ms, status_code=status_code, view=view, **kwargs
+    )
+
+
+class TestRollups(TestCase):
+    def setUp(self):
+        self.since = now() - datetime.timedelta(hours=1)
+
+    def test_latency_bin(self):
+        self.assertEqual(latency_bin(0), 0)
+        self.assertEqual(latency_bin(5), 0)
+        self.assertEqual(latency_bin(6), 1)
+        self.assertEqual(latency_bin(50000), 11)
+
+    def test_incremental_updates(self):
+        requested_at = now()
+        record_logs(
+            [rollup_log(3, requested_at=requested_at), rollup_log(4, requested_at=requested_at)]
+        )
+        record_logs([rollup_log(4, requested_at=requested_at)])
+        row = ApiRequestRollup.objects.get(granularity="minute")
+        self.assertEqual(row.count, 3)
+        self.assertEqual(row.sum_ms, 11)
+        self.assertEqual(ApiRequestRollup.objects.count(), 2)
+
+    def test_summary_percentiles(self):
+        record_logs([rollup_log(8) for _ in range(90)])
+        record_logs([rollup_log(800) for _ in range(10)])
+        summary = latency_summary(self.since)[None]
+        self.assertEqual(summary["count"], 100)
+        self.assertAlmostEqual(summary["mean_ms"], 87.2)
+        self.assertTrue(5 < summary["p50"] <= 10)
+        self.assertTrue(500 < summary["p95"] <= 1000)
+
+    def test_summary_grouped_with_status_classes(self):
+        record_logs([rollup_log(10), rollup_log(10, status_code=500)])
+        record_logs([rollup_log(10, view="app.views.Cold")])
+        summary = latency_summary(self.since, granularity="hour", group_by="view")
+        self.assertEqual(summary["app.views.Hot"]["status_classes"], {2: 1, 5: 1})
+        self.assertEqual(summary["app.views.Cold"]["count"], 1)
+
+    def test_sample_weight(self):
+        record_logs([rollup_log(10, sample_weight=4)])
+        self.assertEqual(latency_summary(self.since)[None]["count"], 4)
+
+    def test_rebuild_command(self):
+        for response_ms in (10, 20, 2000):
+            ApiRequestLog.objects.create(**rollup_log(response_ms))
+        record_logs([rollup_log(10)])
+        call_command("rollup_tracking_logs", stdout=StringIO())
+        self.assertEqual(latency_summary(self.since)[None]["count"], 3)
+        self.assertEqual(latency_summary(self.since, granularity="hour")[None]["count"], 3)
+
+
+@override_settings(ROOT_URLCONF="tracking.tests.urls", DRF_TRACKING_ROLLUPS=True)
+class TestRollupLogging(TestCase):
+    def test_logging_updates_rollups(self):
+        self.client.get("/logging/")
+        self.client.get("/logging/")
+        summary = latency_summary(now() - datetime.timedelta(minutes=5), group_by="view")
+        self.assertEqual(summary["tracking.tests.views.MockLoggingView"]["count"], 2)
@@ -0,0 +1,106 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from tracking.backends import DatabaseBackend
+from tracking.models import ApiRequestLog
+from tracking.routers import TrackingRouter, configure_connection
+
+from .utils import make_log
+
+routed = override_settings(
+    DATABASE_ROUTERS=["tracking.routers.TrackingRouter"],
+    DRF_TRACKING_DATABASE="tracking",
+)
+
+
+class TestTrackingRouter(TestCase):
+    def test_no_opinion_without_setting(self):
+        router = TrackingRouter()
+        self.assertIsNone(router.db_for_write(ApiRequestLog))
+        self.assertIsNone(router.allow_migrate("default", "tracking"))
+
+    @override_settings(DRF_TRACKING_DATABASE="tracking")
+    def test_routes_tracking_models_only(self):
+        router = TrackingRouter()
+        self.assertEqual(router.db_for_read(ApiRequestLog), "tracking")
+        self.assertEqual(router.db_for_write(ApiRequestLog), "tracking")
+        self.assertIsNone(router.db_for_write(User))
+
+    @override_settings(DRF_TRACKING_DATABASE="tracking")
+    def test_allow_migrate(self):
+        router = TrackingRouter()
+        self.assertTrue(router.allow_migrate("tracking", "tracking"))
+        self.assertFalse(router.allow_migrate("default", "tracking"))
+        self.assertFalse(router.allow_migrate("tracking", "auth"))
+        self.assertIsNone(router.allow_migrate("default", "auth"))
+
+
+class TestMigrations(TransactionTestCase):
+    def test_user_constraint_is_dropped(self):
+        # 0001 shipped with a constraint to the user table, 0012 drops it
+        # so logs can live in a database without the auth tables.
+        out = StringIO()
+        call_command("sqlmigrate", "tracking", "0012", stdout=out)
+        self.assertIn('CREATE TABLE "new__tracking_apirequestlog"', out.getvalue())
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, ApiRequestLog._meta.db_table
+            )
+        self.assertNotIn(
+            (User._meta.db_table, "id"),
+            [info["foreign_key"] for info in constraints.values()],
+        )
+
+
+@routed
+class TestRoutedStorage(TestCase):
+    databases = {"default", "tracking"}
+
+    def test_logs_are_written_to_tracking_database(self):
+        DatabaseBackend().write_many([make_log(), make_log()])
+        DatabaseBackend().write(make_log())
+        self.assertEqual(ApiRequestLog.objects.count(), 3)
+        self.assertEqual(ApiRequestLog.objects.using("tracking").count(), 3)
+        self.assertEqual(ApiRequestLog.objects.using("default").count(), 0)
+
+    def test_explicit_alias(self):
+        DatabaseBackend(using="default").write_many([make_log()])
+        self.assertEqual(ApiRequestLog.objects.using("default").count(), 1)
+        self.assertEqual(ApiRequestLog.objects.using("tracking").count(), 0)
+
+    def test_deleting_user_clears_logs_in_other_database(self):
+        user = User.objects.create(username="alice")
+        DatabaseBackend().write(make_log(user=user, username_persistent="alice"))
+        user.delete()
+        log = ApiRequestLog.objects.get()
+        self.assertIsNone(log.user_id)
+        self.assertEqual(log.username_persistent, "alice")
+
+    def test_purge_runs_on_tracking_database(self):
+        DatabaseBackend().write(make_log())
+        call_command("purge_tracking_logs", days=-1, sleep=0, stdout=mock.Mock())
+        self.assertEqual(ApiRequestLog.objects.using("tracking").count(), 0)
+
+
+class TestConfigureConnection(TestCase):
+    databases = {"default", "tracking"}
+
+    def test_pragmas_applied_to_tracking_alias_only(self):
+        connection = connections["tracking"]
+        with override_settings(
+            DRF_TRACKING_DATABASE="tracking",
+            DRF_TRACKING_SQLITE_PRAGMAS={"cache_size": -4000},
+        ):
+            configure_connection(sender=None, connection=connection)
+            configure_connection(sender=None, connection=connections["default"])
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA cache_size")
+            self.assertEqual(cursor.fetchone()[0], -4000)
+        with connections["default"].cursor() as cursor:
+            cursor.execute("PRAGMA cache_size")
+            self.assertNotEqual(cursor.fetchone()[0], -4000)
@@ -0,0 +1,120 @@
+from unittest import mock
+
+from django.db.models import Sum
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from tracking.models import ApiRequestLog
+from tracking.sampling import FixedRateSampler, TokenBucketSampler, get_route_sampler
+
+
+class TestSamplers(SimpleTestCase):
+    @mock.patch("tracking.sampling.random.random")
+    def test_fixed_rate(self, mock_random):
+        sampler = FixedRateSampler(0.1)
+        mock_random.return_value = 0.05
+        self.assertEqual(sampler.sample(), 10)
+        mock_random.return_value = 0.5
+        self.assertIsNone(sampler.sample())
+
+    @mock.patch("tracking.sampling.random.random", return_value=0.0)
+    def test_zero_rate_drops_everything(self, mock_random):
+        self.assertIsNone(FixedRateSampler(0).sample())
+
+    def test_invalid_rate(self):
+        for rate in (-0.1, 1.5):
+            with self.assertRaises(ValueError):
+                FixedRateSampler(rate)
+        with self.assertRaises(ValueError):
+            TokenBucketSampler(0)
+
+    @mock.patch("tracking.sampling.time.monotonic")
+    def test_token_bucket_weights_skipped_requests(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        sampler = TokenBucketSampler(rate=1, burst=2)
+        self.assertEqual(sampler.sample(), 1)
+        self.assertEqual(sampler.sample(), 1)
+        self.assertIsNone(sampler.sample())
+        self.assertIsNone(sampler.sample())
+        mock_monotonic.return_value = 101.0
+        self.assertEqual(sampler.sample(), 3)
+
+    @override_settings(
+        DRF_TRACKING_SAMPLERS={
+            "/api/": 0.5,
+            "/api/hot/": 0.1,
+            "app.views.Hot": TokenBucketSampler(5),
+        }
+    )
+    def test_route_sampler(self):
+        self.assertEqual(get_route_sampler(None, "/api/hot/1").rate, 0.1)
+        self.assertEqual(get_route_sampler(None, "/api/x").rate, 0.5)
+        self.assertIsInstance(
+            get_route_sampler("app.views.Hot", "/other/"), TokenBucketSampler
+        )
+        self.assertIsNone(get_route_sampler(None, "/other/"))
+
+    @override_settings(DRF_TRACKING_SAMPLE_RATE=0.2)
+    def test_default_rate(self):
+        self.assertEqual(get_route_sampler(None, "/other/").rate, 0.2)
+
+
+@override_settings(ROOT_URLCONF="tracking.tests.urls")
+class TestSampledLogging(APITestCase):
+    @mock.patch("tracking.sampling.random.random", return_value=0.9)
+    def test_sampled_out(self, mock_random):
+        self.client.get("/sampled-logging/")
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+
+    @mock.patch("tracking.sampling.random.random", return_value=0.1)
+    def test_sample_weight_recorded(self, mock_random):
+        self.client.get("/sampled-logging/")
+        self.client.get("/sampled-logging/")
+        self.assertEqual(
+            ApiRequestLog.objects.aggregate(total=Sum("sample_weight"))["total"], 8
+        )
+
+    @mock.patch("tracking.sampling.random.random", return_value=0.9)
+    def test_errors_always_logged(self, mock_random):
+        self.client.post("/sampled-logging/")
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(log.sample_weight, 1)
+
+    @mock.patch("tracking.sampling.random.random")
+    def test_numeric_view_sampler(self, mock_random):
+        mock_random.return_value = 0.9
+        self.assertEqual(self.client.get("/rate-sampled-logging/").status_code, 200)
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+        mock_random.return_value = 0.1
+        self.client.get("/rate-sampled-logging/")
+        self.assertEqual(ApiRequestLog.objects.get().sample_weight, 2)
+
+    @override_settings(DRF_TRACKING_ALWAYS_LOG_SLOW_MS=0)
+    @mock.patch("tracking.sampling.random.random", return_value=0.9)
+    def test_slow_responses_always_logged(self, mock_random):
+        self.client.get("/sampled-logging/")
+        self.assertEqual(ApiRequestLog.objects.count(), 1)
+
+    @override_settings(DRF_TRACKING_SAMPLERS={"/logging/": 0.5})
+    @mock.patch("tracking.sampling.random.random", return_value=0.9)
+    def test_route_sampling(self, mock_random):
+        self.client.get("/logging/")
+        self.client.get("/explicit-logging/")
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+        self.client.post("/explicit-logging/")
+        self.assertEqual(ApiRequestLog.objects.count(), 1)
+
+    @override_settings(DRF_TRACKING_SAMPLE_RATE=0)
+    def test_zero_sample_rate(self):
+        response = self.client.get("/logging/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+
+    @override_settings(DRF_TRACKING_SAMPLERS={"/logging/": 0})
+    def test_zero_route_rate(self):
+        response = self.client.get("/logging/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+        self.client.get("/explicit-logging/")
+        self.client.post("/explicit-logging/")
+        self.assertEqual(ApiRequestLog.objects.count(), 1)
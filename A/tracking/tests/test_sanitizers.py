@@ -0,0 +1,90 @@
+import copy
+
+from django.test import SimpleTestCase, override_settings
+
+from tracking.benchmarks.sanitizer import legacy_clean_data, make_payload
+from tracking.policy import get_policy
+from tracking.sanitizers import Sanitizer
+
+from .views import MockLoggingView, MockSensitiveFieldsLoggingView
+
+SUB = "******"
+
+
+class TestSanitizer(SimpleTestCase):
+    def setUp(self):
+        self.sanitizer = Sanitizer({"mY_fIeLd"}, substitute=SUB)
+
+    def test_masks_default_and_custom_fields(self):
+        data = {"api": "1", "Password": "2", "my_field": "3", "detail": "4"}
+        self.assertEqual(
+            self.sanitizer.clean(data),
+            {"api": SUB, "Password": SUB, "my_field": SUB, "detail": "4"},
+        )
+
+    def test_does_not_mutate_input(self):
+        data = {"nested": {"token": "secret"}, "other": {"a": 1}}
+        original = copy.deepcopy(data)
+        cleaned = self.sanitizer.clean(data)
+        self.assertEqual(data, original)
+        self.assertEqual(cleaned["nested"], {"token": SUB})
+
+    def test_unchanged_containers_are_shared(self):
+        other = {"a": [1, 2]}
+        data = {"token": "secret", "other": other}
+        self.assertIs(self.sanitizer.clean(data)["other"], other)
+        clean = {"a": 1}
+        self.assertIs(self.sanitizer.clean(clean), clean)
+
+    def test_parses_literal_strings(self):
+        data = {"payload": "[{'token': 'x', 'a': 1}]", "number": "123", "text": "[oops"}
+        self.assertEqual(
+            self.sanitizer.clean(data),
+            {"payload": [{"token": SUB, "a": 1}], "number": "123", "text": "[oops"},
+        )
+
+    def test_decodes_bytes(self):
+        self.assertEqual(self.sanitizer.clean(b"abc"), "abc")
+        self.assertEqual(self.sanitizer.clean([b"abc", 1]), ["abc", 1])
+
+    def test_pattern_rules(self):
+        sanitizer = Sanitizer(patterns=[r"_secret$", r"^x-"], substitute=SUB)
+        data = {"client_secret": "1", "X-Auth": "2", "secretive": "3"}
+        self.assertEqual(
+            sanitizer.clean(data),
+            {"client_secret": SUB, "X-Auth": SUB, "secretive": "3"},
+        )
+
+    def test_deep_structures(self):
+        data = leaf = {}
+        for _ in range(5000):
+            leaf["child"] = {}
+            leaf = leaf["child"]
+        leaf["token"] = "secret"
+        cleaned = self.sanitizer.clean(data)
+        for _ in range(5000):
+            cleaned = cleaned["child"]
+        self.assertEqual(cleaned, {"token": SUB})
+
+    def test_matches_legacy_implementation(self):
+        payload = make_payload(items=5, depth=2)
+        payload["encoded"] = str(make_payload(items=1, depth=1))
+        self.assertEqual(
+            self.sanitizer.clean(payload), legacy_clean_data(copy.deepcopy(payload))
+        )
+
+
+class TestSanitizerCache(SimpleTestCase):
+    def test_sanitizer_built_once_per_view_class(self):
+        first = get_policy(MockSensitiveFieldsLoggingView()).sanitizer
+        second = get_policy(MockSensitiveFieldsLoggingView()).sanitizer
+        self.assertIs(first, second)
+
+    def test_settings_patterns(self):
+        with override_settings(DRF_TRACKING_SENSITIVE_PATTERNS=["^card"]):
+            cleaned = MockLoggingView()._clean_data({"card_number": "4111"})
+        self.assertEqual(cleaned, {"card_number": SUB})
+        self.assertEqual(
+            MockLoggingView()._clean_data({"card_number": "4111"}),
+            {"card_number": "4111"},
+        )
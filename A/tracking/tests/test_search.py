@@ -0,0 +1,109 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from tracking.backends import DatabaseBackend
+from tracking.fields import compress_text
+from tracking.models import ApiRequestLog
+from tracking.search import TABLE, UnindexedSearch, get_search_index, search_logs
+
+from .utils import make_log
+
+TRACEBACK = 'Traceback:\n  File "x.py"\ndjango.db.utils.IntegrityError: UNIQUE failed'
+
+
+def indexed_ids():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT rowid FROM {} ORDER BY rowid".format(TABLE))
+        return [row[0] for row in cursor.fetchall()]
+
+
+@override_settings(DRF_TRACKING_SEARCH_INDEX=True)
+class TestSearchIndex(TestCase):
+    def setUp(self):
+        DatabaseBackend().write_many(
+            [
+                make_log(path="/orders/", data='{"order": "A-1001"}'),
+                make_log(path="/orders/", errors=TRACEBACK, status_code=500),
+            ]
+        )
+        DatabaseBackend().write(make_log(path="/users/", response='{"name": "Ada"}'))
+
+    def search(self, query):
+        return list(
+            search_logs(ApiRequestLog.objects.order_by("pk"), query).values_list(
+                "path", flat=True
+            )
+        )
+
+    def test_inserts_are_indexed(self):
+        pks = ApiRequestLog.objects.order_by("pk").values_list("pk", flat=True)
+        self.assertEqual(indexed_ids(), list(pks))
+
+    def test_search(self):
+        self.assertEqual(self.search("IntegrityError"), ["/orders/"])
+        self.assertEqual(self.search("a-1001"), ["/orders/"])
+        self.assertEqual(self.search("ada"), ["/users/"])
+        self.assertEqual(self.search("orders"), ["/orders/", "/orders/"])
+        self.assertEqual(self.search("orders ada"), [])
+        self.assertEqual(self.search('"unbalanced AND ('), [])
+        self.assertEqual(len(self.search("  ")), 3)
+
+    @override_settings(
+        DRF_TRACKING_COMPRESS_TEXT=True, DRF_TRACKING_COMPRESS_MIN_LENGTH=10
+    )
+    def test_compressed_payloads_are_searchable(self):
+        DatabaseBackend().write(make_log(path="/big/", response="needle " * 50))
+        self.assertEqual(self.search("needle"), ["/big/"])
+
+    def test_purge_removes_entries(self):
+        call_command("purge_tracking_logs", "--days", "-1", stdout=StringIO())
+        self.assertEqual(indexed_ids(), [])
+
+    def test_rebuild(self):
+        get_search_index().clear()
+        ApiRequestLog.objects.create(
+            **make_log(path="/legacy/", errors=compress_text("legacy KeyError " * 20))
+        )
+        out = StringIO()
+        call_command("rebuild_tracking_search_index", "--batch-size", "2", stdout=out)
+        self.assertIn("Indexed 4 log(s), removed 0 stale entries.", out.getvalue())
+        self.assertEqual(self.search("keyerror"), ["/legacy/"])
+        self.assertEqual(self.search("integrityerror"), ["/orders/"])
+
+    def test_rebuild_prunes_deleted_logs(self):
+        ApiRequestLog.objects.filter(path="/users/").delete()
+        out = StringIO()
+        call_command("rebuild_tracking_search_index", stdout=out)
+        self.assertIn("Indexed 2 log(s), removed 1 stale entries.", out.getvalue())
+        self.assertEqual(len(indexed_ids()), 2)
+
+    def test_admin_search(self):
+        admin = User.objects.create_superuser("admin", password="pass")
+        self.client.force_login(admin)
+        response = self.client.get(
+            "/admin/tracking/apirequestlog/", {"q": "IntegrityError"}
+        )
+        self.assertEqual(
+            [log.path for log in response.context["cl"].result_list], ["/orders/"]
+        )
+
+    @override_settings(ROOT_URLCONF="tracking.tests.urls")
+    def test_api_search(self):
+        staff = User.objects.create(username="staff", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get("/logs/", {"q": "ada", "fields": "path"})
+        self.assertEqual(response.json()["results"], [{"path": "/users/"}])
+
+
+class TestUnindexedSearch(TestCase):
+    def test_like_fallback(self):
+        ApiRequestLog.objects.create(**make_log(path="/a/", errors="KeyError: 'x'"))
+        ApiRequestLog.objects.create(**make_log(path="/b/"))
+        queryset = UnindexedSearch(connection).filter(
+            ApiRequestLog.objects.all(), "keyerror"
+        )
+        self.assertEqual([log.path for log in queryset], ["/a/"])
@@ -0,0 +1,110 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from tracking.backends import get_storage_backend
+from tracking.models import ApiRequestLog, SpoolCursor
+from tracking.spool import SpoolWriter, list_segments, read_frames
+
+from .utils import make_log
+
+
+class TestSpoolWriter(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_records_round_trip(self):
+        user = User.objects.create_user(username="myname")
+        writer = SpoolWriter(self.directory)
+        writer.write(make_log(user=user, query_params={"a": "1"}))
+        writer.close()
+        (segment,) = list_segments(self.directory)
+        with open(os.path.join(self.directory, segment), "rb") as fp:
+            ((record, offset),) = list(read_frames(fp))
+        self.assertEqual(record["user_id"], user.pk)
+        self.assertEqual(record["query_params"], "{'a': '1'}")
+        self.assertEqual(offset, os.path.getsize(os.path.join(self.directory, segment)))
+
+    def test_rotates_by_size(self):
+        writer = SpoolWriter(self.directory, segment_size=1)
+        writer.write(make_log())
+        writer.write(make_log())
+        writer.close()
+        self.assertEqual(len(list_segments(self.directory)), 2)
+
+    def test_partial_frame_is_not_read(self):
+        writer = SpoolWriter(self.directory)
+        writer.write(make_log())
+        writer.close()
+        (segment,) = list_segments(self.directory)
+        path = os.path.join(self.directory, segment)
+        with open(path, "ab") as fp:
+            fp.write(b"\x00\x00")
+        with open(path, "rb") as fp:
+            self.assertEqual(len(list(read_frames(fp))), 1)
+
+
+class TestIngestSpoolCommand(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def ingest(self, *args):
+        call_command(
+            "ingest_tracking_spool", "--directory", self.directory, *args, stdout=StringIO()
+        )
+
+    def test_ingest_loads_logs(self):
+        writer = SpoolWriter(self.directory)
+        for _ in range(3):
+            writer.write(make_log())
+        writer.close()
+        self.ingest("--batch-size", "2")
+        self.assertEqual(ApiRequestLog.objects.count(), 3)
+        self.assertEqual(SpoolCursor.objects.count(), 1)
+
+    def test_ingest_is_idempotent(self):
+        writer = SpoolWriter(self.directory)
+        writer.write(make_log())
+        self.ingest()
+        self.ingest()
+        self.assertEqual(ApiRequestLog.objects.count(), 1)
+        writer.write(make_log())
+        writer.close()
+        self.ingest()
+        self.assertEqual(ApiRequestLog.objects.count(), 2)
+
+    def test_delete_ingested_segments(self):
+        writer = SpoolWriter(self.directory)
+        writer.write(make_log())
+        writer.close()
+        self.ingest("--delete-ingested", "--idle-seconds", "0")
+        self.assertEqual(list_segments(self.directory), [])
+        self.assertEqual(SpoolCursor.objects.count(), 0)
+        self.assertEqual(ApiRequestLog.objects.count(), 1)
+
+
+@override_settings(ROOT_URLCONF="tracking.tests.urls")
+class TestSpoolLoggingMixin(TestCase):
+    def test_handle_log_writes_to_spool(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(DRF_TRACKING_SPOOL_DIR=directory):
+                self.client.get("/logging/")
+                get_storage_backend().close()
+                self.assertEqual(ApiRequestLog.objects.count(), 0)
+                call_command(
+                    "ingest_tracking_spool", "--directory", directory, stdout=StringIO()
+                )
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(log.path, "/logging/")
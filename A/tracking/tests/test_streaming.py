@@ -0,0 +1,90 @@
+import asyncio
+
+from django.test import TestCase, override_settings
+
+from tracking.models import ApiRequestLog
+from tracking.streaming import AsyncStreamCapture, SyncStreamCapture
+
+
+class FinishRecorder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *args):
+        self.calls.append(args)
+
+
+class TestStreamCapture(TestCase):
+    def test_tees_up_to_limit_and_counts_bytes(self):
+        recorder = FinishRecorder()
+        capture = SyncStreamCapture(iter([b"abc", b"defg", b"hi"]), 5, recorder)
+        self.assertEqual(list(capture), [b"abc", b"defg", b"hi"])
+        capture.close()
+        self.assertEqual(len(recorder.calls), 1)
+        captured, total, first_byte_ns, last_byte_ns, errors = recorder.calls[0]
+        self.assertEqual(captured, b"abcde")
+        self.assertEqual(total, 9)
+        self.assertLessEqual(first_byte_ns, last_byte_ns)
+        self.assertIsNone(errors)
+
+    def test_async_iterator(self):
+        async def chunks():
+            yield b"ab"
+            yield b"cd"
+
+        async def consume(capture):
+            return [chunk async for chunk in capture]
+
+        recorder = FinishRecorder()
+        capture = AsyncStreamCapture(chunks(), 3, recorder)
+        self.assertEqual(asyncio.run(consume(capture)), [b"ab", b"cd"])
+        self.assertEqual(recorder.calls[0][:2], (b"abc", 4))
+
+
+@override_settings(ROOT_URLCONF="tracking.tests.urls")
+class TestStreamingLogging(TestCase):
+    def stream(self, path):
+        response = self.client.get(path)
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+        try:
+            body = b"".join(response.streaming_content)
+        finally:
+            response.close()
+        return body
+
+    def test_logged_when_exhausted(self):
+        body = self.stream("/streaming-logging/")
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(log.response_bytes, len(body))
+        self.assertEqual(log.response, body.decode())
+        self.assertIsNotNone(log.ttfb_us)
+        self.assertGreaterEqual(log.ttlb_us, log.ttfb_us)
+
+    @override_settings(DRF_TRACKING_STREAM_CAPTURE_BYTES=16)
+    def test_capture_is_capped(self):
+        body = self.stream("/streaming-logging/?rows=1000")
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(log.response_bytes, len(body))
+        self.assertIn("[truncated {} bytes]".format(len(body) - 16), log.response)
+
+    @override_settings(DRF_TRACKING_CAPTURE_MODE="headers")
+    def test_headers_only(self):
+        body = self.stream("/streaming-logging/")
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(log.response_bytes, len(body))
+        self.assertIn("Content-Type", log.response)
+        self.assertNotIn("rows", log.response)
+
+    def test_logged_when_closed_early(self):
+        response = self.client.get("/streaming-logging/")
+        next(iter(response.streaming_content))
+        response.close()
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(log.response_bytes, len(b'{"token": "secret", "rows": ['))
+
+    def test_stream_error_is_logged(self):
+        response = self.client.get("/streaming-logging/?fail=1")
+        with self.assertRaises(ValueError):
+            b"".join(response.streaming_content)
+        log = ApiRequestLog.objects.get()
+        self.assertIn("stream failure", log.errors)
@@ -0,0 +1,86 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from tracking.models import ApiRequestLog
+
+
+class RewriteDataMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_template_response(self, request, response):
+        response.data = "rewritten"
+        return response
+
+
+@override_settings(ROOT_URLCONF="tracking.tests.urls")
+class TestTiming(TestCase):
+    def test_response_us_is_recorded(self):
+        self.client.get("/logging/")
+        log = ApiRequestLog.objects.get()
+        self.assertIsNotNone(log.response_us)
+        self.assertGreater(log.response_us, 0)
+        self.assertEqual(log.response_ms, log.response_us // 1000)
+
+    @mock.patch("tracking.base_mixins.time.perf_counter_ns")
+    def test_uses_monotonic_clock(self, mock_counter):
+        # request start, view finished, logging start, duration taken
+        mock_counter.side_effect = [10_000_000, 11_000_000, 12_000_000, 12_345_678] + [
+            20_000_000
+        ] * 10
+        self.client.get("/logging/")
+        log = ApiRequestLog.objects.get()
+        self.assertEqual(log.response_us, 2345)
+        self.assertEqual(log.response_ms, 2)
+
+    def test_no_server_timing_by_default(self):
+        response = self.client.get("/logging/")
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    @override_settings(DRF_TRACKING_SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        response = self.client.get("/logging/")
+        phases = [part.split(";")[0] for part in response["Server-Timing"].split(", ")]
+        self.assertEqual(phases, ["view", "render", "log", "total"])
+        for part in response["Server-Timing"].split(", "):
+            self.assertGreaterEqual(float(part.split("dur=")[1]), 0)
+
+    @override_settings(DRF_TRACKING_SERVER_TIMING=True)
+    def test_server_timing_without_logging(self):
+        response = self.client.get("/explicit-logging/")
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+        phases = [part.split(";")[0] for part in response["Server-Timing"].split(", ")]
+        self.assertEqual(phases, ["view", "total"])
+
+    def test_response_rendered_once(self):
+        from rest_framework.renderers import JSONRenderer
+
+        with mock.patch.object(JSONRenderer, "render", wraps=JSONRenderer().render) as render:
+            self.client.get("/logging/")
+        self.assertEqual(render.call_count, 1)
+
+    @override_settings(
+        MIDDLEWARE=["tracking.tests.test_timing.RewriteDataMiddleware"]
+    )
+    def test_logs_body_after_template_response_middleware(self):
+        response = self.client.get("/logging/")
+        self.assertEqual(response.json(), "rewritten")
+        self.assertEqual(ApiRequestLog.objects.get().response, '"rewritten"')
+
+
+@override_settings(
+    ROOT_URLCONF="tracking.tests.urls",
+    MIDDLEWARE=["tracking.middleware.RequestTrackingMiddleware"],
+    DRF_TRACKING_SERVER_TIMING=True,
+)
+class TestMiddlewareTiming(TestCase):
+    def test_plain_view_timing(self):
+        response = self.client.get("/plain/")
+        log = ApiRequestLog.objects.get()
+        self.assertIsNotNone(log.response_us)
+        self.assertIn("view;dur=", response["Server-Timing"])
+        self.assertIn("log;dur=", response["Server-Timing"])
@@ -0,0 +1,69 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from tracking.models import ApiRequestLog
+from tracking.writers import BufferedLogWriter
+
+from .utils import make_log
+
+
+@mock.patch.object(BufferedLogWriter, "_ensure_started")
+class TestBufferedLogWriter(TestCase):
+    def test_flush_writes_queued_logs(self, mock_start):
+        writer = BufferedLogWriter(batch_size=2, flush_interval=60)
+        for _ in range(5):
+            writer.put(make_log())
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
+        self.assertEqual(writer.flush(), 5)
+        self.assertEqual(ApiRequestLog.objects.count(), 5)
+
+    def test_flush_uses_bulk_create_batches(self, mock_start):
+        writer = BufferedLogWriter(batch_size=2, flush_interval=60)
+        for _ in range(5):
+            writer.put(make_log())
+        with mock.patch.object(
+            ApiRequestLog.objects, "bulk_create", wraps=ApiRequestLog.objects.bulk_create
+        ) as mock_bulk_create:
+            writer.flush()
+        self.assertEqual(mock_bulk_create.call_count, 3)
+
+    def test_drop_policy_when_full(self, mock_start):
+        writer = BufferedLogWriter(max_size=2, full_policy="drop")
+        self.assertTrue(writer.put(make_log()))
+        self.assertTrue(writer.put(make_log()))
+        self.assertFalse(writer.put(make_log()))
+        self.assertEqual(writer.dropped, 1)
+
+    def test_block_policy_times_out_when_full(self, mock_start):
+        writer = BufferedLogWriter(max_size=1, full_policy="block", block_timeout=0.01)
+        self.assertTrue(writer.put(make_log()))
+        self.assertFalse(writer.put(make_log()))
+        self.assertEqual(writer.dropped, 1)
+
+    def test_invalid_policy(self, mock_start):
+        with self.assertRaises(AssertionError):
+            BufferedLogWriter(full_policy="ignore")
+
+    def test_stop_flushes_pending_logs(self, mock_start):
+        writer = BufferedLogWriter(flush_interval=60)
+        writer.put(make_log())
+        writer.stop()
+        self.assertEqual(ApiRequestLog.objects.count(), 1)
+
+    def test_failed_batch_does_not_raise(self, mock_start):
+        writer = BufferedLogWriter()
+        writer.put(make_log())
+        with mock.patch.object(
+            ApiRequestLog.objects, "bulk_create", side_effect=Exception("db failure")
+        ):
+            self.assertEqual(writer.flush(), 0)
+
+
+@override_settings(ROOT_URLCONF="tracking.tests.urls", DRF_TRACKING_BUFFERED_WRITER=True)
+class TestBufferedLoggingMixin(TestCase):
+    @mock.patch("tracking.mixins.get_buffered_writer")
+    def test_handle_log_enqueues(self, mock_get_writer):
+        self.client.get("/logging/")
+        self.assertEqual(mock_get_writer.return_value.put.call_count, 1)
+        self.assertEqual(ApiRequestLog.objects.count(), 0)
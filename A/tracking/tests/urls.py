@@ -1,7 +1,13 @@
 from django.urls import path
+from rest_framework.routers import SimpleRouter
+
+from tracking.views import ApiRequestLogViewSet, metrics_view
 
 from . import views
 
+router = SimpleRouter()
+router.register("logs", ApiRequestLogViewSet, basename="log")
+
 urlpatterns = [
     path("no-logging/", views.MockNoLoggingView.as_view()),
     path("logging/", views.MockLoggingView.as_view()),
@@ -9,8 +15,19 @@ urlpatterns = [
     path("custom-check-logging/", views.MockCustomCheckLoggingView.as_view()),
     path("session-auth-logging/", views.MockSessionAuthLoggingView.as_view()),
     path("sensitive-fields-logging/", views.MockSensitiveFieldsLoggingView.as_view()),
+    path("large-response-logging/", views.MockLargeResponseLoggingView.as_view()),
+    path("upload-logging/", views.MockUploadLoggingView.as_view()),
+    path("headers-only-logging/", views.MockHeadersOnlyLoggingView.as_view()),
+    path("sampled-logging/", views.MockSampledLoggingView.as_view()),
+    path("rate-sampled-logging/", views.MockRateSampledLoggingView.as_view()),
+    path("streaming-logging/", views.MockStreamingLoggingView.as_view()),
+    path("async-logging/", views.MockAsyncLoggingView.as_view()),
+    path("plain/", views.mock_plain_view),
+    path("plain-error/", views.mock_plain_error_view),
+    path("health/", views.mock_health_view),
+    path("metrics/", metrics_view),
     path(
         "invalid-clean-substitute-logging/",
         views.InvalidCleanSubstituteLoggingView.as_view(),
     ),
-]
+] + router.urls
@@ -0,0 +1,13 @@
+from django.utils.timezone import now
+
+
+def make_log(**kwargs):
+    log = {
+        "requested_at": now(),
+        "path": "/logging/",
+        "remote_addr": "127.0.0.1",
+        "host": "testserver",
+        "method": "GET",
+    }
+    log.update(kwargs)
+    return log
@@ -1,9 +1,12 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from tracking.mixins import LoggingMixin
+from tracking.mixins import AsyncLoggingMixin, LoggingMixin
+from tracking.sampling import FixedRateSampler
 
 
 class MockNoLoggingView(APIView):
@@ -55,3 +58,89 @@ class MockSensitiveFieldsLoggingView(LoggingMixin, APIView):
 
 class InvalidCleanSubstituteLoggingView(LoggingMixin, APIView):
     CLEAN_SUBSTITUTE = 1
+
+
+class MockLargeResponseLoggingView(LoggingMixin, APIView):
+    def get(self, request):
+        return Response({"results": list(range(1000))})
+
+    def post(self, request):
+        return Response({"detail": "bad request"}, status=400)
+
+
+class MockUploadLoggingView(LoggingMixin, APIView):
+    def post(self, request):
+        return Response({"files": sorted(request.FILES)})
+
+    def put(self, request):
+        return Response("body not read")
+
+
+class MockHeadersOnlyLoggingView(LoggingMixin, APIView):
+    capture_mode = "headers"
+
+    def get(self, request):
+        return Response("with logging")
+
+
+class MockSampledLoggingView(LoggingMixin, APIView):
+    sampler = FixedRateSampler(0.25)
+
+    def get(self, request):
+        return Response("with logging")
+
+    def post(self, request):
+        return Response("error", status=500)
+
+
+class MockRateSampledLoggingView(LoggingMixin, APIView):
+    sampler = 0.5
+
+    def get(self, request):
+        return Response("with logging")
+
+
+class MockStreamingLoggingView(LoggingMixin, APIView):
+    def get(self, request):
+        def rows():
+            yield b'{"token": "secret", "rows": ['
+            for index in range(int(request.GET.get("rows", 3))):
+                yield b"%d," % index
+            if "fail" in request.GET:
+                raise ValueError("stream failure")
+            yield b"0]}"
+
+        return StreamingHttpResponse(rows(), content_type="application/json")
+
+
+class MockAsyncLoggingView(AsyncLoggingMixin, APIView):
+    # Minimal async dispatch modelled on adrf.views.APIView.
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def get(self, request):
+        return Response("with logging")
+
+
+def mock_plain_view(request):
+    return JsonResponse({"token": "secret", "detail": "plain"})
+
+
+def mock_plain_error_view(request):
+    raise ValueError("plain failure")
+
+
+def mock_health_view(request):
+    return HttpResponse("ok")
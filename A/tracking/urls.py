@@ -1,7 +1,12 @@
+from rest_framework.routers import SimpleRouter
 from rest_framework.urls import path
 from . import views
 
+router = SimpleRouter()
+router.register('logs', views.ApiRequestLogViewSet, basename='log')
+
 app_name = 'tracking'
 urlpatterns = [
     path('', views.Home.as_view()),
-]
+    path('metrics/', views.metrics_view, name='metrics'),
+] + router.urls
@@ -1,7 +1,30 @@
+import hashlib
+import json
+import operator
+from functools import reduce
+
+from django.db.models import Q
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware
+from rest_framework import permissions, viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from . import metrics
+from .app_settings import app_settings
+from .fields import decompress_text
+from .ip import ProxyNetworks, get_ip_resolver, normalize_address
 from .mixins import LoggingMixin
+from .models import ApiRequestLog, ResponseBlob
+from .pagination import KeysetPagination
+from .partitions import check_unpartitioned
+from .rollups import status_lookups
+from .search import search_logs
+from .serializers import ApiRequestLogSerializer
 
 
 class Home(LoggingMixin, APIView):
@@ -9,3 +32,158 @@ class Home(LoggingMixin, APIView):
 
     def post(self, request):
         return Response("Hello")
+
+
+def metrics_view(request):
+    """
+    Tracking metrics in the Prometheus text format, merged across workers
+    sharing DRF_TRACKING_METRICS_DIR. Served to staff users and to clients
+    in DRF_TRACKING_METRICS_ALLOWED_NETWORKS, and only while
+    DRF_TRACKING_METRICS is enabled.
+    """
+    if not app_settings.METRICS:
+        raise Http404
+    user = getattr(request, "user", None)
+    if not (getattr(user, "is_staff", False) or _is_metrics_client(request)):
+        raise PermissionDenied
+    return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+def _is_metrics_client(request):
+    networks = ProxyNetworks(app_settings.METRICS_ALLOWED_NETWORKS)
+    if not networks:
+        return False
+    # Forwarding headers only count when they come from trusted proxies.
+    if app_settings.TRUSTED_PROXIES:
+        address = get_ip_resolver().resolve(request.META)
+    else:
+        address = request.META.get("REMOTE_ADDR", "")
+    address = normalize_address(address)
+    return address is not None and address in networks
+
+
+class ApiRequestLogViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Request logs, newest first, for staff users.
+
+    Filters: ``since`` and ``until`` (ISO datetimes, ``until`` exclusive),
+    ``view``, ``method`` and ``status`` (a code or a class such as ``5xx``),
+    each of which may be repeated, ``path`` (a prefix) and ``user`` (an
+    id). They line up with the ``(status_code|method|view, requested_at)``
+    indexes. ``q`` keeps logs whose path, errors, response or data contain
+    every word, through the full-text index when DRF_TRACKING_SEARCH_INDEX
+    is enabled. ``fields=id,path`` or ``exclude=response,data`` pick the
+    columns, which are then the only ones read from the database.
+    Responses carry an ETag and honour If-None-Match.
+    """
+
+    queryset = ApiRequestLog.objects.all()
+    serializer_class = ApiRequestLogSerializer
+    pagination_class = KeysetPagination
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_queryset(self):
+        check_unpartitioned("The request log API")
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        since = self.parse_datetime("since")
+        until = self.parse_datetime("until")
+        if since is not None:
+            queryset = queryset.filter(requested_at__gte=since)
+        if until is not None:
+            queryset = queryset.filter(requested_at__lt=until)
+        if params.getlist("view"):
+            queryset = queryset.filter(view__in=params.getlist("view"))
+        if params.getlist("method"):
+            methods = [method.upper() for method in params.getlist("method")]
+            queryset = queryset.filter(method__in=methods)
+        if params.getlist("status"):
+            try:
+                conditions = [
+                    Q(**status_lookups(value)) for value in params.getlist("status")
+                ]
+            except ValueError as error:
+                raise ValidationError({"status": str(error)})
+            queryset = queryset.filter(reduce(operator.or_, conditions))
+        if params.get("path"):
+            queryset = queryset.filter(path__startswith=params["path"])
+        if params.get("user"):
+            if not params["user"].isdigit():
+                raise ValidationError({"user": "Expected a user id."})
+            queryset = queryset.filter(user_id=int(params["user"]))
+        if params.get("q"):
+            queryset = search_logs(queryset, params["q"])
+        columns = ["id", "requested_at"]
+        for name in self.get_selected_fields():
+            columns.append(name)
+            if name == "response":
+                columns.append("response_digest")
+        return queryset.only(*columns)
+
+    def parse_datetime(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValidationError({name: "Expected an ISO 8601 datetime."})
+        return make_aware(parsed) if is_naive(parsed) else parsed
+
+    def get_selected_fields(self):
+        available = ApiRequestLogSerializer.Meta.fields
+        selected = list(available)
+        for param in ("fields", "exclude"):
+            value = self.request.query_params.get(param)
+            if not value:
+                continue
+            names = [name.strip() for name in value.split(",") if name.strip()]
+            unknown = set(names) - set(available)
+            if unknown:
+                raise ValidationError(
+                    {param: "Unknown field(s): {}".format(", ".join(sorted(unknown)))}
+                )
+            if param == "fields":
+                selected = [name for name in selected if name in names]
+            else:
+                selected = [name for name in selected if name not in names]
+        return selected
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("selected_fields", self.get_selected_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        # One query for every deduplicated body on the page.
+        digests = {
+            log.response_digest
+            for log in page
+            if log.__dict__.get("response_digest") is not None
+        }
+        self.blobs = {}
+        if digests:
+            self.blobs = {
+                digest: decompress_text(body)
+                for digest, body in ResponseBlob.objects.filter(
+                    digest__in=digests
+                ).values_list("digest", "body")
+            }
+        return page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["blobs"] = getattr(self, "blobs", {})
+        return context
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method not in ("GET", "HEAD") or response.status_code != 200:
+            return response
+        payload = json.dumps(
+            [response.accepted_media_type, response.data],
+            sort_keys=True,
+            default=str,
+        )
+        etag = quote_etag(hashlib.sha256(payload.encode()).hexdigest()[:32])
+        response["ETag"] = etag
+        return get_conditional_response(request, etag=etag, response=response)
@@ -0,0 +1,149 @@
+import atexit
+import logging
+import queue
+import threading
+
+from django.db import close_old_connections, connections
+
+from . import metrics
+from .app_settings import app_settings
+
+logger = logging.getLogger(__name__)
+
+DROP = "drop"
+BLOCK = "block"
+
+
+class BufferedLogWriter:
+    """
+    Collects log dicts on a bounded in-process queue and hands them to the
+    storage backend's ``write_many`` in batches from a background thread,
+    so request threads never wait on storage.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        max_size=None,
+        batch_size=None,
+        flush_interval=None,
+        full_policy=None,
+        block_timeout=None,
+    ):
+        self.backend = backend
+        self.max_size = max_size or app_settings.BUFFER_MAX_SIZE
+        self.batch_size = batch_size or app_settings.BUFFER_BATCH_SIZE
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else app_settings.BUFFER_FLUSH_INTERVAL
+        )
+        self.full_policy = full_policy or app_settings.BUFFER_FULL_POLICY
+        self.block_timeout = (
+            block_timeout
+            if block_timeout is not None
+            else app_settings.BUFFER_BLOCK_TIMEOUT
+        )
+        assert self.full_policy in (DROP, BLOCK), "full_policy must be 'drop' or 'block'"
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=self.max_size)
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def get_backend(self):
+        if self.backend is None:
+            from .backends import get_storage_backend
+
+            return get_storage_backend()
+        return self.backend
+
+    def put(self, log, block=True):
+        self._ensure_started()
+        try:
+            if block and self.full_policy == BLOCK:
+                self._queue.put(log, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(log)
+        except queue.Full:
+            self.dropped += 1
+            metrics.record_dropped()
+            logger.warning("API request log buffer is full, dropping log entry.")
+            return False
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self):
+        """
+        Drain everything currently queued and write it in batches of
+        ``batch_size``. Safe to call from any thread.
+        """
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take(self.batch_size)
+                if not batch:
+                    break
+                try:
+                    self.write_batch(batch)
+                    written += len(batch)
+                except Exception:
+                    logger.exception("API request log batch write failed!")
+        return written
+
+    def write_batch(self, logs):
+        self.get_backend().write_many(logs)
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _take(self, limit):
+        items = []
+        while len(items) < limit:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None and not self._stopped.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="tracking-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stopped.is_set():
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                close_old_connections()
+                self.flush()
+        finally:
+            connections.close_all()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_buffered_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = BufferedLogWriter()
+                atexit.register(_writer.stop)
+    return _writer